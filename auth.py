@@ -1,37 +1,117 @@
+import os
+import threading
+import time
+from collections import OrderedDict
 from fastapi import Header, HTTPException, status, Depends
-from sqlalchemy.orm import Session
-from typing import Annotated
+from sqlalchemy import select, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from typing import Annotated, Dict, Optional, Tuple
 from models import User
-from database import SessionLocal
+from database import get_db
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+class UserCache:
+    """
+    Process-local TTL cache of authenticated users, so repeat requests skip the user lookup.
+    Entries hold column values only; call invalidate() after changing a user.
+    A ttl of 0 disables the cache.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_env(cls) -> "UserCache":
+        return cls(
+            ttl=float(os.getenv("USER_CACHE_TTL", "30")),
+            max_entries=int(os.getenv("USER_CACHE_MAX_ENTRIES", "1000"))
+        )
+
+    def get(self, username: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(username, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, user: User) -> None:
+        if self.ttl <= 0:
+            return
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        with self._lock:
+            self._entries[user.username] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user.username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        with self._lock:
+            if self._entries.pop(username, None) is not None:
+                self.invalidations += 1
 
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl
+        }
 
-def get_current_user(
+
+user_cache = UserCache.from_env()
+
+
+def invalidate_user(username: str) -> None:
+    """Drop a cached user; call after committing a change to it"""
+    user_cache.invalidate(username)
+
+
+async def get_current_user(
     x_user_username: Annotated[str, Header()],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Simple authentication dependency.
     Requires X-User-Username header and validates user exists in database.
+    Resolved once per request (FastAPI caches dependencies) and, for USER_CACHE_TTL seconds,
+    across requests. A cached user is a detached copy outside the request's session, so a fresh
+    load of the same row in that session is never answered from the cached snapshot; load the
+    user by username before changing it.
     """
     if not x_user_username:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="X-User-Username header is required"
         )
-    
-    user = db.query(User).filter(User.username == x_user_username).first()
+
+    cached = user_cache.get(x_user_username)
+    if cached is not None:
+        # A persisted-looking copy of the cached columns, deliberately kept out of the session
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return user
+
+    user = (await db.execute(select(User).where(User.username == x_user_username))).scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"User '{x_user_username}' not found"
         )
-    
+
+    user_cache.set(user)
     return user
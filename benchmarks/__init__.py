@@ -0,0 +1,101 @@
+"""
+Offline benchmarks, run as `python -m benchmarks.<name>`.
+Importing this package points the app at a throwaway SQLite database (BENCHMARK_DATABASE_URL to
+use another) and at the fake LLM backend, before any app module reads its settings, so no API
+key, network or existing data is touched. Settings a benchmark doesn't fix can still be set in
+the shell, e.g. SQLITE_JOURNAL_MODE=DELETE to compare against the rollback journal.
+"""
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence
+
+os.environ["DATABASE_URL"] = os.getenv(
+    "BENCHMARK_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+)
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["LLM_CACHE_BACKEND"] = "none"
+os.environ.setdefault("OPENROUTER_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("PREGENERATION_ENABLED", "false")
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile, e.g. fraction 0.95 for p95"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def latency_summary(values: Sequence[float]) -> str:
+    return f"p50 {percentile(values, 0.5) * 1000:.0f}ms  p95 {percentile(values, 0.95) * 1000:.0f}ms"
+
+
+class Timings:
+    """Latencies per operation name"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def measure(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(name, []).append(time.perf_counter() - started)
+
+    def count(self) -> int:
+        return sum(len(values) for values in self.samples.values())
+
+    def report(self) -> str:
+        return "\n".join(f"  {name:<12} n={len(values):<5} {latency_summary(values)}"
+                         for name, values in self.samples.items())
+
+
+@contextmanager
+def count_statements():
+    """Collect the SQL statements sent to the database inside the block"""
+    from sqlalchemy import event
+    from database import engine
+
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@asynccontextmanager
+async def app_client():
+    """The API with its lifespan running, behind an in-process HTTP client"""
+    import httpx
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            yield client
+
+
+def transcript_items(count: int, users: int, start: int = 0) -> List[Dict]:
+    """Transcript upload items from `users` speakers, one second apart"""
+    return [
+        {
+            "userId": str(1000 + i % users),
+            "username": f"speaker{i % users}",
+            "transcription": f"Point {i}: we should move the release checklist forward and review the open tickets",
+            "timestamp": (datetime(2026, 1, 1, 10) + timedelta(seconds=i)).isoformat(),
+            "guildId": "guild",
+            "channelId": "channel"
+        }
+        for i in range(start, start + count)
+    ]
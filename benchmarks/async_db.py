@@ -0,0 +1,62 @@
+"""
+Read latency while slow LLM generations are running, i.e. whether waiting on the LLM or on the
+database holds up other requests. 16 readers loop over cheap endpoints while N clients keep
+regenerating summaries (one meeting each, so single-flight doesn't merge them).
+
+    python -m benchmarks.async_db
+"""
+import asyncio
+import os
+import time
+from benchmarks import Timings, app_client, latency_summary, transcript_items
+
+os.environ.setdefault("LLM_FAKE_LATENCY", "1")
+
+READERS = 16
+GENERATORS = (0, 2, 4, 8)
+DURATION = 5.0  # seconds per round
+
+
+async def _round(client, generators: int, meeting_ids) -> None:
+    deadline = time.monotonic() + DURATION
+    timings = Timings()
+    generations = 0
+
+    async def reader(index: int) -> None:
+        meeting_id = meeting_ids[index % len(meeting_ids)]
+        paths = (f"/meeting/{meeting_id}/summary", f"/meeting/{meeting_id}/transcripts", "/user/speaker0")
+        while time.monotonic() < deadline:
+            for path in paths:
+                with timings.measure("read"):
+                    response = await client.get(path)
+                response.raise_for_status()
+
+    async def generator(index: int) -> None:
+        nonlocal generations
+        while time.monotonic() < deadline:
+            response = await client.post(f"/meeting/{meeting_ids[index]}/summary/generate")
+            response.raise_for_status()
+            generations += 1
+
+    await asyncio.gather(*(reader(i) for i in range(READERS)), *(generator(i) for i in range(generators)))
+    reads = timings.samples["read"]
+    print(f"N={generators:<2} {len(reads) / DURATION:6.0f} reads/s  {latency_summary(reads)}  "
+          f"{generations} generations completed")
+
+
+async def main() -> None:
+    async with app_client() as client:
+        meeting_ids = []
+        for _ in range(max(GENERATORS)):
+            meeting_id = (await client.post("/meeting", json={"name": "Standup", "description": "Daily sync"})).json()["id"]
+            (await client.post(f"/meeting/{meeting_id}/transcripts", json=transcript_items(200, users=4))).raise_for_status()
+            meeting_ids.append(meeting_id)
+
+        print(f"{READERS} readers, fake LLM {os.environ['LLM_FAKE_LATENCY']}s per call "
+              f"(at most {os.getenv('OPENROUTER_MAX_CONCURRENCY', '4')} in flight), {DURATION:.0f}s per round")
+        for generators in GENERATORS:
+            await _round(client, generators, meeting_ids)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""
+Concurrent mixed write load on the database: half transcript batches of 10 rows, a quarter quiz
+submissions and a quarter transcript reads, spread over 8 meetings.
+Run it again with e.g. SQLITE_JOURNAL_MODE=DELETE SQLITE_SYNCHRONOUS=FULL to compare engine settings.
+
+    python -m benchmarks.db_writes
+"""
+import asyncio
+import itertools
+import os
+import random
+import time
+from benchmarks import Timings, app_client, transcript_items
+
+os.environ.setdefault("LLM_FAKE_LATENCY", "0")
+
+OPERATIONS = 800
+MEETINGS = 8
+CONCURRENCY = (8, 32)
+BATCH_SIZE = 10
+USERS = 4
+
+
+async def _setup(client):
+    """Meetings with an intro quiz each; returns [(meeting_id, quiz_id, question_ids)]"""
+    meetings = []
+    for _ in range(MEETINGS):
+        meeting_id = (await client.post("/meeting", json={"name": "Standup", "description": "Daily sync"})).json()["id"]
+        (await client.post(f"/meeting/{meeting_id}/transcripts", json=transcript_items(USERS, users=USERS))).raise_for_status()
+        quiz = (await client.get(f"/meeting/{meeting_id}/intro-quiz", headers={"X-User-Username": "speaker0"})).json()
+        meetings.append((meeting_id, quiz["id"], [question["id"] for question in quiz["questions"]]))
+    return meetings
+
+
+async def _round(client, meetings, concurrency: int, next_offset) -> None:
+    rng = random.Random(concurrency)
+    operations = [rng.choice(("ingest", "ingest", "submit", "read")) for _ in range(OPERATIONS)]
+    timings = Timings()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(operation: str) -> None:
+        meeting_id, quiz_id, question_ids = rng.choice(meetings)
+        username = f"speaker{rng.randrange(USERS)}"
+        async with semaphore:
+            with timings.measure(operation):
+                if operation == "ingest":
+                    items = transcript_items(BATCH_SIZE, users=USERS, start=next(next_offset))
+                    response = await client.post(f"/meeting/{meeting_id}/transcripts", json=items)
+                elif operation == "submit":
+                    answers = [{"question_id": question_id, "selected_answer_index": rng.randrange(4)}
+                               for question_id in question_ids]
+                    response = await client.post(
+                        f"/quiz/{quiz_id}/submit",
+                        json={"user_username": username, "answers": answers},
+                        headers={"X-User-Username": username}
+                    )
+                else:
+                    response = await client.get(f"/meeting/{meeting_id}/transcripts")
+        response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run(operation) for operation in operations))
+    elapsed = time.perf_counter() - started
+    print(f"c={concurrency:<3} {timings.count() / elapsed:6.0f} ops/s")
+    print(timings.report())
+
+
+async def main() -> None:
+    # Transcript timestamps never repeat, so no batch is skipped as a duplicate
+    next_offset = itertools.count(USERS, BATCH_SIZE)
+    async with app_client() as client:
+        print(f"{OPERATIONS} operations over {MEETINGS} meetings, journal_mode={os.getenv('SQLITE_JOURNAL_MODE', 'WAL')} "
+              f"synchronous={os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')}")
+        for concurrency in CONCURRENCY:
+            # Fresh meetings, so reads in later rounds don't return more transcripts
+            await _round(client, await _setup(client), concurrency, next_offset)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
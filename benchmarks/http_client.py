@@ -0,0 +1,85 @@
+"""
+Shared pooled HTTP client vs. a new client per OpenRouter call.
+The fake backend skips HTTP entirely, so this one runs the real OpenRouterBackend against a local
+OpenRouter-compatible stub server and counts the TCP connections it accepts. The stub is plain
+HTTP on localhost: against the real API every extra connection also pays DNS and a TLS handshake.
+
+    python -m benchmarks.http_client
+"""
+import asyncio
+import os
+import time
+from typing import Optional, Set, Tuple
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from benchmarks import latency_summary
+
+CALLS = 500
+CONCURRENCY = 10
+STUB_LATENCY = 0.01  # seconds the stub takes to "generate"
+
+
+def _stub_app(connections: Set[Tuple[str, int]]) -> FastAPI:
+    stub = FastAPI()
+
+    @stub.post("/api/v1/chat/completions")
+    async def complete(request: Request):
+        connections.add((request.client.host, request.client.port))
+        await request.json()
+        await asyncio.sleep(STUB_LATENCY)
+        return {"choices": [{"message": {"content": "• Summary point"}}]}
+
+    return stub
+
+
+async def _run(client: Optional[httpx.AsyncClient], connections: Set[Tuple[str, int]]) -> None:
+    from llm_backends import OpenRouterBackend
+
+    backend = OpenRouterBackend(client)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def call(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await backend.complete("model", [{"role": "user", "content": f"Summarize meeting {index}"}])
+            latencies.append(time.perf_counter() - started)
+
+    connections.clear()
+    started = time.perf_counter()
+    await asyncio.gather(*(call(index) for index in range(CALLS)))
+    elapsed = time.perf_counter() - started
+
+    label = "client per call" if client is None else "pooled client"
+    print(f"{label:<16} {CALLS / elapsed:7.0f} calls/s  {latency_summary(latencies)}  "
+          f"{len(connections)} TCP connections")
+
+
+async def main() -> None:
+    connections: Set[Tuple[str, int]] = set()
+    server = uvicorn.Server(uvicorn.Config(_stub_app(connections), port=0, log_level="warning"))
+    serving = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    os.environ["OPENROUTER_BASE_URL"] = f"http://127.0.0.1:{port}/api/v1/chat/completions"
+    os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+    from llm_backends import create_http_client
+
+    print(f"{CALLS} calls, {CONCURRENCY} concurrent, stub latency {STUB_LATENCY * 1000:.0f}ms")
+    try:
+        await _run(None, connections)
+        client = create_http_client()
+        try:
+            await _run(client, connections)
+        finally:
+            await client.aclose()
+    finally:
+        server.should_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+Summary generation for long meetings: one prompt holding the whole transcript vs. the chunked
+map-reduce pipeline (SUMMARY_CHUNK_TOKENS windows, SUMMARY_MAX_CONCURRENCY in flight).
+The fake backend's latency is fixed, so here it grows with the prompt, as a real model's does;
+the model used is printed with the results.
+
+    python -m benchmarks.map_reduce_summary
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from benchmarks import percentile
+from llm_backends import FakeBackend
+from llm_resilience import UpstreamGuard
+from openrouter_service import OpenRouterService, estimate_tokens
+
+MEETING_LINES = (200, 2000, 8000)
+BASE_LATENCY = 0.2  # seconds per call
+SECONDS_PER_1K_PROMPT_TOKENS = 0.05
+CHUNK_TOKENS = 6000
+MAX_CONCURRENCY = 4
+
+
+class _PromptSizedBackend(FakeBackend):
+    """Fake backend whose latency grows with the prompt; records prompt sizes"""
+
+    def __init__(self):
+        super().__init__(latency=0.0)
+        self.prompt_tokens: List[int] = []
+
+    async def complete(self, model: str, messages: List[Dict], response_format: Optional[Dict] = None) -> str:
+        tokens = estimate_tokens(messages[-1]["content"])
+        self.prompt_tokens.append(tokens)
+        await asyncio.sleep(BASE_LATENCY + SECONDS_PER_1K_PROMPT_TOKENS * tokens / 1000)
+        return await super().complete(model, messages, response_format)
+
+
+def _transcripts(count: int) -> List[Dict]:
+    started = datetime(2026, 1, 1, 10)
+    return [
+        {
+            "user_username": f"speaker{i % 6}",
+            "transcription_text": f"Point {i}: the release checklist needs an owner, and ticket {i} waits on review",
+            "timestamp": started + timedelta(seconds=5 * i)
+        }
+        for i in range(count)
+    ]
+
+
+async def _summarize(lines: int, chunk_tokens: int) -> str:
+    backend = _PromptSizedBackend()
+    ai_service = OpenRouterService(backend=backend, guard=UpstreamGuard.from_env())
+    ai_service.summary_chunk_tokens = chunk_tokens
+    ai_service.summary_max_concurrency = MAX_CONCURRENCY
+
+    started = time.perf_counter()
+    await ai_service.generate_summary_from_transcripts("Release planning", "Plan the release", _transcripts(lines))
+    elapsed = time.perf_counter() - started
+    return (f"{elapsed:6.2f}s  {len(backend.prompt_tokens):3} calls  "
+            f"largest prompt {max(backend.prompt_tokens):>7,} tokens  "
+            f"p50 prompt {percentile(backend.prompt_tokens, 0.5):>7,} tokens")
+
+
+async def main() -> None:
+    print(f"Latency model: {BASE_LATENCY}s + {SECONDS_PER_1K_PROMPT_TOKENS}s per 1k prompt tokens; "
+          f"map-reduce windows of {CHUNK_TOKENS} tokens, {MAX_CONCURRENCY} in flight")
+    for lines in MEETING_LINES:
+        print(f"{lines} transcript lines")
+        print(f"  single prompt  {await _summarize(lines, 10 ** 9)}")
+        print(f"  map-reduce     {await _summarize(lines, CHUNK_TOKENS)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+First outro quiz request for a meeting without a summary: summary then quiz (two LLM calls) vs.
+both from one combined call (COMBINED_OUTRO_GENERATION).
+
+    python -m benchmarks.outro_generation
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+import quiz_service
+from benchmarks import latency_summary
+from database import SessionLocal, engine
+from llm_backends import FakeBackend
+from llm_resilience import UpstreamGuard
+from migrations import run_migrations
+from models import Meeting, Transcribe, User
+from openrouter_service import OpenRouterService
+from quiz_service import QuizService
+
+MEETINGS = 20
+TRANSCRIPTS_PER_MEETING = 50
+LATENCY = 0.2  # fake backend seconds per call
+JITTER = 0.05
+
+
+async def _create_meeting() -> int:
+    async with SessionLocal() as db:
+        meeting = Meeting(name="Release planning", description="Plan the next release")
+        db.add(meeting)
+        await db.flush()
+        started = datetime(2026, 1, 1, 10)
+        db.add_all([
+            Transcribe(
+                user_username="speaker",
+                meeting_id=meeting.id,
+                transcription_text=f"Point {i} for meeting {meeting.id}: ticket {i} needs a reviewer",
+                timestamp=started + timedelta(seconds=i)
+            )
+            for i in range(TRANSCRIPTS_PER_MEETING)
+        ])
+        await db.commit()
+        return meeting.id
+
+
+async def _run(combined: bool) -> None:
+    quiz_service.COMBINED_OUTRO_GENERATION = combined
+    backend = FakeBackend(latency=LATENCY, jitter=JITTER)
+    ai_service = OpenRouterService(backend=backend, guard=UpstreamGuard.from_env())
+
+    latencies = []
+    for _ in range(MEETINGS):
+        meeting_id = await _create_meeting()
+        async with SessionLocal() as db:
+            started = time.perf_counter()
+            await QuizService(db, ai_service).get_or_create_outro_quiz(meeting_id)
+            latencies.append(time.perf_counter() - started)
+
+    label = "combined call" if combined else "two calls"
+    print(f"{label:<14} {latency_summary(latencies)}  {backend.calls / MEETINGS:.1f} LLM calls per meeting")
+
+
+async def main() -> None:
+    await run_migrations()
+    async with SessionLocal() as db:
+        db.add(User(username="speaker"))
+        await db.commit()
+
+    print(f"{MEETINGS} fresh meetings, fake backend {LATENCY}s ± {JITTER}s per call")
+    try:
+        await _run(combined=False)
+        await _run(combined=True)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
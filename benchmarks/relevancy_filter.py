@@ -0,0 +1,59 @@
+"""
+Local relevancy pre-filter: classify batches of synthetic, labelled utterances against a meeting
+topic and recent conversation. Reports throughput, per-batch latency, how many utterances are
+left for the LLM and how often the local decisions are right.
+
+    python -m benchmarks.relevancy_filter
+"""
+import time
+from typing import List, Optional
+import numpy as np
+from benchmarks import percentile
+from relevancy_filter import RelevancyFilter
+
+BATCH_SIZE = 20
+ROUNDS = 2000
+RELEVANT_SHARE = 0.8
+
+ON_TOPIC = "sprint backlog release deploy api database migration review ticket estimate bug fix test".split()
+OFF_TOPIC = "pizza weekend football movie weather vacation lunch concert game party coffee".split()
+FILLER = "we should the next then maybe after that is for with and this our".split()
+TOPIC = "Sprint planning\nPlan the next release: backlog review, API and database migration work, bug fixes"
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+
+    def utterance(relevant: bool) -> str:
+        words = ON_TOPIC if relevant else OFF_TOPIC
+        return " ".join(rng.choice(words if rng.random() < 0.5 else FILLER) for _ in range(rng.integers(2, 20)))
+
+    context = [utterance(True) for _ in range(10)]
+    labels = [[bool(rng.random() < RELEVANT_SHARE) for _ in range(BATCH_SIZE)] for _ in range(ROUNDS)]
+    batches = [[utterance(label) for label in batch_labels] for batch_labels in labels]
+
+    relevancy_filter = RelevancyFilter.from_env()
+    relevancy_filter.classify(TOPIC, batches[0], context)
+    decisions: List[Optional[bool]] = []
+    latencies: List[float] = []
+    for batch in batches:
+        started = time.perf_counter()
+        decisions.extend(relevancy_filter.classify(TOPIC, batch, context))
+        latencies.append(time.perf_counter() - started)
+    elapsed = sum(latencies)
+
+    total = len(decisions)
+    flat_labels = [label for batch_labels in labels for label in batch_labels]
+    decided = [(decision, label) for decision, label in zip(decisions, flat_labels) if decision is not None]
+    correct = sum(decision == label for decision, label in decided)
+    print(f"Scored {total} utterances in {elapsed:.3f}s ({total / elapsed:,.0f} utterances/s, batches of {BATCH_SIZE})")
+    print(f"Per batch: p50 {percentile(latencies, 0.5) * 1e6:.0f}us  p95 {percentile(latencies, 0.95) * 1e6:.0f}us")
+    print(
+        f"relevant {decisions.count(True)}, off-topic {decisions.count(False)}, "
+        f"ambiguous (left for the LLM) {decisions.count(None)}; "
+        f"local decisions correct: {correct}/{len(decided)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
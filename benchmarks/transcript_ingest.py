@@ -0,0 +1,32 @@
+"""
+One large transcript upload: POST /meeting/{id}/transcripts with 10,000 items from 12 speakers,
+each run on a fresh meeting. Reports the request time and the SQL statements it sent.
+
+    python -m benchmarks.transcript_ingest
+"""
+import asyncio
+import time
+from benchmarks import app_client, count_statements, transcript_items
+
+ITEMS = 10_000
+USERS = 12
+RUNS = 3
+
+
+async def main() -> None:
+    items = transcript_items(ITEMS, users=USERS)
+    async with app_client() as client:
+        print(f"{ITEMS:,} items from {USERS} speakers per request")
+        for run in range(1, RUNS + 1):
+            meeting_id = (await client.post("/meeting", json={"name": "All hands", "description": "Quarterly"})).json()["id"]
+            with count_statements() as statements:
+                started = time.perf_counter()
+                response = await client.post(f"/meeting/{meeting_id}/transcripts", json=items)
+                elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            print(f"run {run}  {elapsed:6.2f}s  {len(statements):,} statements  "
+                  f"{response.json()['transcript_count']:,} transcripts stored")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
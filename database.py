@@ -1,14 +1,103 @@
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from typing import Dict
 import os
 from dotenv import load_dotenv
 
 
 load_dotenv()
 
+# Sync driver names in DATABASE_URL are mapped to their asyncio counterparts
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg"
+}
+
+# SQLite: WAL lets readers run alongside the single writer; NORMAL is durable under WAL except on power loss
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # ms to wait for the write lock
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+
+def async_database_url(url: str):
+    parsed = make_url(url)
+    return parsed.set(drivername=_ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername))
+
+
+def engine_options(url) -> Dict:
+    """Pool settings for server databases; SQLite keeps SQLAlchemy's defaults"""
+    if url.get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    }
+
+
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+_url = async_database_url(DATABASE_URL)
+engine = create_async_engine(_url, **engine_options(_url))
+# Objects stay usable after commit: lazy refreshes would need I/O outside an await
+SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+_pool_counters = {"connects": 0, "checkouts": 0}
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    _pool_counters["connects"] += 1
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    _pool_counters["checkouts"] += 1
+
+
+def pool_stats() -> Dict:
+    pool = engine.pool
+    stats = {
+        "dialect": engine.dialect.name,
+        "driver": engine.dialect.driver,
+        "pool": type(pool).__name__,
+        "connects": _pool_counters["connects"],
+        "checkouts": _pool_counters["checkouts"]
+    }
+    # Queue pools report their occupancy; others (e.g. the StaticPool used for :memory:) don't
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)()
+    if engine.dialect.name == "sqlite":
+        stats["sqlite"] = {
+            "journal_mode": SQLITE_JOURNAL_MODE,
+            "synchronous": SQLITE_SYNCHRONOUS,
+            "busy_timeout_ms": SQLITE_BUSY_TIMEOUT,
+            "mmap_size": SQLITE_MMAP_SIZE
+        }
+    return stats
+
 
 class Base(DeclarativeBase):
-    pass
\ No newline at end of file
+    pass
+
+
+async def get_db():
+    """Request-scoped session; every dependency of a request (auth included) shares this one"""
+    async with SessionLocal() as db:
+        yield db
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Optional, Set
+from sqlalchemy import delete, func, or_, select
+from database import SessionLocal
+from models import MeetingEvent
+
+
+def _utcnow() -> datetime:
+    # Stored as naive UTC so comparisons behave the same on SQLite and PostgreSQL
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Subscription:
+    """
+    One subscriber's bounded queue of {"event", "data"} dicts for a meeting.
+    A subscriber that falls behind loses its oldest events rather than slowing publishers down.
+    """
+
+    def __init__(self, broker: "EventBroker", meeting_id: int, max_queue: int):
+        self.broker = broker
+        self.meeting_id = meeting_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def put(self, item: Dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(item)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Next event, or None if timeout passes first"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def __aiter__(self) -> AsyncIterator[Dict]:
+        return self
+
+    async def __anext__(self) -> Dict:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """
+    Fans meeting events out to every subscriber in this process.
+    Subclasses can also carry events between workers; see DatabaseEventBroker.
+    """
+    name = "memory"
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+
+    def subscribe(self, meeting_id: int) -> Subscription:
+        subscription = Subscription(self, meeting_id, self.max_queue)
+        self._subscribers.setdefault(meeting_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.meeting_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.meeting_id]
+
+    async def publish(self, meeting_id: int, event: str, data: Dict) -> None:
+        self.published += 1
+        self._deliver(meeting_id, event, data)
+
+    def _deliver(self, meeting_id: int, event: str, data: Dict) -> None:
+        for subscription in list(self._subscribers.get(meeting_id, ())):
+            subscription.put({"event": event, "data": data})
+            self.delivered += 1
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict:
+        return {
+            "backend": self.name,
+            "meetings": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered
+        }
+
+
+class DatabaseEventBroker(EventBroker):
+    """
+    Shares events between workers through the meeting_events table.
+    Published events are delivered locally right away and written to the table; every worker
+    polls the table and delivers the events other workers wrote to its own subscribers.
+
+    Ids are assigned at insert but become visible at commit, so on PostgreSQL a poll can see id 11
+    before id 10. Each poll therefore re-reads the last `lookback` seconds as well as everything
+    past the highest id seen, and skips the ids it already delivered.
+    """
+    name = "database"
+
+    def __init__(
+            self,
+            max_queue: int = 100,
+            poll_interval: float = 0.5,
+            retention: float = 3600,
+            lookback: float = 10
+    ):
+        super().__init__(max_queue)
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.lookback = lookback
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._last_id = 0
+        # Ids read within the lookback window -> created_at, so re-reads are not delivered twice
+        self._seen: Dict[int, datetime] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self.received = 0
+
+    async def publish(self, meeting_id: int, event: str, data: Dict) -> None:
+        await super().publish(meeting_id, event, data)
+
+        async with SessionLocal() as db:
+            db.add(MeetingEvent(
+                meeting_id=meeting_id,
+                event=event,
+                data=json.dumps(data, default=str),
+                origin=self.origin,
+                created_at=_utcnow()
+            ))
+            await db.commit()
+
+    async def start(self) -> None:
+        async with SessionLocal() as db:
+            # Only events published from now on are of interest
+            self._last_id = (await db.execute(select(func.max(MeetingEvent.id)))).scalar() or 0
+            self._seen = dict((await db.execute(
+                select(MeetingEvent.id, MeetingEvent.created_at).where(
+                    MeetingEvent.created_at >= _utcnow() - timedelta(seconds=self.lookback)
+                )
+            )).all())
+        self._poller = asyncio.ensure_future(self._poll())
+
+    async def _poll(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_prune = 0.0
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+            try:
+                async with SessionLocal() as db:
+                    cutoff = _utcnow() - timedelta(seconds=self.lookback)
+                    rows = (await db.execute(
+                        select(MeetingEvent).where(or_(
+                            MeetingEvent.id > self._last_id,
+                            MeetingEvent.created_at >= cutoff
+                        )).order_by(MeetingEvent.id)
+                    )).scalars().all()
+                    self._seen = {event_id: created_at for event_id, created_at in self._seen.items() if created_at >= cutoff}
+                    for row in rows:
+                        if row.id in self._seen:
+                            continue
+                        self._seen[row.id] = row.created_at
+                        self._last_id = max(self._last_id, row.id)
+                        if row.origin != self.origin:
+                            self.received += 1
+                            self._deliver(row.meeting_id, row.event, json.loads(row.data))
+
+                    if loop.time() >= next_prune:
+                        await db.execute(delete(MeetingEvent).where(
+                            MeetingEvent.created_at < _utcnow() - timedelta(seconds=self.retention)
+                        ))
+                        await db.commit()
+                        next_prune = loop.time() + 60
+            except Exception as e:
+                print(f"Failed to poll meeting events: {e}")
+
+    async def close(self) -> None:
+        if self._poller is not None:
+            # Let an in-progress poll finish instead of cancelling it halfway through a query
+            self._stopping.set()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        stats["received_from_other_workers"] = self.received
+        return stats
+
+
+def create_event_broker() -> EventBroker:
+    """Build the broker selected by EVENTS_BACKEND: memory (single worker, default) or database"""
+    backend = os.getenv("EVENTS_BACKEND", "memory").lower()
+    max_queue = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+
+    if backend == "memory":
+        return EventBroker(max_queue)
+    if backend == "database":
+        return DatabaseEventBroker(
+            max_queue,
+            poll_interval=float(os.getenv("EVENTS_POLL_INTERVAL", "0.5")),
+            retention=float(os.getenv("EVENTS_RETENTION", "3600")),
+            lookback=float(os.getenv("EVENTS_LOOKBACK", "10"))
+        )
+
+    raise ValueError(f"Unknown EVENTS_BACKEND: {backend}")
+
+
+# Process-wide broker; the API lifespan and `python -m jobs` replace it with the configured one
+_broker: EventBroker = EventBroker()
+
+
+def get_event_broker() -> EventBroker:
+    return _broker
+
+
+def set_event_broker(broker: EventBroker) -> None:
+    global _broker
+    _broker = broker
+
+
+async def publish_event(meeting_id: int, event: str, data: Dict) -> None:
+    """Notify a meeting's subscribers; a failure to publish never fails the caller"""
+    try:
+        await _broker.publish(meeting_id, event, data)
+    except Exception as e:
+        print(f"Failed to publish {event} for meeting {meeting_id}: {e}")
@@ -0,0 +1,20 @@
+export default defineEventHandler(async (event) => {
+  const username = getRouterParam(event, 'username')
+
+  try {
+    const data = await $fetch(`http://13.60.191.32:8000/user/${username}/meetings-overview`, {
+      method: 'GET',
+      headers: {
+        'Content-Type': 'application/json',
+        'X-User-Username': username || 'alice' // Forward username or default to alice
+      }
+    })
+    return data
+  } catch (error: any) {
+    console.error(`Error fetching meetings overview for user ${username}:`, error)
+    throw createError({
+      statusCode: error.statusCode || 500,
+      statusMessage: error.message || 'Failed to fetch meetings overview'
+    })
+  }
+})
@@ -0,0 +1,216 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+from pydantic import ValidationError
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import engine
+from models import Transcribe, TranscriptBatch, User
+from schemas import TranscriptItem
+
+
+# Streaming ingest: rows per insert/commit, and how long a partial batch may wait for more lines
+TRANSCRIPT_STREAM_BATCH_SIZE = int(os.getenv("TRANSCRIPT_STREAM_BATCH_SIZE", "500"))
+TRANSCRIPT_STREAM_FLUSH_INTERVAL = float(os.getenv("TRANSCRIPT_STREAM_FLUSH_INTERVAL", "1"))
+TRANSCRIPT_STREAM_MAX_LINE_BYTES = int(os.getenv("TRANSCRIPT_STREAM_MAX_LINE_BYTES", "65536"))
+
+
+class StreamLineError(ValueError):
+    """A line of an NDJSON upload that isn't a valid transcript item"""
+
+    def __init__(self, line_number: int, message: str):
+        super().__init__(f"line {line_number}: {message}")
+        self.line_number = line_number
+
+
+def _insert_ignoring_conflicts(model, index_elements):
+    """INSERT ... ON CONFLICT DO NOTHING for the dialects the API runs on"""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif engine.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(model)
+    return dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+async def _upsert_users(db: AsyncSession, discord_ids: Dict[str, str]) -> Set[str]:
+    """
+    Create missing users and fill in unset Discord IDs for a batch of usernames.
+    Returns the usernames of existing users that were changed.
+    """
+    existing = {
+        username: discord_user_id
+        for username, discord_user_id in await db.execute(
+            select(User.username, User.discord_user_id).where(User.username.in_(list(discord_ids)))
+        )
+    }
+
+    missing = [
+        {"username": username, "discord_user_id": discord_user_id}
+        for username, discord_user_id in discord_ids.items()
+        if username not in existing
+    ]
+    if missing:
+        # Conflicts come from a concurrent batch creating the same user first; its row is kept
+        await db.execute(_insert_ignoring_conflicts(User, ["username"]), missing)
+
+    updated = {
+        username for username, discord_user_id in existing.items()
+        if not discord_user_id and discord_ids[username]
+    }
+    if updated:
+        # One executemany over the core table: an ORM update() with a parameter list would be a
+        # bulk update by primary key, which can't carry the "still unset" condition
+        users = User.__table__
+        await db.execute(
+            update(users)
+            .where(
+                users.c.username == bindparam("b_username"),
+                users.c.discord_user_id.is_(None) | (users.c.discord_user_id == "")
+            )
+            .values(discord_user_id=bindparam("b_discord_user_id")),
+            [{"b_username": username, "b_discord_user_id": discord_ids[username]} for username in updated]
+        )
+    return updated
+
+
+async def ingest_transcripts(db: AsyncSession, meeting_id: int, items: Iterable[TranscriptItem]) -> Dict:
+    """
+    Store a batch of transcripts for an existing meeting: one user lookup, one upsert of the missing
+    users and one executemany insert, whatever the batch size (plus one executemany update when
+    existing users' Discord IDs were unset). Nothing is refreshed afterwards.
+    Transcripts already stored under the same (meeting, user, timestamp) natural key are skipped,
+    so re-sending a batch doesn't duplicate it.
+    Does not commit; returns {"transcript_count", "duplicate_count", "updated_users"}.
+    Raises ValueError for a malformed timestamp.
+    """
+    rows = []
+    # First Discord ID seen for each username, as the per-item loop used to keep
+    discord_ids: Dict[str, str] = {}
+    for item in items:
+        if not discord_ids.get(item.username):
+            discord_ids[item.username] = item.userId
+        rows.append({
+            "user_username": item.username,
+            "meeting_id": meeting_id,
+            "transcription_text": item.transcription,
+            "timestamp": _parse_timestamp(item.timestamp),
+            "guild_id": item.guildId,
+            "channel_id": item.channelId,
+            "foul": bool(item.foul)
+        })
+
+    if not rows:
+        return {"transcript_count": 0, "duplicate_count": 0, "updated_users": set()}
+
+    updated_users = await _upsert_users(db, discord_ids)
+    # RETURNING counts the rows actually stored; executemany rowcount isn't reported by every driver
+    inserted = (await db.execute(
+        _insert_ignoring_conflicts(Transcribe, ["meeting_id", "user_username", "timestamp"]).returning(Transcribe.id),
+        rows
+    )).all()
+    return {
+        "transcript_count": len(inserted),
+        "duplicate_count": len(rows) - len(inserted),
+        "updated_users": updated_users
+    }
+
+
+async def find_transcript_batch(db: AsyncSession, meeting_id: int, idempotency_key: str) -> Optional[TranscriptBatch]:
+    """The upload already stored for a meeting under this Idempotency-Key, if any"""
+    return (await db.execute(
+        select(TranscriptBatch).where(
+            TranscriptBatch.meeting_id == meeting_id,
+            TranscriptBatch.idempotency_key == idempotency_key
+        )
+    )).scalars().first()
+
+
+def record_transcript_batch(db: AsyncSession, meeting_id: int, idempotency_key: str, result: Dict) -> None:
+    """Remember an upload's result under its Idempotency-Key; commits with the transcripts"""
+    db.add(TranscriptBatch(
+        meeting_id=meeting_id,
+        idempotency_key=idempotency_key,
+        transcript_count=result["transcript_count"],
+        duplicate_count=result["duplicate_count"]
+    ))
+
+
+async def read_ndjson_batches(
+        chunks: AsyncIterator[bytes],
+        batch_size: int = TRANSCRIPT_STREAM_BATCH_SIZE,
+        flush_interval: float = TRANSCRIPT_STREAM_FLUSH_INTERVAL,
+        max_line_bytes: int = TRANSCRIPT_STREAM_MAX_LINE_BYTES
+) -> AsyncIterator[List[TranscriptItem]]:
+    """
+    Parse an NDJSON body (one TranscriptItem per line) as it arrives, yielding batches of up to
+    batch_size items. A partial batch is yielded once it has waited flush_interval seconds, so a
+    slow, long-lived upload still lands promptly. Memory holds at most one batch and one line.
+    Raises StreamLineError for a malformed or oversized line.
+    """
+    buffer = b""
+    batch: List[TranscriptItem] = []
+    line_number = 0
+    loop = asyncio.get_running_loop()
+    batch_started = loop.time()
+
+    def parse(line: bytes) -> None:
+        nonlocal batch_started
+        if len(line) > max_line_bytes:
+            raise StreamLineError(line_number, f"longer than {max_line_bytes} bytes")
+        if not line.strip():
+            return
+        try:
+            item = TranscriptItem.model_validate_json(line)
+        except ValidationError as e:
+            # Not str(e): it echoes the (possibly large) line back
+            raise StreamLineError(line_number, "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}" if error["loc"] else error["msg"]
+                for error in e.errors()
+            ))
+        if not batch:
+            batch_started = loop.time()
+        batch.append(item)
+
+    iterator = chunks.__aiter__()
+    pending = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            timeout = max(0.0, batch_started + flush_interval - loop.time()) if batch else None
+            # Wait without cancelling the read, so a flush never loses a chunk in flight
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield batch
+                batch = []
+                continue
+
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                break
+            pending = asyncio.ensure_future(iterator.__anext__())
+
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_number += 1
+                parse(line)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if len(buffer) > max_line_bytes:
+                raise StreamLineError(line_number + 1, f"longer than {max_line_bytes} bytes")
+
+        line_number += 1
+        parse(buffer)
+        if batch:
+            yield batch
+    finally:
+        if not pending.done():
+            pending.cancel()
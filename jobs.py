@@ -0,0 +1,379 @@
+import asyncio
+import json
+import os
+import random
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import SessionLocal
+from models import Job, JobStatus
+from openrouter_service import OpenRouterService
+from quiz_service import QuizService
+from llm_resilience import UpstreamUnavailableError
+
+
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+JOB_BACKOFF_BASE = float(os.getenv("JOB_BACKOFF_BASE", "5"))
+JOB_BACKOFF_MAX = float(os.getenv("JOB_BACKOFF_MAX", "300"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+# Seconds clients are told to wait before polling an unfinished job
+JOB_RETRY_AFTER = int(os.getenv("JOB_RETRY_AFTER", "2"))
+
+
+def _utcnow() -> datetime:
+    # Stored as naive UTC so comparisons behave the same on SQLite and PostgreSQL
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def _run_intro_quiz(service: QuizService, payload: Dict) -> Dict:
+    quiz = await service.get_or_create_intro_quiz(payload["meeting_id"])
+    return {"quiz_id": quiz.id}
+
+
+async def _run_outro_quiz(service: QuizService, payload: Dict) -> Dict:
+    quiz = await service.get_or_create_outro_quiz(payload["meeting_id"])
+    return {"quiz_id": quiz.id}
+
+
+async def _run_summary(service: QuizService, payload: Dict) -> Dict:
+    return await service.generate_meeting_summary(payload["meeting_id"])
+
+
+async def _run_user_evaluation(service: QuizService, payload: Dict) -> Dict:
+    return await service.evaluate_user_performance(payload["meeting_id"], payload["username"])
+
+
+async def _run_team_evaluation(service: QuizService, payload: Dict) -> Dict:
+    return await service.evaluate_team_performance(payload["meeting_id"])
+
+
+# Job kind -> handler; a handler's return value is stored as the job result
+JOB_HANDLERS: Dict[str, Callable[[QuizService, Dict], Awaitable[Dict]]] = {
+    "intro_quiz": _run_intro_quiz,
+    "outro_quiz": _run_outro_quiz,
+    "summary": _run_summary,
+    "user_evaluation": _run_user_evaluation,
+    "team_evaluation": _run_team_evaluation
+}
+
+
+async def enqueue_job(db: AsyncSession, kind: str, payload: Dict, max_attempts: int = JOB_MAX_ATTEMPTS) -> Job:
+    """
+    Queue a job, or return the queued/running job that already does the same work.
+    Raises ValueError for an unknown kind.
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    dedupe_key = f"{kind}:{json.dumps(payload, sort_keys=True)}"
+    existing = (await db.execute(select(Job).where(
+        Job.dedupe_key == dedupe_key,
+        Job.status.in_([JobStatus.queued, JobStatus.running])
+    ))).scalars().first()
+    if existing:
+        return existing
+
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload),
+        dedupe_key=dedupe_key,
+        status=JobStatus.queued,
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=_utcnow()
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[Job]:
+    return (await db.execute(
+        select(Job).where(Job.id == job_id).execution_options(populate_existing=True)
+    )).scalars().first()
+
+
+async def claim_job(db: AsyncSession, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[Job]:
+    """
+    Claim the next runnable job for worker_id, or return None if there is none.
+    Runnable means queued and due, or running under a lease that expired (its worker died).
+    """
+    now = _utcnow()
+    runnable = or_(
+        and_(Job.status == JobStatus.queued, Job.run_after <= now),
+        and_(Job.status == JobStatus.running, Job.locked_until < now)
+    )
+
+    candidates = (await db.execute(
+        select(Job.id).where(runnable).order_by(Job.run_after, Job.id).limit(10)
+    )).all()
+    await db.commit()
+
+    for (job_id,) in candidates:
+        # Conditional update as compare-and-set: only one worker wins each job
+        result = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, runnable)
+            .values(
+                status=JobStatus.running,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=lease_seconds),
+                attempts=Job.attempts + 1,
+                started_at=now
+            )
+        )
+        await db.commit()
+        if result.rowcount == 1:
+            return await get_job(db, job_id)
+
+    return None
+
+
+async def _update_claimed(db: AsyncSession, job_id: int, worker_id: str, **values) -> bool:
+    """
+    Write values to a running job only while worker_id still holds its lease.
+    Returns False when the lease expired and another worker claimed the job meanwhile.
+    """
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.running, Job.locked_by == worker_id)
+        .values(**values)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def extend_lease(db: AsyncSession, job_id: int, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+    """Push back the lease on a job worker_id is running; False if it no longer holds it"""
+    return await _update_claimed(db, job_id, worker_id, locked_until=_utcnow() + timedelta(seconds=lease_seconds))
+
+
+async def complete_job(db: AsyncSession, job_id: int, worker_id: str, result: Dict) -> bool:
+    """Store the result of a job worker_id is running; False (nothing stored) if it lost the job"""
+    return await _update_claimed(
+        db, job_id, worker_id,
+        status=JobStatus.succeeded,
+        result=json.dumps(result, default=str),
+        last_error=None,
+        locked_by=None,
+        locked_until=None,
+        finished_at=_utcnow()
+    )
+
+
+async def fail_job(
+        db: AsyncSession,
+        job: Job,
+        worker_id: str,
+        error: str,
+        retryable: bool = True,
+        retry_after: Optional[float] = None
+) -> Optional[JobStatus]:
+    """
+    Schedule a retry with exponential backoff, or dead-letter the job when it can't or shouldn't be retried.
+    Returns the job's new status, or None (nothing written) if worker_id lost the job.
+    """
+    if not retryable or job.attempts >= job.max_attempts:
+        status = JobStatus.dead
+        values = {"result": None, "finished_at": _utcnow()}
+    else:
+        delay = random.uniform(0, min(JOB_BACKOFF_MAX, JOB_BACKOFF_BASE * (2 ** (job.attempts - 1))))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        status = JobStatus.queued
+        values = {"run_after": _utcnow() + timedelta(seconds=delay)}
+
+    if not await _update_claimed(
+            db, job.id, worker_id, status=status, last_error=error, locked_by=None, locked_until=None, **values
+    ):
+        return None
+    return status
+
+
+class JobWorker:
+    """
+    Runs queued jobs with a fixed number of concurrent slots.
+    Several workers (in the API process or started with `python -m jobs`) can share one database:
+    jobs are claimed with a lease, and a job whose worker dies is picked up again once it expires.
+    The lease is extended every third of lease_seconds while a handler runs, and a job's outcome
+    is only written while its lease is still held, so a worker that stalled past its lease can't
+    overwrite the outcome of the worker that took the job over.
+    """
+
+    def __init__(
+            self,
+            ai_service_factory: Callable[[], OpenRouterService],
+            concurrency: int,
+            poll_interval: float = JOB_POLL_INTERVAL,
+            lease_seconds: float = JOB_LEASE_SECONDS
+    ):
+        self.ai_service_factory = ai_service_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+        self.succeeded = 0
+        self.retried = 0
+        self.dead = 0
+        self.lost = 0
+
+    def start(self) -> None:
+        for _ in range(self.concurrency):
+            self._tasks.append(asyncio.ensure_future(self._loop()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle slots right away instead of at the next poll (call after enqueueing)"""
+        self._wakeup.set()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                async with SessionLocal() as db:
+                    job = await claim_job(db, self.worker_id, self.lease_seconds)
+                    if job is not None:
+                        await self._execute(db, job)
+                        continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Job worker {self.worker_id} error: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                self._wakeup.clear()
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, db: AsyncSession, job: Job) -> None:
+        job_id, kind, payload = job.id, job.kind, job.payload
+        heartbeat = asyncio.ensure_future(self._heartbeat(job_id))
+        try:
+            handler = JOB_HANDLERS[kind]
+            service = QuizService(db, self.ai_service_factory())
+            result = await handler(service, json.loads(payload))
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without waiting for its lease to expire
+            await db.rollback()
+            await _update_claimed(db, job_id, self.worker_id, status=JobStatus.queued, locked_by=None, locked_until=None)
+            raise
+        except UpstreamUnavailableError as e:
+            await self._record_failure(db, job_id, str(e), retryable=True, retry_after=e.retry_after)
+            return
+        except (ValueError, KeyError) as e:
+            # Bad input (missing meeting, no transcripts, malformed payload): retrying won't help
+            await self._record_failure(db, job_id, f"{type(e).__name__}: {e}", retryable=False)
+            return
+        except Exception as e:
+            await self._record_failure(db, job_id, f"{type(e).__name__}: {e}", retryable=True)
+            return
+        finally:
+            heartbeat.cancel()
+
+        # Handlers may roll the session back (releasing generation leases), so only ids are used from here
+        if await complete_job(db, job_id, self.worker_id, result):
+            self.succeeded += 1
+        else:
+            self._lost(job_id, kind)
+
+    async def _heartbeat(self, job_id: int) -> None:
+        """Keep extending the lease on a running job until cancelled or another worker has taken it"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with SessionLocal() as db:
+                    if not await extend_lease(db, job_id, self.worker_id, self.lease_seconds):
+                        return
+            except Exception as e:
+                # The next beat (or the lease check on completion) catches up
+                print(f"Failed to extend the lease on job {job_id}: {e}")
+
+    async def _record_failure(
+            self,
+            db: AsyncSession,
+            job_id: int,
+            error: str,
+            retryable: bool,
+            retry_after: Optional[float] = None
+    ) -> None:
+        # The rollback expires the job, so it is read again
+        await db.rollback()
+        job = await get_job(db, job_id)
+        status = await fail_job(db, job, self.worker_id, error, retryable=retryable, retry_after=retry_after)
+        if status is None:
+            self._lost(job_id, job.kind)
+        elif status == JobStatus.dead:
+            self.dead += 1
+            print(f"Job {job_id} ({job.kind}) failed permanently: {error}")
+        else:
+            self.retried += 1
+
+    def _lost(self, job_id: int, kind: str) -> None:
+        self.lost += 1
+        print(f"Job {job_id} ({kind}) outlived its lease and was taken over by another worker; outcome discarded")
+
+    def stats(self) -> Dict:
+        return {
+            "worker_id": self.worker_id,
+            "concurrency": self.concurrency,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "dead": self.dead,
+            "lost_leases": self.lost
+        }
+
+
+async def main() -> None:
+    """Standalone worker process: python -m jobs"""
+    from database import engine
+    from migrations import run_migrations
+    from llm_backends import create_http_client
+    from llm_cache import create_llm_cache
+    from llm_resilience import UpstreamGuard
+    from events import create_event_broker, get_event_broker, set_event_broker
+
+    await run_migrations()
+
+    # Readiness events from this process only reach API workers through a shared backend
+    set_event_broker(create_event_broker())
+    await get_event_broker().start()
+
+    http_client = create_http_client()
+    cache = create_llm_cache()
+    ai_service = OpenRouterService(client=http_client, cache=cache, guard=UpstreamGuard.from_env())
+    worker = JobWorker(lambda: ai_service, concurrency=int(os.getenv("JOB_WORKERS", "2")))
+
+    if get_event_broker().name == "memory":
+        print("EVENTS_BACKEND=memory: push events from this worker won't reach API subscribers, use database")
+    print(f"Job worker {worker.worker_id} running with {worker.concurrency} slots")
+    worker.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await worker.stop()
+        await ai_service.backend.aclose()
+        await http_client.aclose()
+        if cache is not None:
+            cache.close()
+        await get_event_broker().close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
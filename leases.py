@@ -0,0 +1,119 @@
+import asyncio
+import os
+import socket
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import SessionLocal
+from models import GenerationLease
+
+
+LEASE_TTL = float(os.getenv("GENERATION_LEASE_TTL", "300"))
+POLL_INTERVAL = float(os.getenv("GENERATION_LEASE_POLL_INTERVAL", "0.5"))
+
+_OWNER_PREFIX = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _utcnow() -> datetime:
+    # Leases are stored as naive UTC so comparisons behave the same on SQLite and PostgreSQL
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def acquire_lease(db: AsyncSession, key: str, ttl: float = LEASE_TTL) -> Optional[str]:
+    """
+    Try to take the cross-worker lease for key.
+    Returns an owner token on success, or None if another worker currently holds it.
+    The session must not have pending changes: it is committed or rolled back here.
+    """
+    owner = f"{_OWNER_PREFIX}:{uuid.uuid4().hex}"
+    now = _utcnow()
+    expires_at = now + timedelta(seconds=ttl)
+
+    # The primary key on key makes the insert the atomic "compare and set"
+    db.add(GenerationLease(key=key, owner=owner, expires_at=expires_at))
+    try:
+        await db.commit()
+        return owner
+    except IntegrityError:
+        await db.rollback()
+
+    # Take over a lease whose holder died without releasing it
+    result = await db.execute(
+        update(GenerationLease)
+        .where(GenerationLease.key == key, GenerationLease.expires_at < now)
+        .values(owner=owner, expires_at=expires_at)
+    )
+    await db.commit()
+    return owner if result.rowcount == 1 else None
+
+
+async def renew_lease(db: AsyncSession, key: str, owner: str, ttl: float = LEASE_TTL) -> bool:
+    """Push back the expiry of a lease owner holds; False if it no longer holds it"""
+    result = await db.execute(
+        update(GenerationLease)
+        .where(GenerationLease.key == key, GenerationLease.owner == owner)
+        .values(expires_at=_utcnow() + timedelta(seconds=ttl))
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def _heartbeat(key: str, owner: str, ttl: float) -> None:
+    """Keep renewing a lease until cancelled or it has been taken over"""
+    while True:
+        await asyncio.sleep(ttl / 3)
+        try:
+            # Its own session: the holder's session is busy with the generation
+            async with SessionLocal() as db:
+                if not await renew_lease(db, key, owner, ttl):
+                    return
+        except Exception as e:
+            # The next beat catches up; the lease only lapses if a whole TTL goes by without one
+            print(f"Failed to renew the generation lease {key}: {e}")
+
+
+@asynccontextmanager
+async def renewing(key: str, owner: str, ttl: float = LEASE_TTL):
+    """
+    Renew the lease for key every third of its TTL while the block runs, so a generation that
+    outlasts the TTL isn't taken over; a crashed worker's lease still lapses after one TTL.
+    """
+    heartbeat = asyncio.ensure_future(_heartbeat(key, owner, ttl))
+    try:
+        yield
+    finally:
+        heartbeat.cancel()
+
+
+async def release_lease(db: AsyncSession, key: str, owner: str) -> None:
+    """Release a lease held by owner (no-op if it was taken over after expiring)"""
+    # Discard anything a failed generation left in the session
+    await db.rollback()
+    await db.execute(
+        delete(GenerationLease).where(GenerationLease.key == key, GenerationLease.owner == owner)
+    )
+    await db.commit()
+
+
+async def wait_for_release(db: AsyncSession, key: str, timeout: float = LEASE_TTL) -> None:
+    """Poll until the lease for key is released or has expired"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    while loop.time() < deadline:
+        expires_at = (await db.execute(
+            select(GenerationLease.expires_at).where(GenerationLease.key == key)
+        )).scalar()
+        # End the read so the next poll sees other workers' commits and the connection goes back to the pool
+        await db.commit()
+
+        if expires_at is None or expires_at < _utcnow():
+            # The winner's results were committed by another session: don't serve stale loaded objects
+            db.expire_all()
+            return
+
+        await asyncio.sleep(POLL_INTERVAL)
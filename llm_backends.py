@@ -0,0 +1,337 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional, AsyncIterator
+import httpx
+from llm_cache import cache_key
+from llm_resilience import RetryableUpstreamError, parse_retry_after
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the application-scoped HTTP client used for all OpenRouter calls.
+    Connections are pooled and kept alive so consecutive LLM calls skip the TCP+TLS handshake.
+    """
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("OPENROUTER_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("OPENROUTER_MAX_KEEPALIVE_CONNECTIONS", "10")),
+        keepalive_expiry=float(os.getenv("OPENROUTER_KEEPALIVE_EXPIRY", "60"))
+    )
+
+    # HTTP/2 needs h2 (in requirements.txt); without it httpx refuses to start rather than silently downgrading
+    return httpx.AsyncClient(
+        timeout=float(os.getenv("OPENROUTER_TIMEOUT", "60")),
+        limits=limits,
+        http2=os.getenv("OPENROUTER_HTTP2", "false").lower() in ("1", "true", "yes")
+    )
+
+
+class LLMBackend(ABC):
+    """
+    Transport for chat completions.
+    OpenRouterService owns prompts, caching, rate limiting and parsing; a backend only turns
+    (model, messages) into response text. Retryable failures raise RetryableUpstreamError.
+    """
+    name = "base"
+
+    @abstractmethod
+    async def complete(self, model: str, messages: List[Dict], response_format: Optional[Dict] = None) -> str:
+        """response_format is an OpenAI-style JSON schema constraint; backends may ignore it"""
+
+    async def stream(self, model: str, messages: List[Dict]) -> AsyncIterator[str]:
+        """Yield the response in pieces; backends without native streaming yield it whole"""
+        yield await self.complete(model, messages)
+
+    async def aclose(self) -> None:
+        pass
+
+    def stats(self) -> Dict:
+        return {"name": self.name}
+
+
+class OpenRouterBackend(LLMBackend):
+    """The real OpenRouter chat completions API"""
+    name = "openrouter"
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        # Ask for JSON-schema constrained output (providers that don't support it ignore the field)
+        self.structured_output = os.getenv("OPENROUTER_STRUCTURED_OUTPUT", "true").lower() in ("1", "true", "yes")
+        self.api_key = os.getenv("OPENROUTER_API_KEY")
+        if not self.api_key:
+            raise ValueError("OPENROUTER_API_KEY environment variable not set")
+
+        self.base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1/chat/completions")
+        # Only used by the client-per-call fallback; the shared client reads the same setting
+        self.timeout = float(os.getenv("OPENROUTER_TIMEOUT", "60"))
+        # Shared pooled client (owned by the app lifespan); None falls back to a client per call
+        self.client = client
+
+    def _headers(self) -> Dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    async def complete(self, model: str, messages: List[Dict], response_format: Optional[Dict] = None) -> str:
+        payload = {
+            "model": model,
+            "messages": messages
+        }
+        if response_format is not None and self.structured_output:
+            payload["response_format"] = response_format
+
+        if self.client is not None:
+            return await self._post(self.client, payload)
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            return await self._post(client, payload)
+
+    async def _post(self, client: httpx.AsyncClient, payload: Dict) -> str:
+        """Send a chat completion request using the given client"""
+        try:
+            response = await client.post(
+                self.base_url,
+                headers=self._headers(),
+                json=payload
+            )
+        except httpx.TransportError as e:
+            raise RetryableUpstreamError(f"OpenRouter transport error: {e}") from e
+
+        self._check_status(response)
+        data = response.json()
+        return data["choices"][0]["message"]["content"]
+
+    async def stream(self, model: str, messages: List[Dict]) -> AsyncIterator[str]:
+        if self.client is not None:
+            client = self.client
+            owned_client = None
+        else:
+            client = owned_client = httpx.AsyncClient(timeout=self.timeout)
+
+        try:
+            async with client.stream(
+                "POST",
+                self.base_url,
+                headers=self._headers(),
+                json={
+                    "model": model,
+                    "messages": messages,
+                    "stream": True
+                }
+            ) as response:
+                self._check_status(response)
+                async for line in response.aiter_lines():
+                    # Server-sent events: "data: {...}" lines, ": comment" keep-alives, "data: [DONE]" at the end
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == "[DONE]":
+                        break
+
+                    delta = json.loads(payload)["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+        except httpx.TransportError as e:
+            raise RetryableUpstreamError(f"OpenRouter transport error: {e}") from e
+        finally:
+            if owned_client is not None:
+                await owned_client.aclose()
+
+    @staticmethod
+    def _check_status(response: httpx.Response) -> None:
+        """Turn 429/5xx into retryable errors; other error statuses raise as before"""
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RetryableUpstreamError(
+                f"OpenRouter returned HTTP {response.status_code}",
+                status_code=response.status_code,
+                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+            )
+        response.raise_for_status()
+
+
+class FakeBackend(LLMBackend):
+    """
+    Offline stand-in for load tests and benchmarks.
+    Answers every prompt in this app with a well-formed canned response after a configurable
+    latency, and can inject 429s / 503s to exercise the rate limiter, retries and circuit breaker,
+    and unparseable replies to exercise JSON repair. Follow-up turns (such as a repair request)
+    are answered in the format the conversation's first user prompt asked for.
+    """
+    name = "fake"
+
+    def __init__(
+            self,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            rate_limit_every: int = 0,
+            error_rate: float = 0.0,
+            retry_after: Optional[float] = None,
+            malformed_rate: float = 0.0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_every = rate_limit_every
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.malformed_rate = malformed_rate
+        self.calls = 0
+
+    @classmethod
+    def from_env(cls) -> "FakeBackend":
+        retry_after = os.getenv("LLM_FAKE_RETRY_AFTER")
+        return cls(
+            latency=float(os.getenv("LLM_FAKE_LATENCY", "0.5")),
+            jitter=float(os.getenv("LLM_FAKE_JITTER", "0")),
+            rate_limit_every=int(os.getenv("LLM_FAKE_RATE_LIMIT_EVERY", "0")),
+            error_rate=float(os.getenv("LLM_FAKE_ERROR_RATE", "0")),
+            retry_after=float(retry_after) if retry_after else None,
+            malformed_rate=float(os.getenv("LLM_FAKE_MALFORMED_RATE", "0"))
+        )
+
+    async def _simulate_upstream(self) -> None:
+        self.calls += 1
+        await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+        if self.rate_limit_every and self.calls % self.rate_limit_every == 0:
+            raise RetryableUpstreamError("Fake backend rate limit", status_code=429, retry_after=self.retry_after)
+        if self.error_rate and random.random() < self.error_rate:
+            raise RetryableUpstreamError("Fake backend error", status_code=503)
+
+    def _respond(self, messages: List[Dict]) -> str:
+        prompt = next(message["content"] for message in messages if message["role"] == "user")
+        response = self.reply(prompt)
+        # Only first attempts are broken, so a repair request always succeeds
+        first_attempt = all(message["role"] != "assistant" for message in messages)
+        if first_attempt and self.malformed_rate and random.random() < self.malformed_rate:
+            return response[:len(response) // 2]
+        return response
+
+    async def complete(self, model: str, messages: List[Dict], response_format: Optional[Dict] = None) -> str:
+        await self._simulate_upstream()
+        return self._respond(messages)
+
+    async def stream(self, model: str, messages: List[Dict]) -> AsyncIterator[str]:
+        await self._simulate_upstream()
+        for line in self._respond(messages).splitlines(keepends=True):
+            yield line
+
+    def stats(self) -> Dict:
+        return {"name": self.name, "calls": self.calls, "latency_seconds": self.latency}
+
+    @staticmethod
+    def reply(prompt: str) -> str:
+        """Canned response matching the output format the prompt asks for"""
+        seed = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:6]
+
+        questions = [
+            {
+                "question_text": f"Sample question {i + 1} ({seed})?",
+                "correct_answer_index": i % 4,
+                "answers": [f"Option {chr(65 + a)}" for a in range(4)]
+            }
+            for i in range(5)
+        ]
+        if '"summary_points"' in prompt:
+            return json.dumps({
+                "summary_points": [f"Summary point {i + 1} ({seed})" for i in range(5)],
+                "questions": questions
+            })
+        if '"questions"' in prompt:
+            return json.dumps({"questions": questions})
+        if '"team_strengths"' in prompt:
+            return json.dumps({
+                "team_strengths": "The team stayed focused on the agenda.",
+                "team_weaknesses": "Some decisions were left without owners.",
+                "team_tips": "Assign an owner to every action item."
+            })
+        if '"verdicts"' in prompt:
+            count = int(re.search(r"\((\d+) utterances", prompt).group(1))
+            return json.dumps({"verdicts": [
+                {"index": i, "relevant": True, "chatWarning": "", "warning": ""} for i in range(count)
+            ]})
+        if '"participation_score"' in prompt:
+            return json.dumps({
+                "strengths": "Contributed relevant points.",
+                "weaknesses": "Could be more concise.",
+                "tips": "Prepare notes before the meeting.",
+                "participation_score": 14,
+                "quality_score": 35
+            })
+
+        return "\n".join(f"• Summary point {i + 1} ({seed})" for i in range(5))
+
+
+class ReplayMissError(Exception):
+    """The replay backend has no recorded response for this request"""
+
+
+class RecordReplayBackend(LLMBackend):
+    """
+    Serves responses captured from earlier runs out of a local JSONL file.
+    With an inner backend it records: misses are forwarded to it and appended to the file.
+    Without one it only replays, so runs are fully offline and deterministic.
+    """
+    name = "replay"
+
+    def __init__(self, path: str, inner: Optional[LLMBackend] = None):
+        self.path = path
+        self.inner = inner
+        if inner is not None:
+            self.name = "record"
+        self.hits = 0
+        self.misses = 0
+        self._responses: Dict[str, str] = {}
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._responses[entry["key"]] = entry["response"]
+
+    async def complete(self, model: str, messages: List[Dict], response_format: Optional[Dict] = None) -> str:
+        key = cache_key(model, messages)
+        if key in self._responses:
+            self.hits += 1
+            return self._responses[key]
+
+        self.misses += 1
+        if self.inner is None:
+            raise ReplayMissError(f"No recorded response for request {key} in {self.path}")
+
+        response = await self.inner.complete(model, messages, response_format)
+        self._responses[key] = response
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "model": model, "messages": messages, "response": response}) + "\n")
+        return response
+
+    async def aclose(self) -> None:
+        if self.inner is not None:
+            await self.inner.aclose()
+
+    def stats(self) -> Dict:
+        return {"name": self.name, "hits": self.hits, "misses": self.misses, "recorded": len(self._responses)}
+
+
+def create_backend(client: Optional[httpx.AsyncClient] = None) -> LLMBackend:
+    """
+    Build the LLM backend selected by LLM_BACKEND:
+    openrouter (default), fake, replay (offline, from LLM_RECORDINGS_PATH) or record (OpenRouter + capture)
+    """
+    backend = os.getenv("LLM_BACKEND", "openrouter").lower()
+    recordings_path = os.getenv("LLM_RECORDINGS_PATH", "llm_recordings.jsonl")
+
+    if backend == "openrouter":
+        return OpenRouterBackend(client)
+    if backend == "fake":
+        return FakeBackend.from_env()
+    if backend == "replay":
+        return RecordReplayBackend(recordings_path)
+    if backend == "record":
+        return RecordReplayBackend(recordings_path, inner=OpenRouterBackend(client))
+
+    raise ValueError(f"Unknown LLM_BACKEND: {backend}")
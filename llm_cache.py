@@ -0,0 +1,285 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, List, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def cache_key(model: str, messages: List[Dict]) -> str:
+    """Content address of a chat completion request (hash of model + messages)"""
+    payload = json.dumps(
+        {"model": model, "messages": messages},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache(ABC):
+    """
+    Base class for LLM response caches.
+    Backends implement _get/_set/_delete/_size; hit/miss counting lives here.
+    A ttl of 0 disables expiry, max_entries bounds the number of stored responses.
+    Lookups are awaited: backends that block (disk) run them off the event loop through _run.
+    """
+    backend_name = "base"
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._run(self._get, key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        await self._run(self._set, key, value)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._delete, key)
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend_name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": self._size(),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl
+        }
+
+    def _expires_at(self) -> float:
+        return time.time() + self.ttl if self.ttl > 0 else 0.0
+
+    async def _run(self, operation: Callable[..., T], *args) -> T:
+        """Run a backend operation; in-process backends are fast enough to run inline"""
+        return operation(*args)
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, value: str) -> None:
+        ...
+
+    @abstractmethod
+    def _delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def _size(self) -> int:
+        ...
+
+
+class InMemoryLRUCache(LLMCache):
+    """Process-local LRU cache"""
+    backend_name = "memory"
+
+    def __init__(self, ttl: float, max_entries: int):
+        super().__init__(ttl, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at and expires_at < time.time():
+                del self._entries[key]
+                self.evictions += 1
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (self._expires_at(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(LLMCache):
+    """
+    On-disk cache that survives restarts, stored in a single SQLite table.
+    Every operation runs in a worker thread. Hits don't write: last_access times are kept in
+    memory and written in one batch every touch_interval seconds (and before evicting, so LRU
+    order is current). Eviction runs only once the table holds more than max_entries rows, and
+    then trims to evict_fraction below the limit so the next pass is a while away.
+    """
+    backend_name = "sqlite"
+
+    def __init__(
+            self,
+            path: str,
+            ttl: float,
+            max_entries: int,
+            touch_interval: float = 30.0,
+            evict_fraction: float = 0.1
+    ):
+        super().__init__(ttl, max_entries)
+        self.path = path
+        self.touch_interval = touch_interval
+        self.evict_fraction = evict_fraction
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_access ON llm_cache (last_access)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        # key -> last hit time, not yet written
+        self._touched: Dict[str, float] = {}
+        self._touched_flushed_at = time.monotonic()
+
+    async def _run(self, operation: Callable[..., T], *args) -> T:
+        return await asyncio.to_thread(operation, *args)
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at and expires_at < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._touched.pop(key, None)
+                self._count -= 1
+                self.evictions += 1
+                return None
+
+            self._touched[key] = now
+            if time.monotonic() - self._touched_flushed_at >= self.touch_interval:
+                self._flush_touched()
+                self._conn.commit()
+            return value
+
+    def _set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO llm_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, self._expires_at(), now)
+            ).rowcount
+            if inserted:
+                self._count += 1
+            else:
+                self._conn.execute(
+                    "UPDATE llm_cache SET value = ?, expires_at = ?, last_access = ? WHERE key = ?",
+                    (value, self._expires_at(), now, key)
+                )
+                self._touched.pop(key, None)
+            if self._count > self.max_entries:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired rows, then the least recently used ones; the caller holds the lock and commits"""
+        self._flush_touched()
+        evicted = self._conn.execute(
+            "DELETE FROM llm_cache WHERE expires_at > 0 AND expires_at < ?", (now,)
+        ).rowcount
+        # Other processes may share the file, so the in-memory count is only a trigger
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            keep = int(self.max_entries * (1 - self.evict_fraction))
+            evicted += self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY last_access LIMIT ?)",
+                (count - keep,)
+            ).rowcount
+        self._count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        self.evictions += evicted
+
+    def _flush_touched(self) -> None:
+        """Write the pending last_access times; the caller holds the lock and commits"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE llm_cache SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+        self._touched_flushed_at = time.monotonic()
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._count -= self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,)).rowcount
+            self._conn.commit()
+            self._touched.pop(key, None)
+
+    def _size(self) -> int:
+        # Tracked rather than counted, so /llm/stats doesn't query the file on the event loop
+        return self._count
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
+
+
+def create_llm_cache() -> Optional[LLMCache]:
+    """
+    Build the LLM response cache configured through environment variables.
+    LLM_CACHE_BACKEND: memory (default), sqlite or none
+    """
+    backend = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+    ttl = float(os.getenv("LLM_CACHE_TTL", "86400"))
+    max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+
+    if backend in ("none", "off", "disabled"):
+        return None
+    if backend == "memory":
+        return InMemoryLRUCache(ttl=ttl, max_entries=max_entries)
+    if backend == "sqlite":
+        return SQLiteCache(
+            path=os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3"),
+            ttl=ttl,
+            max_entries=max_entries
+        )
+
+    raise ValueError(f"Unknown LLM_CACHE_BACKEND: {backend}")
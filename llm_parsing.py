@@ -0,0 +1,94 @@
+import json
+from typing import Dict, Iterable
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding ```json ... ``` markdown block if present"""
+    cleaned = text.strip()
+    if cleaned.startswith("```json"):
+        cleaned = cleaned[7:]
+    if cleaned.startswith("```"):
+        cleaned = cleaned[3:]
+    if cleaned.endswith("```"):
+        cleaned = cleaned[:-3]
+    return cleaned.strip()
+
+
+def _first_balanced_object(text: str) -> str:
+    """Return the first balanced {...} span in text, ignoring braces inside JSON strings"""
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = False
+        escaped = False
+        for index in range(start, len(text)):
+            char = text[index]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:index + 1]
+        start = text.find("{", start + 1)
+
+    raise ValueError("No JSON object found in response")
+
+
+def extract_json_object(text: str) -> Dict:
+    """
+    Tolerantly parse the JSON object in a model response.
+    Accepts bare JSON, JSON wrapped in markdown fences, or JSON surrounded by prose.
+    Raises ValueError (json.JSONDecodeError is one) when no object can be parsed.
+    """
+    cleaned = strip_code_fences(text)
+    try:
+        result = json.loads(cleaned)
+    except json.JSONDecodeError:
+        result = json.loads(_first_balanced_object(cleaned))
+
+    if not isinstance(result, dict):
+        raise ValueError(f"Expected a JSON object, got {type(result).__name__}")
+    return result
+
+
+def require_fields(result: Dict, fields: Iterable[str]) -> None:
+    missing = [field for field in fields if field not in result]
+    if missing:
+        raise ValueError(f"Missing required field(s) in AI response: {', '.join(missing)}")
+
+
+def coerce_to_strings(result: Dict, fields: Iterable[str]) -> Dict:
+    """Models sometimes return lists where a paragraph was asked for; join them into one string"""
+    for field in fields:
+        value = result.get(field)
+        if isinstance(value, list):
+            result[field] = " ".join(str(item) for item in value)
+    return result
+
+
+class ParseStats:
+    """Counts how often model output needed repair, i.e. how many regenerations were avoided"""
+
+    def __init__(self):
+        self.responses = 0
+        self.first_try_failures = 0
+        self.repaired = 0
+        self.failed = 0
+
+    def stats(self) -> Dict:
+        return {
+            "responses": self.responses,
+            "first_try_failures": self.first_try_failures,
+            "repaired": self.repaired,
+            "failed": self.failed,
+            "parse_failure_rate": round(self.first_try_failures / self.responses, 4) if self.responses else 0.0
+        }
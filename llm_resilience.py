@@ -0,0 +1,287 @@
+import asyncio
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class RetryableUpstreamError(Exception):
+    """A failed upstream call worth retrying: 429, 5xx or a transport error (status_code None)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class UpstreamUnavailableError(Exception):
+    """OpenRouter is unavailable: the circuit breaker is open or retries were exhausted"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP-date values are ignored)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """
+    Client-side rate limiter: rate tokens per second, bursts of up to capacity.
+    A rate of 0 disables limiting. pause() stops all callers, e.g. while honouring Retry-After.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0 and self.paused_until <= time.monotonic():
+            return
+
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                elif self.rate <= 0:
+                    return
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+
+                self.waits += 1
+                self.wait_seconds += delay
+                await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> Dict:
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.capacity,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3)
+        }
+
+
+class CircuitBreaker:
+    """
+    Fails fast while upstream is down.
+    Opens after failure_threshold consecutive failures; after reset_timeout it lets a single trial
+    call through (half-open), rejecting the others until it closes on that call's success or
+    re-opens on its failure.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self.probing = False  # the half-open trial call is in flight
+
+    def before_call(self) -> bool:
+        """Raise while calls are rejected; True when this call is the half-open trial (see end_probe)"""
+        if self.state == "closed":
+            return False
+
+        if self.state == "open":
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                raise UpstreamUnavailableError("OpenRouter circuit breaker is open", retry_after=remaining)
+            self.state = "half_open"
+
+        if self.probing:
+            self.rejected += 1
+            raise UpstreamUnavailableError(
+                "OpenRouter circuit breaker is half-open, waiting for the trial call",
+                retry_after=1.0
+            )
+        self.probing = True
+        return True
+
+    def end_probe(self) -> None:
+        """The trial call is over; if it neither succeeded nor failed (e.g. cancelled) the next call is the trial"""
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.state = "closed"
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+
+class UpstreamGuard:
+    """
+    Wraps every OpenRouter call with a token-bucket limiter, a global concurrency cap,
+    retries with exponential backoff and jitter (honouring Retry-After) and a circuit breaker.
+    """
+
+    def __init__(
+            self,
+            rate: float,
+            burst: float,
+            max_concurrency: int,
+            max_retries: int,
+            backoff_base: float,
+            backoff_max: float,
+            breaker_threshold: int,
+            breaker_reset: float
+    ):
+        self.limiter = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.calls = 0
+        self.attempts = 0
+        self.successes = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.server_errors = 0
+        self.transport_errors = 0
+        self.exhausted = 0
+        self.in_flight = 0
+
+    @classmethod
+    def from_env(cls) -> "UpstreamGuard":
+        return cls(
+            rate=float(os.getenv("OPENROUTER_REQUESTS_PER_MINUTE", "20")) / 60,
+            burst=float(os.getenv("OPENROUTER_BURST", "5")),
+            max_concurrency=int(os.getenv("OPENROUTER_MAX_CONCURRENCY", "4")),
+            max_retries=int(os.getenv("OPENROUTER_MAX_RETRIES", "4")),
+            backoff_base=float(os.getenv("OPENROUTER_BACKOFF_BASE", "1")),
+            backoff_max=float(os.getenv("OPENROUTER_BACKOFF_MAX", "30")),
+            breaker_threshold=int(os.getenv("OPENROUTER_BREAKER_THRESHOLD", "5")),
+            breaker_reset=float(os.getenv("OPENROUTER_BREAKER_RESET", "30"))
+        )
+
+    @asynccontextmanager
+    async def attempt(self):
+        """One upstream attempt: breaker check, rate limit token and a concurrency slot"""
+        probe = self.breaker.before_call()
+        try:
+            await self.limiter.acquire()
+            async with self._semaphore:
+                self.attempts += 1
+                self.in_flight += 1
+                try:
+                    yield
+                finally:
+                    self.in_flight -= 1
+        finally:
+            if probe:
+                self.breaker.end_probe()
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self.breaker.record_success()
+
+    def record_failure(self, error: RetryableUpstreamError) -> None:
+        if error.status_code == 429:
+            # Upstream is alive but throttling us: slow every caller down instead of tripping the breaker
+            self.rate_limited += 1
+            self.breaker.record_success()
+            if error.retry_after:
+                self.limiter.pause(error.retry_after)
+            return
+
+        if error.status_code is None:
+            self.transport_errors += 1
+        else:
+            self.server_errors += 1
+        self.breaker.record_failure()
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        # Full jitter on the exponential step; Retry-After is a lower bound
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def call(self, send: Callable[[], Awaitable[T]]) -> T:
+        """Run send() with limiting and retries; raises UpstreamUnavailableError when giving up"""
+        self.calls += 1
+        last_error: Optional[RetryableUpstreamError] = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                self.retries += 1
+                await asyncio.sleep(self.backoff_delay(attempt - 1, last_error.retry_after))
+
+            try:
+                async with self.attempt():
+                    result = await send()
+            except RetryableUpstreamError as e:
+                self.record_failure(e)
+                last_error = e
+                continue
+
+            self.record_success()
+            return result
+
+        self.exhausted += 1
+        raise UpstreamUnavailableError(
+            f"OpenRouter request failed after {self.max_retries + 1} attempts: {last_error}",
+            retry_after=last_error.retry_after
+        )
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "server_errors": self.server_errors,
+            "transport_errors": self.transport_errors,
+            "exhausted": self.exhausted,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "limiter": self.limiter.stats(),
+            "circuit_breaker": self.breaker.stats()
+        }
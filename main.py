@@ -1,15 +1,26 @@
+import asyncio
+import json
+import os
 from contextlib import asynccontextmanager
-from typing import Annotated, List, Optional
-from fastapi import FastAPI, Depends, WebSocket, HTTPException, status, BackgroundTasks
-from database import Base, engine, SessionLocal
-from sqlalchemy.orm import Session
-from datetime import datetime
+from typing import Annotated, List, Optional, AsyncIterator, Dict
+from fastapi import FastAPI, Depends, WebSocket, WebSocketDisconnect, HTTPException, status, Request, Query, Response, \
+    Header
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse, JSONResponse
+from database import engine, get_db, pool_stats
+from migrations import run_migrations
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from schemas import (
     UserResponse,
     MeetingResponse,
+    MeetingOverviewResponse,
     MeetingCreate,
     MeetingCreateResponse,
     TranscriptItem,
+    RelevancyCheck,
+    RelevancyResponse,
     TranscribeResponse,
     QuizResponse,
     QuizSubmission,
@@ -20,33 +31,86 @@ from schemas import (
     QuestionWithCorrectAnswer,
     UserMeetingEvaluationResponse,
     ScoreBreakdown,
-    TeamMeetingEvaluationResponse
+    TeamMeetingEvaluationResponse,
+    JobCreate,
+    JobResponse
 )
-from models import User, Meeting, Transcribe
+from models import User, Meeting, Transcribe, Job, JobStatus, QuizType, UserMeetingEvaluation
 from quiz_service import QuizService
-from auth import get_current_user
+from openrouter_service import OpenRouterService
+from llm_backends import create_http_client
+from llm_cache import create_llm_cache
+from llm_resilience import UpstreamGuard, UpstreamUnavailableError
+from pregeneration import Pregenerator
+from relevancy import RelevancyBatcher
+from overview import get_meetings_overview
+from ingest import ingest_transcripts, read_ndjson_batches, find_transcript_batch, record_transcript_batch
+from jobs import JobWorker, enqueue_job, get_job, JOB_RETRY_AFTER
+from events import Subscription, create_event_broker, set_event_broker, get_event_broker, publish_event
+from auth import get_current_user, invalidate_user, user_cache
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine, checkfirst=True)
-    yield
+    # Creates missing tables and brings existing databases up to date (see migrations.py)
+    await run_migrations()
+
+    # One pooled, keep-alive HTTP client shared by every OpenRouter call
+    app.state.http_client = create_http_client()
+    app.state.llm_cache = create_llm_cache()
+    app.state.llm_guard = UpstreamGuard.from_env()
+    app.state.ai_service = None
+    app.state.pregenerator = Pregenerator.from_env()
+    app.state.relevancy_batcher = RelevancyBatcher.from_env()
+
+    # Per-meeting push events (WebSocket / SSE); the database backend shares them between workers
+    set_event_broker(create_event_broker())
+    await get_event_broker().start()
+
+    # In-process job workers; set JOB_WORKERS=0 when running them separately with `python -m jobs`
+    job_workers = int(os.getenv("JOB_WORKERS", "2"))
+    app.state.job_worker = JobWorker(lambda: _ensure_ai_service(app), job_workers) if job_workers > 0 else None
+    if app.state.job_worker is not None:
+        app.state.job_worker.start()
+    try:
+        yield
+    finally:
+        if app.state.job_worker is not None:
+            await app.state.job_worker.stop()
+        await app.state.pregenerator.close()
+        await app.state.relevancy_batcher.close()
+        await get_event_broker().close()
+        if app.state.ai_service is not None:
+            await app.state.ai_service.backend.aclose()
+        await app.state.http_client.aclose()
+        if app.state.llm_cache is not None:
+            app.state.llm_cache.close()
+        await engine.dispose()
 
 
 app = FastAPI(lifespan=lifespan)
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _ensure_ai_service(app: FastAPI) -> OpenRouterService:
+    """Return the application-scoped OpenRouterService, created on first use"""
+    if app.state.ai_service is None:
+        app.state.ai_service = OpenRouterService(
+            client=app.state.http_client,
+            cache=app.state.llm_cache,
+            guard=app.state.llm_guard
+        )
+    return app.state.ai_service
 
 
-db_dependency = Annotated[Session, Depends(get_db)]
+def get_ai_service(request: Request) -> OpenRouterService:
+    return _ensure_ai_service(request.app)
+
+
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+ai_service_dependency = Annotated[OpenRouterService, Depends(get_ai_service)]
 current_user_dependency = Annotated[User, Depends(get_current_user)]
+# Opt-in asynchronous mode for slow LLM endpoints: ?async=true or "Prefer: respond-async"
+respond_async_query = Annotated[bool, Query(alias="async")]
 
 
 @app.get("/")
@@ -54,16 +118,41 @@ async def read_root():
     return {"Hello": "World"}
 
 
+@app.get("/llm/stats")
+async def read_llm_stats(request: Request):
+    """
+    Counters for the LLM call path: backend in use, response cache hits/misses and evictions,
+    rate limiter waits, retries, upstream errors, circuit breaker state and JSON parse/repair rates.
+    """
+    cache = request.app.state.llm_cache
+    ai_service = request.app.state.ai_service
+    return {
+        "backend": ai_service.backend.stats() if ai_service is not None else None,
+        "cache": cache.stats() if cache is not None else None,
+        "upstream": request.app.state.llm_guard.stats(),
+        "parsing": ai_service.parse_stats.stats() if ai_service is not None else None,
+        "pregeneration": request.app.state.pregenerator.stats(),
+        "relevancy": request.app.state.relevancy_batcher.stats(),
+        "user_cache": user_cache.stats()
+    }
+
+
+@app.get("/db/stats")
+async def read_db_stats():
+    """Connection pool occupancy (size, checked in/out, overflow), connects and checkouts since start"""
+    return pool_stats()
+
+
 # User endpoints
 @app.get("/user")
 async def read_users(db: db_dependency):
-    users = db.query(User).all()
+    users = (await db.execute(select(User))).scalars().all()
     return users
 
 
 @app.get("/user/{username}", response_model=UserResponse)
 async def read_user(username: str, db: db_dependency):
-    user = db.query(User).filter(User.username == username).first()
+    user = (await db.execute(select(User).where(User.username == username))).scalars().first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return user
@@ -77,18 +166,18 @@ async def update_user(username: str, updated_user: UserResponse, db: db_dependen
 # Meeting endpoints
 @app.get("/meeting", response_model=List[MeetingResponse])
 async def read_meetings(db: db_dependency):
-    meetings = db.query(Meeting).all()
+    meetings = (await db.execute(select(Meeting))).scalars().all()
     return meetings
 @app.post("/meeting", response_model=MeetingCreateResponse, status_code=status.HTTP_201_CREATED)
 async def create_meeting(
         meeting_data: MeetingCreate,
-        background_tasks: BackgroundTasks,
-        db: db_dependency
+        db: db_dependency,
+        request: Request
 ):
     """
     Creates a new meeting and returns the database-generated meeting_id.
     The ID is auto-generated by the database.
-    Automatically generates intro quiz in background.
+    Automatically queues a background job that generates the intro quiz.
     """
     new_meeting = Meeting(
         name=meeting_data.name,
@@ -96,24 +185,12 @@ async def create_meeting(
     )
 
     db.add(new_meeting)
-    db.commit()
-    db.refresh(new_meeting)
-
-    # Generate intro quiz in background (non-blocking)
-    async def generate_intro_quiz_task():
-        try:
-            # Create new DB session for background task
-            db_bg = SessionLocal()
-            try:
-                quiz_service = QuizService(db_bg)
-                await quiz_service.get_or_create_intro_quiz(new_meeting.id)
-            finally:
-                db_bg.close()
-        except Exception as e:
-            # Log error but don't fail meeting creation
-            print(f"Failed to generate intro quiz for meeting {new_meeting.id}: {e}")
-
-    background_tasks.add_task(generate_intro_quiz_task)
+    await db.commit()
+    await db.refresh(new_meeting)
+
+    # Generate intro quiz in background (durable job, retried on failure)
+    await enqueue_job(db, "intro_quiz", {"meeting_id": new_meeting.id})
+    _notify_job_worker(request)
 
     return MeetingCreateResponse(
         id=new_meeting.id,
@@ -123,70 +200,254 @@ async def create_meeting(
 
 @app.get("/meeting/{meeting_id}", response_model=MeetingResponse)
 async def get_meeting(meeting_id: int, db: db_dependency):
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    meeting = await db.get(Meeting, meeting_id)
     if not meeting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
     return meeting
 
 
+def _notify_job_worker(request: Request) -> None:
+    if request.app.state.job_worker is not None:
+        request.app.state.job_worker.notify()
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        payload=json.loads(job.payload),
+        status=job.status.value,
+        attempts=job.attempts,
+        max_attempts=job.max_attempts,
+        last_error=job.last_error,
+        result=json.loads(job.result) if job.result else None,
+        run_after=job.run_after,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
+
+
+def _wants_async(request: Request, respond_async: bool) -> bool:
+    return respond_async or "respond-async" in request.headers.get("Prefer", "").lower()
+
+
+async def _accepted(request: Request, db: AsyncSession, meeting_id: int, kind: str, payload: Dict) -> JSONResponse:
+    """
+    Queue the work as a job and answer 202 Accepted with the job, its status URL and a Retry-After hint.
+    Unknown meetings are rejected up front instead of producing a dead job.
+    """
+    if not await db.get(Meeting, meeting_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Meeting {meeting_id} not found")
+
+    job = await enqueue_job(db, kind, payload)
+    _notify_job_worker(request)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(_job_response(job)),
+        headers={
+            "Location": f"/jobs/{job.id}",
+            "Retry-After": str(JOB_RETRY_AFTER),
+            "Preference-Applied": "respond-async"
+        }
+    )
+
+
+# Background job endpoints
+@app.post("/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(job_data: JobCreate, db: db_dependency, request: Request):
+    """
+    Queue slow LLM work (intro_quiz, outro_quiz, summary, user_evaluation, team_evaluation).
+    Returns the job (or the identical one already queued); poll GET /jobs/{id} for the result.
+    """
+    try:
+        job = await enqueue_job(db, job_data.kind, job_data.payload)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    _notify_job_worker(request)
+    return _job_response(job)
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def read_job(job_id: int, db: db_dependency, response: Response):
+    """
+    Status of a background job: queued, running, succeeded (with result) or dead (with last_error).
+    Unfinished jobs carry a Retry-After hint for the next poll.
+    """
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+    if job.status in (JobStatus.queued, JobStatus.running):
+        response.headers["Retry-After"] = str(JOB_RETRY_AFTER)
+    return _job_response(job)
+
+
 # Transcript endpoints
 @app.post("/meeting/{meeting_id}/transcripts", status_code=status.HTTP_201_CREATED)
-async def create_transcripts(meeting_id: int, transcripts: List[TranscriptItem], db: db_dependency):
+async def create_transcripts(
+        meeting_id: int,
+        transcripts: List[TranscriptItem],
+        db: db_dependency,
+        request: Request,
+        response: Response,
+        idempotency_key: Annotated[Optional[str], Header(max_length=255)] = None
+):
     """
     Receives an array of transcripts for a specific meeting_id (as URL parameter).
     Creates or updates users as needed, then saves all transcripts.
+    Summary and outro quiz generation is then started in the background so they are ready when opened.
+    Transcripts already stored (same user, meeting and timestamp) are skipped and counted as duplicates.
+    A retry sent with the same Idempotency-Key header returns the original result without ingesting
+    again, marked with Idempotent-Replayed: true.
     """
+    if idempotency_key:
+        batch = await find_transcript_batch(db, meeting_id, idempotency_key)
+        if batch:
+            return _replay_transcript_batch(response, batch)
+
     # Verify meeting exists
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    meeting = await db.get(Meeting, meeting_id)
     if not meeting:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Meeting with id {meeting_id} not found"
         )
 
-    created_transcripts = []
+    try:
+        result = await ingest_transcripts(db, meeting_id, transcripts)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid transcript: {e}")
+    if idempotency_key:
+        record_transcript_batch(db, meeting_id, idempotency_key, result)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request with the same key committed first; its result stands
+        await db.rollback()
+        batch = await find_transcript_batch(db, meeting_id, idempotency_key) if idempotency_key else None
+        if not batch:
+            raise
+        return _replay_transcript_batch(response, batch)
+    for username in result["updated_users"]:
+        invalidate_user(username)
+
+    # A batch that was already stored changes nothing downstream
+    if result["transcript_count"]:
+        await publish_event(meeting_id, "transcripts_ingested", {
+            "meeting_id": meeting_id,
+            "transcript_count": result["transcript_count"]
+        })
+        _schedule_pregeneration(request, meeting_id)
+
+    return _transcripts_created(meeting_id, result["transcript_count"], result["duplicate_count"])
+
+
+def _transcripts_created(meeting_id: int, transcript_count: int, duplicate_count: int) -> Dict:
+    return {
+        "message": f"Successfully created {transcript_count} transcripts",
+        "meeting_id": meeting_id,
+        "transcript_count": transcript_count,
+        "duplicate_count": duplicate_count
+    }
 
-    for transcript in transcripts:
-        # Check if user exists, create if not
-        user = db.query(User).filter(User.username == transcript.username).first()
-        if not user:
-            user = User(
-                username=transcript.username,
-                discord_user_id=transcript.userId
-            )
-            db.add(user)
-            db.flush()  # Get the user ID without committing
-        elif not user.discord_user_id:
-            # Update discord_user_id if it wasn't set
-            user.discord_user_id = transcript.userId
-
-        # Parse timestamp
-        timestamp = datetime.fromisoformat(transcript.timestamp.replace('Z', '+00:00'))
-
-        # Create transcript
-        new_transcript = Transcribe(
-            user_username=user.username,
-            meeting_id=meeting_id,
-            transcription_text=transcript.transcription,
-            timestamp=timestamp,
-            guild_id=transcript.guildId,
-            channel_id=transcript.channelId
+
+def _replay_transcript_batch(response: Response, batch) -> Dict:
+    response.headers["Idempotent-Replayed"] = "true"
+    return _transcripts_created(batch.meeting_id, batch.transcript_count, batch.duplicate_count)
+
+
+@app.post("/meeting/{meeting_id}/transcripts/stream", status_code=status.HTTP_201_CREATED)
+async def stream_transcripts(meeting_id: int, db: db_dependency, request: Request):
+    """
+    Streaming variant of POST /meeting/{meeting_id}/transcripts for long or live uploads.
+    The body is NDJSON (application/x-ndjson, may be chunked): one transcript object per line.
+    Lines are stored in batches of TRANSCRIPT_STREAM_BATCH_SIZE, each committed as it fills (or after
+    TRANSCRIPT_STREAM_FLUSH_INTERVAL seconds), so transcripts are readable before the upload ends and
+    the request never holds the whole body. Pre-generation starts once the stream ends.
+    A bad line fails the request with 400; batches committed before it are kept, and re-sending the
+    stream skips the transcripts already stored.
+    """
+    meeting = await db.get(Meeting, meeting_id)
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Meeting with id {meeting_id} not found"
         )
 
-        db.add(new_transcript)
-        created_transcripts.append(new_transcript)
+    transcript_count = 0
+    duplicate_count = 0
+    batches = 0
+    try:
+        async for batch in read_ndjson_batches(request.stream()):
+            result = await ingest_transcripts(db, meeting_id, batch)
+            await db.commit()
+            for username in result["updated_users"]:
+                invalidate_user(username)
+
+            transcript_count += result["transcript_count"]
+            duplicate_count += result["duplicate_count"]
+            batches += 1
+            if result["transcript_count"]:
+                await publish_event(meeting_id, "transcripts_ingested", {
+                    "meeting_id": meeting_id,
+                    "transcript_count": result["transcript_count"]
+                })
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid transcript ({e}); {transcript_count} transcripts before it were stored"
+        )
+    finally:
+        if transcript_count:
+            _schedule_pregeneration(request, meeting_id)
 
-    db.commit()
+    return {**_transcripts_created(meeting_id, transcript_count, duplicate_count), "batches": batches}
 
-    # Refresh all transcripts to get their IDs
-    for t in created_transcripts:
-        db.refresh(t)
 
-    return {
-        "message": f"Successfully created {len(created_transcripts)} transcripts",
-        "meeting_id": meeting_id,
-        "transcript_count": len(created_transcripts)
-    }
+def _schedule_pregeneration(request: Request, meeting_id: int) -> None:
+    """Speculatively generate the summary and outro quiz (restarts if more transcripts arrive)"""
+    try:
+        request.app.state.pregenerator.schedule(meeting_id, get_ai_service(request))
+    except ValueError as e:
+        print(f"Skipping summary and outro quiz pre-generation for meeting {meeting_id}: {e}")
+
+
+@app.post("/meeting/{meeting_id}/relevancy", response_model=RelevancyResponse)
+async def check_relevancy(
+        meeting_id: int,
+        check: RelevancyCheck,
+        db: db_dependency,
+        ai_service: ai_service_dependency,
+        request: Request
+):
+    """
+    Live relevancy check for one utterance, answered as {relevant, chatWarning, warning}.
+    Utterances from all speakers of the meeting that arrive within RELEVANCY_WINDOW seconds are
+    judged together in one LLM call (up to RELEVANCY_BATCH_SIZE per call), so the reply takes
+    up to that window longer than a lone check.
+    """
+    meeting = await db.get(Meeting, meeting_id)
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Meeting with id {meeting_id} not found"
+        )
+    # Release the pooled connection while the window fills and the LLM answers
+    await db.close()
+
+    try:
+        return await request.app.state.relevancy_batcher.check(
+            meeting, check.username, check.transcription, ai_service
+        )
+    except UpstreamUnavailableError as e:
+        raise _upstream_unavailable(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to check relevancy: {str(e)}"
+        )
 
 
 @app.get("/meeting/{meeting_id}/transcripts", response_model=list[TranscribeResponse])
@@ -194,9 +455,11 @@ async def get_meeting_transcripts(meeting_id: int, db: db_dependency):
     """
     Get all transcripts for a specific meeting, ordered by timestamp.
     """
-    transcripts = db.query(Transcribe).filter(
-        Transcribe.meeting_id == meeting_id
-    ).order_by(Transcribe.timestamp.asc()).all()
+    transcripts = (await db.execute(
+        select(Transcribe).where(
+            Transcribe.meeting_id == meeting_id
+        ).order_by(Transcribe.timestamp.asc())
+    )).scalars().all()
 
     return transcripts
 
@@ -205,23 +468,33 @@ async def get_meeting_transcripts(meeting_id: int, db: db_dependency):
 # QUIZ ENDPOINTS
 # ============================================================================
 
-@app.get("/meeting/{meeting_id}/intro-quiz", response_model=QuizResponse)
+@app.get("/meeting/{meeting_id}/intro-quiz", response_model=QuizResponse, responses={202: {"model": JobResponse}})
 async def get_intro_quiz(
     meeting_id: int, 
     db: db_dependency,
-    current_user: current_user_dependency
+    ai_service: ai_service_dependency,
+    current_user: current_user_dependency,
+    request: Request,
+    respond_async: respond_async_query = False
 ):
     """
     Get or generate intro quiz for a meeting.
     Returns quiz without correct answers.
+    With ?async=true or "Prefer: respond-async", a quiz that still has to be generated is queued
+    and 202 is returned with the job (poll GET /jobs/{id}).
     Requires X-User-Username header for authentication.
     """
+    quiz_service = QuizService(db, ai_service)
+    if _wants_async(request, respond_async) and not await quiz_service.get_meeting_quiz(meeting_id, QuizType.intro):
+        return await _accepted(request, db, meeting_id, "intro_quiz", {"meeting_id": meeting_id})
+
     try:
-        quiz_service = QuizService(db)
         quiz = await quiz_service.get_or_create_intro_quiz(meeting_id)
         return quiz
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except UpstreamUnavailableError as e:
+        raise _upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -229,24 +502,33 @@ async def get_intro_quiz(
         )
 
 
-@app.get("/meeting/{meeting_id}/outro-quiz", response_model=QuizResponse)
+@app.get("/meeting/{meeting_id}/outro-quiz", response_model=QuizResponse, responses={202: {"model": JobResponse}})
 async def get_outro_quiz(
     meeting_id: int, 
     db: db_dependency,
-    current_user: current_user_dependency
+    ai_service: ai_service_dependency,
+    current_user: current_user_dependency,
+    request: Request,
+    respond_async: respond_async_query = False
 ):
     """
     Get or generate outro quiz for a meeting based on transcripts.
     Returns quiz without correct answers.
     Requires transcripts to exist.
+    Supports the asynchronous 202 mode (?async=true or "Prefer: respond-async").
     Requires X-User-Username header for authentication.
     """
+    quiz_service = QuizService(db, ai_service)
+    if _wants_async(request, respond_async) and not await quiz_service.get_meeting_quiz(meeting_id, QuizType.outro):
+        return await _accepted(request, db, meeting_id, "outro_quiz", {"meeting_id": meeting_id})
+
     try:
-        quiz_service = QuizService(db)
         quiz = await quiz_service.get_or_create_outro_quiz(meeting_id)
         return quiz
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except UpstreamUnavailableError as e:
+        raise _upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -255,13 +537,13 @@ async def get_outro_quiz(
 
 
 @app.get("/meeting/{meeting_id}/summary", response_model=MeetingSummaryResponse)
-async def get_meeting_summary(meeting_id: int, db: db_dependency):
+async def get_meeting_summary(meeting_id: int, db: db_dependency, ai_service: ai_service_dependency):
     """
     Get meeting summary (generated from transcripts).
     Returns summary points and metadata.
     """
-    quiz_service = QuizService(db)
-    summary = quiz_service.get_meeting_summary(meeting_id)
+    quiz_service = QuizService(db, ai_service)
+    summary = await quiz_service.get_meeting_summary(meeting_id)
 
     if not summary:
         raise HTTPException(
@@ -271,29 +553,159 @@ async def get_meeting_summary(meeting_id: int, db: db_dependency):
 
     return summary
 
-@app.post("/meeting/{meeting_id}/summary/generate", response_model=MeetingSummaryResponse)
-async def generate_meeting_summary(meeting_id: int, db: db_dependency):
+@app.post("/meeting/{meeting_id}/summary/generate", response_model=MeetingSummaryResponse, responses={202: {"model": JobResponse}})
+async def generate_meeting_summary(
+        meeting_id: int,
+        db: db_dependency,
+        ai_service: ai_service_dependency,
+        request: Request,
+        respond_async: respond_async_query = False
+):
     """
     Generate a new summary from meeting transcripts.
     This will analyze all transcripts and create a comprehensive summary.
+    Supports the asynchronous 202 mode (?async=true or "Prefer: respond-async").
     """
+    if _wants_async(request, respond_async):
+        return await _accepted(request, db, meeting_id, "summary", {"meeting_id": meeting_id})
+
     try:
-        quiz_service = QuizService(db)
+        quiz_service = QuizService(db, ai_service)
         summary = await quiz_service.generate_meeting_summary(meeting_id)
         return summary
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except UpstreamUnavailableError as e:
+        raise _upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate summary: {str(e)}"
         )
 
+def _upstream_unavailable(e: UpstreamUnavailableError) -> HTTPException:
+    """Map an exhausted/short-circuited OpenRouter call to 503 with a Retry-After hint"""
+    headers = {"Retry-After": str(max(1, int(e.retry_after)))} if e.retry_after is not None else None
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers=headers
+    )
+
+
+def _format_sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+async def _sse_stream(events: AsyncIterator[Dict]) -> AsyncIterator[str]:
+    """Render {"event", "data"} dicts as Server-Sent Events, reporting failures as an error event"""
+    try:
+        async for item in events:
+            yield _format_sse(item["event"], item["data"])
+    except Exception as e:
+        yield _format_sse("error", {"detail": f"Failed to generate summary: {str(e)}"})
+
+
+@app.post("/meeting/{meeting_id}/summary/stream")
+async def stream_meeting_summary(meeting_id: int, db: db_dependency, ai_service: ai_service_dependency):
+    """
+    Streaming variant of /summary/generate using Server-Sent Events.
+    Emits a "start" event immediately, one "bullet" event per summary point as the model
+    produces it, and a final "done" event carrying the saved summary (or an "error" event).
+    """
+    try:
+        quiz_service = QuizService(db, ai_service)
+        events = await quiz_service.stream_meeting_summary(meeting_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return StreamingResponse(
+        _sse_stream(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ============================================================================
+# PUSH EVENTS
+# ============================================================================
+
+async def _subscribe_to_meeting(db: AsyncSession, meeting_id: int):
+    """Subscribe first, then read the snapshot, so nothing that happens in between is missed"""
+    subscription = get_event_broker().subscribe(meeting_id)
+    # The snapshot only reads the database, so push channels work without an LLM configured
+    snapshot = await QuizService(db).get_meeting_status(meeting_id)
+    # Release the pooled connection; the subscription may stay open for hours
+    await db.close()
+    if snapshot is None:
+        subscription.close()
+    return subscription, snapshot
+
+
+@app.websocket("/ws/meeting/{meeting_id}")
+async def meeting_events_websocket(websocket: WebSocket, meeting_id: int, db: db_dependency):
+    """
+    Push channel for a meeting. Sends a "status" event with what is already available, then
+    transcripts_ingested, summary_ready, intro_quiz_ready, outro_quiz_ready,
+    user_evaluation_ready and team_evaluation_ready events as they happen.
+    Each message is JSON: {"event": ..., "data": {...}}.
+    """
+    subscription, snapshot = await _subscribe_to_meeting(db, meeting_id)
+    if snapshot is None:
+        await websocket.close(code=1008, reason=f"Meeting {meeting_id} not found")
+        return
+
+    await websocket.accept()
+
+    async def forward_events():
+        await websocket.send_json(jsonable_encoder({"event": "status", "data": snapshot}))
+        async for item in subscription:
+            await websocket.send_json(jsonable_encoder(item))
+
+    forwarder = asyncio.ensure_future(forward_events())
+    try:
+        # Messages from the client are ignored; this only waits for it to disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        forwarder.cancel()
+        subscription.close()
+
+
+async def _sse_events(subscription: Subscription, snapshot: Dict) -> AsyncIterator[str]:
+    try:
+        yield _format_sse("status", snapshot)
+        while True:
+            item = await subscription.get(timeout=15)
+            if item is None:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            yield _format_sse(item["event"], item["data"])
+    finally:
+        subscription.close()
+
+
+@app.get("/meeting/{meeting_id}/events")
+async def meeting_events_stream(meeting_id: int, db: db_dependency):
+    """Server-Sent Events fallback for /ws/meeting/{meeting_id}, with the same events"""
+    subscription, snapshot = await _subscribe_to_meeting(db, meeting_id)
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Meeting {meeting_id} not found")
+
+    return StreamingResponse(
+        _sse_events(subscription, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/quiz/{quiz_id}/submit", response_model=QuizSubmissionResponse)
 async def submit_quiz(
     quiz_id: int, 
     submission: QuizSubmission, 
     db: db_dependency,
+    ai_service: ai_service_dependency,
     current_user: current_user_dependency
 ):
     """
@@ -309,10 +721,10 @@ async def submit_quiz(
         )
     
     try:
-        quiz_service = QuizService(db)
+        quiz_service = QuizService(db, ai_service)
 
         # Validate quiz exists
-        quiz = quiz_service.get_quiz_by_id(quiz_id)
+        quiz = await quiz_service.get_quiz_by_id(quiz_id)
         if not quiz:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -329,7 +741,7 @@ async def submit_quiz(
         ]
 
         # Submit and get results
-        results = quiz_service.submit_quiz_attempt(
+        results = await quiz_service.submit_quiz_attempt(
             quiz_id=quiz_id,
             user_username=submission.user_username,
             answers=answers
@@ -375,10 +787,33 @@ async def submit_quiz(
         )
 
 
+@app.get("/user/{username}/meetings-overview", response_model=List[MeetingOverviewResponse])
+async def read_meetings_overview(
+        username: str,
+        db: db_dependency,
+        current_user: current_user_dependency
+):
+    """
+    Everything the meetings dashboard shows, in one request: each meeting with its intro / outro
+    quiz ids and status, the user's attempts, whether a summary exists and the next step.
+    Read-only: missing quizzes and summaries are reported (as "generating" while a job is queued),
+    never generated.
+    Requires X-User-Username header for authentication.
+    """
+    if username != current_user.username:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot view another user's meetings overview"
+        )
+
+    return await get_meetings_overview(db, username)
+
+
 @app.get("/user/{username}/quiz-attempts", response_model=List[UserQuizAttemptResponse])
 async def get_user_quiz_attempts(
         username: str,
         db: db_dependency,
+        ai_service: ai_service_dependency,
         current_user: current_user_dependency,
         quiz_id: Optional[int] = None
 ):
@@ -394,8 +829,8 @@ async def get_user_quiz_attempts(
             detail="Cannot view another user's quiz attempts"
         )
     
-    quiz_service = QuizService(db)
-    attempts = quiz_service.get_user_attempts(username, quiz_id)
+    quiz_service = QuizService(db, ai_service)
+    attempts = await quiz_service.get_user_attempts(username, quiz_id)
 
     # Add calculated fields
     response = []
@@ -417,13 +852,13 @@ async def get_user_quiz_attempts(
 
 
 @app.get("/quiz/{quiz_id}", response_model=QuizResponse)
-async def get_quiz(quiz_id: int, db: db_dependency):
+async def get_quiz(quiz_id: int, db: db_dependency, ai_service: ai_service_dependency):
     """
     Get quiz by ID without correct answers.
     Use this to display quiz to users before submission.
     """
-    quiz_service = QuizService(db)
-    quiz = quiz_service.get_quiz_by_id(quiz_id)
+    quiz_service = QuizService(db, ai_service)
+    quiz = await quiz_service.get_quiz_by_id(quiz_id)
 
     if not quiz:
         raise HTTPException(
@@ -438,12 +873,15 @@ async def get_quiz(quiz_id: int, db: db_dependency):
 # PERFORMANCE EVALUATION ENDPOINT
 # ============================================================================
 
-@app.get("/meeting/{meeting_id}/evaluate/{username}", response_model=UserMeetingEvaluationResponse)
+@app.get("/meeting/{meeting_id}/evaluate/{username}", response_model=UserMeetingEvaluationResponse, responses={202: {"model": JobResponse}})
 async def evaluate_user_performance(
     meeting_id: int, 
     username: str, 
     db: db_dependency,
-    current_user: current_user_dependency
+    ai_service: ai_service_dependency,
+    current_user: current_user_dependency,
+    request: Request,
+    respond_async: respond_async_query = False
 ):
     """
     Get or generate performance evaluation for a user in a specific meeting.
@@ -457,6 +895,7 @@ async def evaluate_user_performance(
     Total score: 0-100 points
     - On first evaluation: adds score to user's credits and updates rolling average
     - On subsequent calls: returns existing evaluation data
+    Supports the asynchronous 202 mode (?async=true or "Prefer: respond-async").
     Requires X-User-Username header for authentication.
     """
     # Verify the evaluation is for the authenticated user
@@ -465,9 +904,23 @@ async def evaluate_user_performance(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot evaluate another user"
         )
+
+    if _wants_async(request, respond_async):
+        existing_eval = (await db.execute(select(UserMeetingEvaluation.id).where(
+            UserMeetingEvaluation.meeting_id == meeting_id,
+            UserMeetingEvaluation.user_username == username
+        ))).scalar()
+        if not existing_eval:
+            return await _accepted(
+                request,
+                db,
+                meeting_id,
+                "user_evaluation",
+                {"meeting_id": meeting_id, "username": username}
+            )
     
     try:
-        quiz_service = QuizService(db)
+        quiz_service = QuizService(db, ai_service)
         result = await quiz_service.evaluate_user_performance(meeting_id, username)
         
         return UserMeetingEvaluationResponse(
@@ -495,6 +948,8 @@ async def evaluate_user_performance(
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error_msg)
         else:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_msg)
+    except UpstreamUnavailableError as e:
+        raise _upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -502,11 +957,14 @@ async def evaluate_user_performance(
         )
 
 
-@app.get("/meeting/{meeting_id}/evaluate", response_model=TeamMeetingEvaluationResponse)
+@app.get("/meeting/{meeting_id}/evaluate", response_model=TeamMeetingEvaluationResponse, responses={202: {"model": JobResponse}})
 async def evaluate_team_performance(
     meeting_id: int,
     db: db_dependency,
-    current_user: current_user_dependency
+    ai_service: ai_service_dependency,
+    current_user: current_user_dependency,
+    request: Request,
+    respond_async: respond_async_query = False
 ):
     """
     Generate team-level performance evaluation for a meeting.
@@ -519,10 +977,14 @@ async def evaluate_team_performance(
     
     Regenerates on each request to include latest evaluations.
     Requires at least one user to have been evaluated.
+    Supports the asynchronous 202 mode (?async=true or "Prefer: respond-async").
     Requires X-User-Username header for authentication.
     """
+    if _wants_async(request, respond_async):
+        return await _accepted(request, db, meeting_id, "team_evaluation", {"meeting_id": meeting_id})
+
     try:
-        quiz_service = QuizService(db)
+        quiz_service = QuizService(db, ai_service)
         result = await quiz_service.evaluate_team_performance(meeting_id)
         
         return TeamMeetingEvaluationResponse(
@@ -546,6 +1008,8 @@ async def evaluate_team_performance(
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error_msg)
         else:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_msg)
+    except UpstreamUnavailableError as e:
+        raise _upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
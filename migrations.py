@@ -0,0 +1,151 @@
+"""
+Schema migrations for databases created before a change to models.py.
+create_all only adds missing tables, so indexes or columns added to an existing table get a
+numbered migration here. Applied versions are recorded in schema_migrations.
+Runs at API / worker startup; `python -m migrations` applies them on its own.
+"""
+import asyncio
+from typing import Callable, Dict, List, Tuple
+from sqlalchemy import Column, Index, MetaData, Table, delete, func, insert, inspect, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from database import Base, engine
+from models import Transcribe, Quiz, Question, Answer, UserQuizAttempt, SchemaMigration
+
+
+def _index(name: str, table: str, *columns: str, unique: bool = False) -> Index:
+    """
+    Index on a bare copy of the table's columns, so a migration keeps creating exactly what it did
+    when it was written, whatever models.py declares later
+    """
+    snapshot = Table(table, MetaData(), *(Column(column) for column in columns))
+    return Index(name, *(snapshot.c[column] for column in columns), unique=unique)
+
+
+def _create_indexes(*indexes: Index) -> Callable[[Connection], None]:
+    """
+    Migration that creates the indexes, skipping existing ones.
+    Unique indexes get their own migration, which first removes the rows that would violate them.
+    """
+    def migrate(conn: Connection) -> None:
+        for index in indexes:
+            index.create(conn, checkfirst=True)
+    return migrate
+
+
+def _unique_transcripts(conn: Connection) -> None:
+    """Drop repeated (meeting, user, timestamp) transcripts, keeping the first, then enforce the natural key"""
+    transcribes = Transcribe.__table__
+    first_ids = select(func.min(transcribes.c.id)).group_by(
+        transcribes.c.meeting_id, transcribes.c.user_username, transcribes.c.timestamp
+    )
+    removed = conn.execute(delete(transcribes).where(transcribes.c.id.not_in(first_ids))).rowcount
+    if removed:
+        print(f"Removed {removed} duplicate transcripts")
+
+    _index(
+        'uq_transcribes_meeting_user_timestamp', 'transcribes', 'meeting_id', 'user_username', 'timestamp',
+        unique=True
+    ).create(conn, checkfirst=True)
+    # Superseded by the natural key, which starts with the same columns
+    conn.execute(text("DROP INDEX IF EXISTS ix_transcribes_meeting_user"))
+
+
+def _unique_quizzes(conn: Connection) -> None:
+    """
+    Keep the first quiz of each (meeting, type), moving the attempts on its duplicates over to it and
+    deleting their questions and answers, then enforce one quiz per meeting and type.
+    Tables created by create_all already have the constraint.
+    """
+    quizzes, questions, answers = Quiz.__table__, Question.__table__, Answer.__table__
+    attempts = UserQuizAttempt.__table__
+    repeated = select(quizzes.c.meeting_id, quizzes.c.quiz_type).group_by(
+        quizzes.c.meeting_id, quizzes.c.quiz_type
+    ).having(func.count() > 1).subquery()
+    rows = conn.execute(
+        select(quizzes.c.id, quizzes.c.meeting_id, quizzes.c.quiz_type)
+        .join(
+            repeated,
+            (quizzes.c.meeting_id == repeated.c.meeting_id) & (quizzes.c.quiz_type == repeated.c.quiz_type)
+        )
+        .order_by(quizzes.c.id)
+    ).all()
+
+    kept: Dict[Tuple[int, str], int] = {}
+    for quiz_id, meeting_id, quiz_type in rows:
+        first_id = kept.setdefault((meeting_id, quiz_type), quiz_id)
+        if first_id == quiz_id:
+            continue
+        conn.execute(update(attempts).where(attempts.c.quiz_id == quiz_id).values(quiz_id=first_id))
+        question_ids = select(questions.c.id).where(questions.c.quiz_id == quiz_id)
+        conn.execute(delete(answers).where(answers.c.question_id.in_(question_ids)))
+        conn.execute(delete(questions).where(questions.c.quiz_id == quiz_id))
+        conn.execute(delete(quizzes).where(quizzes.c.id == quiz_id))
+    if len(rows) > len(kept):
+        print(f"Removed {len(rows) - len(kept)} duplicate quizzes")
+
+    inspector = inspect(conn)
+    columns = ['meeting_id', 'quiz_type']
+    if any(constraint['column_names'] == columns for constraint in inspector.get_unique_constraints('quizzes')):
+        return
+    _index('_meeting_quiz_type_uc', 'quizzes', *columns, unique=True).create(conn, checkfirst=True)
+
+
+# (version, description, migration); append only, never renumber or edit an applied entry
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (
+        1,
+        "Indexes for transcript, quiz question/answer, quiz attempt and evaluation lookups",
+        _create_indexes(
+            _index('ix_transcribes_meeting_timestamp', 'transcribes', 'meeting_id', 'timestamp'),
+            _index('ix_transcribes_meeting_user', 'transcribes', 'meeting_id', 'user_username'),
+            _index('ix_questions_quiz_id', 'questions', 'quiz_id'),
+            _index('ix_answers_question_id', 'answers', 'question_id'),
+            _index('ix_user_quiz_attempts_user_quiz', 'user_quiz_attempts', 'user_username', 'quiz_id'),
+            _index('ix_user_meeting_evaluations_meeting', 'user_meeting_evaluations', 'meeting_id')
+        )
+    ),
+    (2, "Unique (meeting, user, timestamp) transcripts", _unique_transcripts),
+    (3, "Unique (meeting, quiz type) quizzes", _unique_quizzes),
+]
+
+
+def _apply_pending(conn: Connection) -> List[int]:
+    applied = set(conn.execute(select(SchemaMigration.version)).scalars())
+    newly_applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        migrate(conn)
+        conn.execute(insert(SchemaMigration).values(version=version, description=description))
+        newly_applied.append(version)
+    return newly_applied
+
+
+async def run_migrations() -> List[int]:
+    """Create missing tables, then apply pending migrations in one transaction; returns the versions applied"""
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, checkfirst=True)
+            applied = await conn.run_sync(_apply_pending)
+    except IntegrityError:
+        # Another worker starting at the same time recorded them first
+        print("Schema migrations were applied concurrently by another process")
+        return []
+
+    for version in applied:
+        print(f"Applied schema migration {version}")
+    return applied
+
+
+async def main() -> None:
+    try:
+        applied = await run_migrations()
+        if not applied:
+            print("Schema is up to date")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
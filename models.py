@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Text, UniqueConstraint, Interval, \
-    Boolean
+    Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -24,6 +24,12 @@ class User(Base):
 
 class Transcribe(Base):
     __tablename__ = 'transcribes'
+    __table_args__ = (
+        # A meeting's transcripts in order
+        Index('ix_transcribes_meeting_timestamp', 'meeting_id', 'timestamp'),
+        # Natural key: a re-sent utterance is ignored on insert; also serves one user's lines in a meeting
+        Index('uq_transcribes_meeting_user_timestamp', 'meeting_id', 'user_username', 'timestamp', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)  # Added auto-increment ID
     user_username = Column(String, ForeignKey('users.username'), nullable=False)
@@ -74,6 +80,7 @@ class QuizType(enum.Enum):
 
 class Quiz(Base):
     __tablename__ = 'quizzes'
+    __table_args__ = (UniqueConstraint('meeting_id', 'quiz_type', name='_meeting_quiz_type_uc'),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     meeting_id = Column(Integer, ForeignKey('meetings.id'), nullable=False)
@@ -82,32 +89,33 @@ class Quiz(Base):
     generated_at = Column(DateTime(timezone=True), server_default=func.now())
 
     meeting = relationship("Meeting", backref="quizzes")
-    questions = relationship("Question", backref="quiz", cascade="all, delete-orphan")
+    questions = relationship("Question", backref="quiz", cascade="all, delete-orphan", order_by="Question.order")
 
 
 class Question(Base):
     __tablename__ = 'questions'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    quiz_id = Column(Integer, ForeignKey('quizzes.id'), nullable=False)
+    quiz_id = Column(Integer, ForeignKey('quizzes.id'), nullable=False, index=True)
     question_text = Column(Text, nullable=False)
     correct_answer_index = Column(Integer, nullable=False)
     order = Column(Integer, nullable=False)
 
-    answers = relationship("Answer", backref="question", cascade="all, delete-orphan")
+    answers = relationship("Answer", backref="question", cascade="all, delete-orphan", order_by="Answer.order")
 
 
 class Answer(Base):
     __tablename__ = 'answers'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    question_id = Column(Integer, ForeignKey('questions.id'), nullable=False)
+    question_id = Column(Integer, ForeignKey('questions.id'), nullable=False, index=True)
     answer_text = Column(Text, nullable=False)
     order = Column(Integer, nullable=False)
 
 
 class UserQuizAttempt(Base):
     __tablename__ = 'user_quiz_attempts'
+    __table_args__ = (Index('ix_user_quiz_attempts_user_quiz', 'user_username', 'quiz_id'),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_username = Column(String, ForeignKey('users.username'), nullable=False)
@@ -122,7 +130,11 @@ class UserQuizAttempt(Base):
 
 class UserMeetingEvaluation(Base):
     __tablename__ = 'user_meeting_evaluations'
-    __table_args__ = (UniqueConstraint('user_username', 'meeting_id', name='_user_meeting_eval_uc'),)
+    __table_args__ = (
+        UniqueConstraint('user_username', 'meeting_id', name='_user_meeting_eval_uc'),
+        # The unique constraint leads with user_username, so per-meeting lookups need their own index
+        Index('ix_user_meeting_evaluations_meeting', 'meeting_id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_username = Column(String, ForeignKey('users.username'), nullable=False)
@@ -138,3 +150,71 @@ class UserMeetingEvaluation(Base):
 
     user = relationship("User", backref="meeting_evaluations")
     meeting = relationship("Meeting", backref="evaluations")
+
+
+class GenerationLease(Base):
+    __tablename__ = 'generation_leases'
+
+    key = Column(String, primary_key=True)  # e.g. "quiz:12:outro", "summary:12"
+    owner = Column(String, nullable=False)  # host:pid:token of the worker holding the lease
+    expires_at = Column(DateTime, nullable=False)  # naive UTC, lease can be taken over after this
+
+
+class JobStatus(enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    dead = "dead"  # failed permanently or ran out of attempts
+
+
+class Job(Base):
+    __tablename__ = 'jobs'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)  # e.g. "intro_quiz", "summary", "user_evaluation"
+    payload = Column(Text, nullable=False)  # JSON arguments for the handler
+    dedupe_key = Column(String, nullable=False)  # kind + payload, to avoid queueing the same work twice
+    status = Column(SQLEnum(JobStatus), nullable=False, default=JobStatus.queued)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime, nullable=False)  # naive UTC, not claimed before this (retry backoff)
+    locked_by = Column(String, nullable=True)  # host:pid:worker of the worker running it
+    locked_until = Column(DateTime, nullable=True)  # naive UTC, another worker may reclaim it after this
+    last_error = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)  # JSON handler result
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime, nullable=True)  # naive UTC
+    finished_at = Column(DateTime, nullable=True)  # naive UTC
+
+
+class TranscriptBatch(Base):
+    __tablename__ = 'transcript_batches'
+    __table_args__ = (
+        UniqueConstraint('meeting_id', 'idempotency_key', name='uq_transcript_batches_meeting_key'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    meeting_id = Column(Integer, ForeignKey('meetings.id'), nullable=False)
+    idempotency_key = Column(String, nullable=False)  # Idempotency-Key header of the upload
+    transcript_count = Column(Integer, nullable=False)  # rows the original upload stored
+    duplicate_count = Column(Integer, nullable=False)  # rows it skipped as already stored
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MeetingEvent(Base):
+    __tablename__ = 'meeting_events'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    meeting_id = Column(Integer, nullable=False, index=True)
+    event = Column(String, nullable=False)  # e.g. "summary_ready", "outro_quiz_ready"
+    data = Column(Text, nullable=False)  # JSON payload
+    origin = Column(String, nullable=False)  # broker that published it, which already delivered it locally
+    created_at = Column(DateTime, nullable=False)  # naive UTC, old events are pruned
+
+
+class SchemaMigration(Base):
+    __tablename__ = 'schema_migrations'
+
+    version = Column(Integer, primary_key=True)  # see migrations.MIGRATIONS
+    description = Column(String, nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,36 +1,256 @@
+import asyncio
 import httpx
-import json
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional, AsyncIterator, Tuple
+from llm_cache import LLMCache, cache_key
+from llm_resilience import UpstreamGuard, RetryableUpstreamError, UpstreamUnavailableError
+from llm_backends import LLMBackend, create_backend
+from llm_parsing import ParseStats, extract_json_object, require_fields, coerce_to_strings
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token), good enough for budgeting prompts"""
+    return len(text) // 4 + 1
+
+
+def _split_into_windows(lines: List[str], token_budget: int) -> List[List[str]]:
+    """Greedily group consecutive lines into windows of at most token_budget tokens"""
+    windows = []
+    current = []
+    current_tokens = 0
+
+    for line in lines:
+        line_tokens = estimate_tokens(line)
+        if current and current_tokens + line_tokens > token_budget:
+            windows.append(current)
+            current = []
+            current_tokens = 0
+        current.append(line)
+        current_tokens += line_tokens
+
+    if current:
+        windows.append(current)
+    return windows
+
+
+def _json_schema(name: str, properties: Dict) -> Dict:
+    """OpenAI-style response_format asking for a strict JSON object"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": properties,
+                "required": list(properties),
+                "additionalProperties": False
+            }
+        }
+    }
+
+
+QUIZ_SCHEMA = _json_schema("quiz", {
+    "questions": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "question_text": {"type": "string"},
+                "correct_answer_index": {"type": "integer"},
+                "answers": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["question_text", "correct_answer_index", "answers"],
+            "additionalProperties": False
+        }
+    }
+})
+
+SUMMARY_AND_QUIZ_SCHEMA = _json_schema("summary_and_quiz", {
+    "summary_points": {"type": "array", "items": {"type": "string"}},
+    "questions": QUIZ_SCHEMA["json_schema"]["schema"]["properties"]["questions"]
+})
+
+USER_EVALUATION_SCHEMA = _json_schema("user_evaluation", {
+    "strengths": {"type": "string"},
+    "weaknesses": {"type": "string"},
+    "tips": {"type": "string"},
+    "participation_score": {"type": "integer"},
+    "quality_score": {"type": "integer"}
+})
+
+TEAM_EVALUATION_SCHEMA = _json_schema("team_evaluation", {
+    "team_strengths": {"type": "string"},
+    "team_weaknesses": {"type": "string"},
+    "team_tips": {"type": "string"}
+})
+
+RELEVANCY_SCHEMA = _json_schema("relevancy", {
+    "verdicts": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "index": {"type": "integer"},
+                "relevant": {"type": "boolean"},
+                "chatWarning": {"type": "string"},
+                "warning": {"type": "string"}
+            },
+            "required": ["index", "relevant", "chatWarning", "warning"],
+            "additionalProperties": False
+        }
+    }
+})
+
+
+def _validate_quiz(result: Dict) -> Dict:
+    require_fields(result, ["questions"])
+    if not isinstance(result["questions"], list) or not result["questions"]:
+        raise ValueError("AI response has no questions")
+    for question in result["questions"]:
+        require_fields(question, ["question_text", "correct_answer_index", "answers"])
+        if not 0 <= int(question["correct_answer_index"]) < len(question["answers"]):
+            raise ValueError(f"correct_answer_index out of range in question: {question['question_text']}")
+    return result
+
+
+def _validate_summary_and_quiz(result: Dict) -> Dict:
+    require_fields(result, ["summary_points"])
+    points = result["summary_points"]
+    if isinstance(points, str):
+        points = points.splitlines()
+    # Store the bullets in the same plain-text format the summary-only prompt produces
+    points = [str(point).strip().lstrip("•-* ").strip() for point in points]
+    points = [point for point in points if point]
+    if not points:
+        raise ValueError("AI response has no summary points")
+    result["summary_points"] = "\n".join(f"• {point}" for point in points)
+    return _validate_quiz(result)
+
+
+def _validate_user_evaluation(result: Dict) -> Dict:
+    require_fields(result, ["strengths", "weaknesses", "tips", "participation_score", "quality_score"])
+    result["participation_score"] = int(result["participation_score"])
+    result["quality_score"] = int(result["quality_score"])
+    return coerce_to_strings(result, ["strengths", "weaknesses", "tips"])
+
+
+def _validate_relevancy(result: Dict) -> Dict:
+    require_fields(result, ["verdicts"])
+    if not isinstance(result["verdicts"], list):
+        raise ValueError("AI response verdicts is not a list")
+    for verdict in result["verdicts"]:
+        require_fields(verdict, ["index", "relevant"])
+    return result
+
+
+def _validate_team_evaluation(result: Dict) -> Dict:
+    require_fields(result, ["team_strengths", "team_weaknesses", "team_tips"])
+    # Ensure all fields are strings (AI sometimes returns arrays)
+    return coerce_to_strings(result, ["team_strengths", "team_weaknesses", "team_tips"])
 
 
 class OpenRouterService:
-    def __init__(self):
-        self.api_key = os.getenv("OPENROUTER_API_KEY")
-        if not self.api_key:
-            raise ValueError("OPENROUTER_API_KEY environment variable not set")
-
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.model = "openai/gpt-oss-20b:free"
-        self.timeout = 60.0
-
-    async def _call_api(self, messages: List[Dict]) -> str:
-        """Make API call to OpenRouter"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model,
-                    "messages": messages
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+    def __init__(
+            self,
+            client: Optional[httpx.AsyncClient] = None,
+            cache: Optional[LLMCache] = None,
+            guard: Optional[UpstreamGuard] = None,
+            backend: Optional[LLMBackend] = None
+    ):
+        self.model = os.getenv("OPENROUTER_MODEL", "openai/gpt-oss-20b:free")
+        # Where completions come from (OpenRouter, offline fake or record/replay), see LLM_BACKEND
+        self.backend = backend if backend is not None else create_backend(client)
+        # Responses are cached by content address, so byte-identical prompts are answered once
+        self.cache = cache
+        # Rate limiting, retries and circuit breaking; share one guard per process so limits are global
+        self.guard = guard if guard is not None else UpstreamGuard.from_env()
+        # Long meetings are summarized in windows of this many transcript tokens (map-reduce)
+        self.summary_chunk_tokens = int(os.getenv("SUMMARY_CHUNK_TOKENS", "6000"))
+        self.summary_max_concurrency = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+        self.parse_stats = ParseStats()
+
+    async def _call_api(self, messages: List[Dict], response_format: Optional[Dict] = None) -> str:
+        """Make API call through the LLM backend (served from the response cache when possible)"""
+        key = cache_key(self.model, messages)
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        content = await self.guard.call(lambda: self.backend.complete(self.model, messages, response_format))
+
+        if self.cache is not None:
+            await self.cache.set(key, content)
+        return content
+
+    async def _stream_api(self, messages: List[Dict]) -> AsyncIterator[str]:
+        """Stream a completion from the LLM backend, yielding content deltas as they arrive"""
+        key = cache_key(self.model, messages)
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        # Streams get a single guarded attempt: once bytes reach the client they cannot be retried
+        chunks = []
+        try:
+            async with self.guard.attempt():
+                async for delta in self.backend.stream(self.model, messages):
+                    chunks.append(delta)
+                    yield delta
+        except RetryableUpstreamError as e:
+            self.guard.record_failure(e)
+            raise UpstreamUnavailableError(f"OpenRouter stream failed: {e}", retry_after=e.retry_after)
+
+        self.guard.record_success()
+        if self.cache is not None:
+            await self.cache.set(key, "".join(chunks))
+
+    async def _call_json(self, messages: List[Dict], response_format: Dict, validate) -> Dict:
+        """
+        Request JSON output and parse it tolerantly.
+        If the reply still can't be parsed or validated, ask for a correction once (cheaper than
+        regenerating from scratch) before giving up with ValueError.
+        """
+        response = await self._call_api(messages, response_format)
+        self.parse_stats.responses += 1
+        try:
+            return validate(extract_json_object(response))
+        except (ValueError, KeyError, TypeError) as e:
+            first_error = e
+
+        self.parse_stats.first_try_failures += 1
+        await self._discard_cached(messages)
+
+        repair_messages = messages + [
+            {"role": "assistant", "content": response},
+            {
+                "role": "user",
+                "content": f"Your previous reply could not be used: {first_error}. "
+                           "Reply with ONLY the corrected JSON object in the requested structure, "
+                           "no markdown and no explanation."
+            }
+        ]
+        repaired = await self._call_api(repair_messages, response_format)
+        try:
+            result = validate(extract_json_object(repaired))
+        except (ValueError, KeyError, TypeError) as e:
+            self.parse_stats.failed += 1
+            await self._discard_cached(repair_messages)
+            raise ValueError(f"Failed to parse AI response: {e}\nResponse: {repaired}")
+
+        self.parse_stats.repaired += 1
+        # Remember the usable answer under the original prompt so a repeat call is a cache hit
+        if self.cache is not None:
+            await self.cache.set(cache_key(self.model, messages), repaired)
+        return result
+
+    async def _discard_cached(self, messages: List[Dict]) -> None:
+        """Drop a cached response that turned out to be unusable, so the next call asks again"""
+        if self.cache is not None:
+            await self.cache.delete(cache_key(self.model, messages))
 
     async def generate_intro_quiz(self, meeting_name: str, meeting_description: str) -> Dict:
         """Generate intro quiz based on meeting name and description"""
@@ -56,23 +276,7 @@ Return ONLY a JSON object with this exact structure (no markdown, no explanation
 Make questions relevant, educational, and varied in difficulty."""
 
         messages = [{"role": "user", "content": prompt}]
-        response = await self._call_api(messages)
-
-        # Parse JSON response
-        try:
-            # Remove markdown code blocks if present
-            cleaned = response.strip()
-            if cleaned.startswith("```json"):
-                cleaned = cleaned[7:]
-            if cleaned.startswith("```"):
-                cleaned = cleaned[3:]
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3]
-            cleaned = cleaned.strip()
-
-            return json.loads(cleaned)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse AI response: {e}\nResponse: {response}")
+        return await self._call_json(messages, QUIZ_SCHEMA, _validate_quiz)
 
     async def generate_summary_from_transcripts(
             self,
@@ -81,21 +285,127 @@ Make questions relevant, educational, and varied in difficulty."""
             transcripts: List[Dict]
     ) -> str:
         """Generate meeting summary from transcripts"""
-        # Format transcripts for the prompt
-        transcript_text = "\n".join([
+        messages = await self._prepare_summary_messages(meeting_name, meeting_description, transcripts)
+        response = await self._call_api(messages)
+
+        return response.strip()
+
+    async def stream_summary_from_transcripts(
+            self,
+            meeting_name: str,
+            meeting_description: str,
+            transcripts: List[Dict]
+    ) -> AsyncIterator[str]:
+        """Stream meeting summary text from transcripts as it is generated"""
+        messages = await self._prepare_summary_messages(meeting_name, meeting_description, transcripts)
+        async for delta in self._stream_api(messages):
+            yield delta
+
+    async def _prepare_summary_messages(
+            self,
+            meeting_name: str,
+            meeting_description: str,
+            transcripts: List[Dict]
+    ) -> List[Dict]:
+        """Build the final summary prompt"""
+        heading, content, source = await self._prepare_summary_content(
+            meeting_name,
+            meeting_description,
+            transcripts
+        )
+        return self._summary_messages(meeting_name, meeting_description, heading, content, source)
+
+    async def _prepare_summary_content(
+            self,
+            meeting_name: str,
+            meeting_description: str,
+            transcripts: List[Dict]
+    ) -> Tuple[str, str, str]:
+        """
+        Return the (heading, content, source) the final summary prompt is built from.
+        Transcripts that fit in one window are summarized directly. Longer meetings are split into
+        token-budgeted windows that are summarized concurrently (map), and the final prompt
+        combines those partial summaries (reduce).
+        """
+        lines = [
             f"[{t['timestamp']}] {t['user_username']}: {t['transcription_text']}"
             for t in transcripts
+        ]
+        windows = _split_into_windows(lines, self.summary_chunk_tokens)
+
+        if len(windows) <= 1:
+            return "Meeting Transcripts", "\n".join(lines), "the transcripts above"
+
+        semaphore = asyncio.Semaphore(self.summary_max_concurrency)
+
+        async def summarize_window(index: int, window: List[str]) -> str:
+            async with semaphore:
+                return await self._summarize_window(
+                    meeting_name,
+                    meeting_description,
+                    index,
+                    len(windows),
+                    "\n".join(window)
+                )
+
+        partials = await asyncio.gather(*[
+            summarize_window(index, window) for index, window in enumerate(windows, 1)
         ])
 
-        prompt = f"""You are creating a comprehensive summary of a meeting.
+        partial_text = "\n\n".join(
+            f"Part {index}:\n{partial}" for index, partial in enumerate(partials, 1)
+        )
+        return (
+            "Partial Summaries (consecutive parts of the meeting, in order)",
+            partial_text,
+            "the partial summaries above"
+        )
+
+    async def _summarize_window(
+            self,
+            meeting_name: str,
+            meeting_description: str,
+            index: int,
+            total: int,
+            transcript_text: str
+    ) -> str:
+        """Map step: summarize one window of a long meeting"""
+        prompt = f"""You are summarizing part {index} of {total} of a long meeting transcript.
 
 Meeting Name: {meeting_name}
 Meeting Description: {meeting_description}
 
-Meeting Transcripts:
+Transcript (part {index} of {total}):
 {transcript_text}
 
-Based on the transcripts above, create a concise summary with 5-7 bullet points covering the main topics discussed, key decisions made, and important takeaways.
+Write concise bullet notes covering the topics discussed, decisions made, open questions and action items in this part only.
+Keep names of the people responsible for decisions or action items.
+
+Return ONLY the bullet points as plain text, one per line, each starting with "• "."""
+
+        messages = [{"role": "user", "content": prompt}]
+        response = await self._call_api(messages)
+
+        return response.strip()
+
+    def _summary_messages(
+            self,
+            meeting_name: str,
+            meeting_description: str,
+            heading: str,
+            content: str,
+            source: str
+    ) -> List[Dict]:
+        """Build the prompt that produces the final 5-7 summary bullets"""
+        prompt = f"""You are creating a comprehensive summary of a meeting.
+
+Meeting Name: {meeting_name}
+Meeting Description: {meeting_description}
+
+{heading}:
+{content}
+
+Based on {source}, create a concise summary with 5-7 bullet points covering the main topics discussed, key decisions made, and important takeaways.
 
 Return ONLY the bullet points in this format (no JSON, just plain text):
 • First main point
@@ -108,10 +418,7 @@ Return ONLY the bullet points in this format (no JSON, just plain text):
 
 Focus on the most important information from the actual discussion."""
 
-        messages = [{"role": "user", "content": prompt}]
-        response = await self._call_api(messages)
-
-        return response.strip()
+        return [{"role": "user", "content": prompt}]
 
     async def generate_outro_quiz_from_summary(
             self,
@@ -145,23 +452,53 @@ Return ONLY a JSON object with this exact structure (no markdown, no explanation
 Make questions specific to the actual content discussed in the meeting."""
 
         messages = [{"role": "user", "content": prompt}]
-        response = await self._call_api(messages)
+        return await self._call_json(messages, QUIZ_SCHEMA, _validate_quiz)
 
-        # Parse JSON response
-        try:
-            # Remove markdown code blocks if present
-            cleaned = response.strip()
-            if cleaned.startswith("```json"):
-                cleaned = cleaned[7:]
-            if cleaned.startswith("```"):
-                cleaned = cleaned[3:]
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3]
-            cleaned = cleaned.strip()
-
-            return json.loads(cleaned)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse AI response: {e}\nResponse: {response}")
+    async def generate_summary_and_outro_quiz(
+            self,
+            meeting_name: str,
+            meeting_description: str,
+            transcripts: List[Dict]
+    ) -> Dict:
+        """
+        Generate the meeting summary and the outro quiz in a single call.
+        Returns {"summary_points": "• ...", "questions": [...]}; raises ValueError if the reply is unusable.
+        """
+        heading, content, source = await self._prepare_summary_content(
+            meeting_name,
+            meeting_description,
+            transcripts
+        )
+
+        prompt = f"""You are summarizing a meeting and creating a post-meeting quiz to test participant understanding.
+
+Meeting Name: {meeting_name}
+Meeting Description: {meeting_description}
+
+{heading}:
+{content}
+
+Based on {source}:
+1. Create a concise summary with 5-7 bullet points covering the main topics discussed, key decisions made, and important takeaways.
+2. Based on that summary, create exactly 5 multiple-choice questions that test understanding of what was discussed in the meeting.
+   Each question should have exactly 4 answer options.
+
+Return ONLY a JSON object with this exact structure (no markdown, no explanation):
+{{
+  "summary_points": ["First main point", "Second main point", "Third main point"],
+  "questions": [
+    {{
+      "question_text": "What was discussed about...",
+      "correct_answer_index": 0,
+      "answers": ["Answer 1", "Answer 2", "Answer 3", "Answer 4"]
+    }}
+  ]
+}}
+
+Focus on the most important information from the actual discussion and make questions specific to it."""
+
+        messages = [{"role": "user", "content": prompt}]
+        return await self._call_json(messages, SUMMARY_AND_QUIZ_SCHEMA, _validate_summary_and_quiz)
 
     async def generate_user_performance_evaluation(
             self,
@@ -225,33 +562,15 @@ Scoring guidelines:
 Penalize fouls heavily in quality_score. Each foul should reduce quality significantly."""
 
         messages = [{"role": "user", "content": prompt}]
-        response = await self._call_api(messages)
+        result = await self._call_json(messages, USER_EVALUATION_SCHEMA, _validate_user_evaluation)
 
-        # Parse JSON response
-        try:
-            # Remove markdown code blocks if present
-            cleaned = response.strip()
-            if cleaned.startswith("```json"):
-                cleaned = cleaned[7:]
-            if cleaned.startswith("```"):
-                cleaned = cleaned[3:]
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3]
-            cleaned = cleaned.strip()
-
-            result = json.loads(cleaned)
-            
-            # Validate scores are within range
-            if not (0 <= result["participation_score"] <= 20):
-                result["participation_score"] = max(0, min(20, result["participation_score"]))
-            if not (0 <= result["quality_score"] <= 50):
-                result["quality_score"] = max(0, min(50, result["quality_score"]))
-            
-            return result
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse AI response: {e}\nResponse: {response}")
-        except KeyError as e:
-            raise ValueError(f"Missing required field in AI response: {e}\nResponse: {response}")
+        # Validate scores are within range
+        if not (0 <= result["participation_score"] <= 20):
+            result["participation_score"] = max(0, min(20, result["participation_score"]))
+        if not (0 <= result["quality_score"] <= 50):
+            result["quality_score"] = max(0, min(50, result["quality_score"]))
+
+        return result
 
     async def generate_team_evaluation(
             self,
@@ -305,32 +624,71 @@ Return ONLY a JSON object with this exact structure (no markdown, no explanation
 Focus on patterns, trends, and collective team dynamics rather than individual performance."""
 
         messages = [{"role": "user", "content": prompt}]
-        response = await self._call_api(messages)
+        return await self._call_json(messages, TEAM_EVALUATION_SCHEMA, _validate_team_evaluation)
 
-        # Parse JSON response
-        try:
-            # Remove markdown code blocks if present
-            cleaned = response.strip()
-            if cleaned.startswith("```json"):
-                cleaned = cleaned[7:]
-            if cleaned.startswith("```"):
-                cleaned = cleaned[3:]
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3]
-            cleaned = cleaned.strip()
-
-            result = json.loads(cleaned)
-            
-            # Ensure all fields are strings (AI sometimes returns arrays)
-            if isinstance(result.get("team_strengths"), list):
-                result["team_strengths"] = " ".join(result["team_strengths"])
-            if isinstance(result.get("team_weaknesses"), list):
-                result["team_weaknesses"] = " ".join(result["team_weaknesses"])
-            if isinstance(result.get("team_tips"), list):
-                result["team_tips"] = " ".join(result["team_tips"])
-            
-            return result
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse AI response: {e}\nResponse: {response}")
-        except KeyError as e:
-            raise ValueError(f"Missing required field in AI response: {e}\nResponse: {response}")
\ No newline at end of file
+    async def check_relevancy(
+            self,
+            meeting_name: str,
+            meeting_description: str,
+            context: List[Dict],
+            utterances: List[Dict]
+    ) -> List[Dict]:
+        """
+        Judge a window of utterances (possibly from several speakers) in one call.
+        context and utterances are {"username", "transcription"} dicts, oldest first.
+        Returns one {"relevant", "chatWarning", "warning"} per utterance, in order; an utterance
+        the model skipped counts as relevant.
+        """
+        context_text = "\n".join(f"{u['username']}: {u['transcription']}" for u in context) or "(none)"
+        utterance_text = "\n".join(
+            f"[{index}] {u['username']}: {u['transcription']}" for index, u in enumerate(utterances)
+        )
+
+        prompt = f"""You are a meeting assistant.
+Meeting Name: {meeting_name}
+Meeting Description: {meeting_description}
+
+Past Context:
+{context_text}
+
+Current Speech ({len(utterances)} utterances, in order):
+{utterance_text}
+
+For each numbered utterance, decide whether it is relevant to the meeting topic and context.
+If it is NOT relevant, provide a short warning message to be spoken to its speaker.
+IMPORTANT: The warning messages MUST be in the same language as the Meeting Description.
+IMPORTANT: Each warning message MUST address the speaker by name.
+IMPORTANT: The chat warnings MUST be in the same language as the Meeting Description.
+
+Return ONLY a JSON object with this exact structure (no markdown, no explanation), one verdict per utterance:
+{{
+  "verdicts": [
+    {{
+      "index": 0,
+      "relevant": true,
+      "chatWarning": "short warning text for chat, empty if relevant (e.g. '⚠️ Irrelevant: reason')",
+      "warning": "warning message addressing the speaker for TTS, empty if relevant"
+    }}
+  ]
+}}"""
+
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that checks if speech is relevant to a meeting. "
+                           "You must respond with valid JSON."
+            },
+            {"role": "user", "content": prompt}
+        ]
+        result = await self._call_json(messages, RELEVANCY_SCHEMA, _validate_relevancy)
+
+        verdicts = [{"relevant": True, "chatWarning": None, "warning": None} for _ in utterances]
+        for verdict in result["verdicts"]:
+            index = int(verdict["index"])
+            if 0 <= index < len(utterances):
+                verdicts[index] = {
+                    "relevant": bool(verdict["relevant"]),
+                    "chatWarning": verdict.get("chatWarning") or None,
+                    "warning": verdict.get("warning") or None
+                }
+        return verdicts
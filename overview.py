@@ -0,0 +1,108 @@
+"""
+Dashboard overview of every meeting for one user, read with a fixed number of aggregate queries.
+Read-only: nothing here generates quizzes or summaries, it only reports what exists or is queued.
+"""
+import json
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Meeting, Quiz, QuizType, UserQuizAttempt, Job, JobStatus
+
+
+def _quiz_overview(quiz: Optional[Dict], generating: bool) -> Dict:
+    if quiz is None:
+        return {"id": None, "status": "generating" if generating else "missing", "attempts": 0}
+    return {
+        **quiz,
+        "status": "completed" if quiz["attempts"] else "available"
+    }
+
+
+def _next_step(intro_quiz: Dict, outro_quiz: Dict, has_summary: bool) -> str:
+    """What the meetings page offers next: "intro", "outro", "sum" (summary) or "waiting" """
+    if intro_quiz["status"] == "available":
+        return "intro"
+    if outro_quiz["status"] == "available":
+        return "outro"
+    if has_summary:
+        return "sum"
+    return "waiting"
+
+
+async def _generating(db: AsyncSession) -> Set[Tuple[int, str]]:
+    """(meeting_id, job kind) of queued or running quiz / summary generation jobs"""
+    rows = await db.execute(
+        select(Job.kind, Job.payload).where(
+            Job.status.in_([JobStatus.queued, JobStatus.running]),
+            Job.kind.in_(["intro_quiz", "outro_quiz", "summary"])
+        )
+    )
+    return {(json.loads(payload).get("meeting_id"), kind) for kind, payload in rows}
+
+
+async def get_meetings_overview(db: AsyncSession, username: str) -> List[Dict]:
+    """
+    Every meeting with its intro / outro quiz (id, status, the user's attempts and best score),
+    whether a summary exists and the next step for the user.
+    Three queries whatever the number of meetings: meetings, quizzes joined with the user's
+    attempts, and pending generation jobs.
+    """
+    meetings = (await db.execute(
+        select(
+            Meeting.id,
+            Meeting.name,
+            Meeting.description,
+            Meeting.begins_at,
+            Meeting.duration,
+            Meeting.created_at,
+            Meeting.owner_username,
+            Meeting.summary.is_not(None).label("has_summary")
+        ).order_by(Meeting.id)
+    )).mappings().all()
+
+    quizzes: Dict[Tuple[int, QuizType], Dict] = {}
+    rows = await db.execute(
+        select(
+            Quiz.id,
+            Quiz.meeting_id,
+            Quiz.quiz_type,
+            func.count(UserQuizAttempt.id),
+            func.max(UserQuizAttempt.score),
+            func.max(UserQuizAttempt.total_questions),
+            func.max(UserQuizAttempt.completed_at)
+        )
+        .outerjoin(
+            UserQuizAttempt,
+            (UserQuizAttempt.quiz_id == Quiz.id) & (UserQuizAttempt.user_username == username)
+        )
+        .group_by(Quiz.id, Quiz.meeting_id, Quiz.quiz_type)
+    )
+    for quiz_id, meeting_id, quiz_type, attempts, best_score, total_questions, last_attempt_at in rows:
+        quizzes[(meeting_id, quiz_type)] = {
+            "id": quiz_id,
+            "attempts": attempts,
+            "best_score": best_score,
+            "total_questions": total_questions,
+            "last_attempt_at": last_attempt_at
+        }
+
+    generating = await _generating(db)
+
+    overview = []
+    for meeting in meetings:
+        intro_quiz = _quiz_overview(
+            quizzes.get((meeting["id"], QuizType.intro)), (meeting["id"], "intro_quiz") in generating
+        )
+        outro_quiz = _quiz_overview(
+            quizzes.get((meeting["id"], QuizType.outro)), (meeting["id"], "outro_quiz") in generating
+        )
+        has_summary = bool(meeting["has_summary"])
+        overview.append({
+            **meeting,
+            "has_summary": has_summary,
+            "summary_generating": not has_summary and (meeting["id"], "summary") in generating,
+            "intro_quiz": intro_quiz,
+            "outro_quiz": outro_quiz,
+            "next_step": _next_step(intro_quiz, outro_quiz, has_summary)
+        })
+    return overview
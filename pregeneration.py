@@ -0,0 +1,185 @@
+import asyncio
+import os
+from typing import Dict, Optional, Set, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from database import SessionLocal
+from models import Meeting, Quiz, QuizType, Transcribe
+from openrouter_service import OpenRouterService
+from quiz_service import QuizService, outro_generation_in_flight, wait_for_outro_generation
+
+
+async def _transcript_fingerprint(db: AsyncSession, meeting_id: int) -> Tuple[int, Optional[int]]:
+    """(count, highest id) of a meeting's transcripts; changes whenever transcripts are added or removed"""
+    fingerprint = (await db.execute(
+        select(func.count(Transcribe.id), func.max(Transcribe.id)).where(Transcribe.meeting_id == meeting_id)
+    )).one()
+    await db.commit()
+    return tuple(fingerprint)
+
+
+async def _find_outro_quiz(db: AsyncSession, meeting_id: int) -> Optional[Quiz]:
+    # Everything a delete cascades to (or nulls out) is loaded up front: async sessions can't lazy-load
+    return (await db.execute(
+        QuizService._quiz_query().options(selectinload(Quiz.attempts)).where(
+            Quiz.meeting_id == meeting_id,
+            Quiz.quiz_type == QuizType.outro
+        )
+    )).unique().scalars().first()
+
+
+async def _get_meeting(db: AsyncSession, meeting_id: int) -> Optional[Meeting]:
+    return (await db.execute(
+        select(Meeting).where(Meeting.id == meeting_id).execution_options(populate_existing=True)
+    )).scalars().first()
+
+
+async def _existing_artifacts(db: AsyncSession, meeting_id: int) -> Tuple[bool, bool]:
+    """(has summary, has outro quiz) for a meeting"""
+    meeting = await _get_meeting(db, meeting_id)
+    has_summary = bool(meeting and meeting.summary)
+    has_outro_quiz = await _find_outro_quiz(db, meeting_id) is not None
+    await db.commit()
+    return has_summary, has_outro_quiz
+
+
+class Pregenerator:
+    """
+    Speculatively generates a meeting's summary and outro quiz as soon as its transcripts land,
+    so the first user to open them is served a precomputed result instead of waiting for the LLM.
+
+    Each transcript batch restarts a short countdown, so a burst of batches triggers one generation.
+    A batch that arrives while generation is running cancels it and starts over. Whatever
+    speculation produced, or a generation that was still running when the batch landed, was built
+    from an incomplete transcript set and is discarded before generating again (unless someone has
+    already taken the quiz). Artifacts that existed before speculation asked for them are kept.
+    """
+
+    def __init__(self, delay: float, enabled: bool = True):
+        self.delay = delay
+        self.enabled = enabled
+        self._tasks: Dict[int, asyncio.Task] = {}
+        # Artifacts ("summary", "outro_quiz") a meeting lacked when speculation asked for them;
+        # whatever fills them in is stale once the next batch lands. Kept after a run completes.
+        self._speculative: Dict[int, Set[str]] = {}
+
+        self.scheduled = 0
+        self.rescheduled = 0
+        self.completed = 0
+        self.discarded = 0
+        self.failed = 0
+
+    @classmethod
+    def from_env(cls) -> "Pregenerator":
+        return cls(
+            delay=float(os.getenv("PREGENERATION_DELAY", "2")),
+            enabled=os.getenv("PREGENERATION_ENABLED", "true").lower() in ("1", "true", "yes")
+        )
+
+    def schedule(self, meeting_id: int, ai_service: OpenRouterService) -> None:
+        """(Re)start speculative generation for a meeting whose transcripts just changed"""
+        if not self.enabled:
+            return
+
+        running = self._tasks.get(meeting_id)
+        if running is not None and not running.done():
+            running.cancel()
+            self.rescheduled += 1
+
+        self.scheduled += 1
+        task = asyncio.ensure_future(self._run(meeting_id, ai_service))
+        self._tasks[meeting_id] = task
+        task.add_done_callback(lambda _: self._forget(meeting_id, task))
+
+    async def _run(self, meeting_id: int, ai_service: OpenRouterService) -> None:
+        await asyncio.sleep(self.delay)
+
+        db = SessionLocal()
+        try:
+            while True:
+                # Objects outlive commits (expire_on_commit=False); reload what other sessions changed
+                db.expire_all()
+                if outro_generation_in_flight(meeting_id):
+                    # Started before the latest transcripts (a cancelled run may have left it to a
+                    # user request that joined it): let it finish, then discard what it stores
+                    await self._mark_missing(db, meeting_id)
+                    await wait_for_outro_generation(meeting_id)
+                await self._discard_stale(db, meeting_id)
+                fingerprint = await _transcript_fingerprint(db, meeting_id)
+
+                # Generates the summary too (in the same LLM call when it is missing)
+                await self._mark_missing(db, meeting_id)
+                await QuizService(db, ai_service).get_or_create_outro_quiz(meeting_id)
+
+                # Transcripts added through another worker don't cancel us, so check before finishing
+                if await _transcript_fingerprint(db, meeting_id) == fingerprint:
+                    break
+
+            self.completed += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            print(f"Failed to pre-generate summary and outro quiz for meeting {meeting_id}: {e}")
+        finally:
+            await db.close()
+
+    async def _mark_missing(self, db: AsyncSession, meeting_id: int) -> None:
+        """Record the artifacts the meeting lacks, so the next batch discards whatever fills them in"""
+        has_summary, has_outro_quiz = await _existing_artifacts(db, meeting_id)
+        speculative = self._speculative.setdefault(meeting_id, set())
+        if not has_summary:
+            speculative.add("summary")
+        if not has_outro_quiz:
+            speculative.add("outro_quiz")
+
+    async def _discard_stale(self, db: AsyncSession, meeting_id: int) -> None:
+        """Remove the summary / outro quiz speculation asked for from transcripts that have since changed"""
+        speculative = self._speculative.get(meeting_id)
+        if not speculative:
+            return
+        meeting = await _get_meeting(db, meeting_id)
+        if not meeting:
+            self._speculative.pop(meeting_id, None)
+            return
+
+        quiz = await _find_outro_quiz(db, meeting_id)
+        if quiz is not None and "outro_quiz" in speculative:
+            if quiz.attempts:
+                # Already served and answered: keep it and the summary it was built from
+                await db.rollback()
+                self._speculative.pop(meeting_id, None)
+                return
+            await db.delete(quiz)
+            self.discarded += 1
+
+        if meeting.summary and "summary" in speculative:
+            meeting.summary = None
+            self.discarded += 1
+
+        await db.commit()
+        self._speculative.pop(meeting_id, None)
+
+    def _forget(self, meeting_id: int, task: asyncio.Task) -> None:
+        if self._tasks.get(meeting_id) is task:
+            del self._tasks[meeting_id]
+
+    async def close(self) -> None:
+        """Cancel pending speculative work on shutdown"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "delay_seconds": self.delay,
+            "pending": len(self._tasks),
+            "scheduled": self.scheduled,
+            "rescheduled": self.rescheduled,
+            "completed": self.completed,
+            "discarded": self.discarded,
+            "failed": self.failed
+        }
@@ -1,29 +1,171 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import Optional, List, Dict
+import os
+from sqlalchemy import desc, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, List, Dict, AsyncIterator
 from models import Quiz, Question, Answer, UserQuizAttempt, Meeting, Transcribe, QuizType, User, UserMeetingEvaluation
 from openrouter_service import OpenRouterService
+from database import SessionLocal
+from singleflight import SingleFlight
+from leases import acquire_lease, release_lease, renewing, wait_for_release
+from events import publish_event
+from auth import invalidate_user
 from datetime import datetime
 
 
+# Process-wide: concurrent requests for the same quiz/summary share one LLM generation
+_generation_flights = SingleFlight()
+
+# Generate a missing summary together with the outro quiz in one LLM call (falls back to two calls)
+COMBINED_OUTRO_GENERATION = os.getenv("COMBINED_OUTRO_GENERATION", "true").lower() in ("1", "true", "yes")
+
+
+def outro_generation_in_flight(meeting_id: int) -> bool:
+    """Whether this process is generating the meeting's outro quiz or summary"""
+    return (_generation_flights.in_flight(("quiz", meeting_id, QuizType.outro))
+            or _generation_flights.in_flight(("summary", meeting_id)))
+
+
+async def wait_for_outro_generation(meeting_id: int) -> None:
+    """Wait until this process is done generating the meeting's outro quiz and summary"""
+    # The outro quiz generation may start the summary one, so it is waited for first
+    await _generation_flights.wait(("quiz", meeting_id, QuizType.outro))
+    await _generation_flights.wait(("summary", meeting_id))
+
+
 class QuizService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, ai_service: Optional[OpenRouterService] = None):
         self.db = db
-        self.ai_service = OpenRouterService()
+        # Prefer the application-scoped service so the pooled HTTP client is reused
+        self._ai_service = ai_service
+
+    @property
+    def ai_service(self) -> OpenRouterService:
+        """The LLM service, created on first use so read-only callers don't need an API key"""
+        if self._ai_service is None:
+            self._ai_service = OpenRouterService()
+        return self._ai_service
+
+    # Async sessions can't lazy-load: a quiz comes with its questions and answers in one joined query
+    QUIZ_LOADER = joinedload(Quiz.questions).joinedload(Question.answers)
+
+    @staticmethod
+    def _quiz_query():
+        return select(Quiz).options(QuizService.QUIZ_LOADER)
+
+    async def _find_quiz(self, meeting_id: int, quiz_type: QuizType) -> Optional[Quiz]:
+        # Ordered so that, until migration 3 has removed them, duplicates resolve to the quiz it keeps
+        return (await self.db.execute(
+            self._quiz_query().where(
+                Quiz.meeting_id == meeting_id,
+                Quiz.quiz_type == quiz_type
+            ).order_by(Quiz.id)
+        )).unique().scalars().first()
+
+    async def _get_meeting(self, meeting_id: int) -> Optional[Meeting]:
+        return (await self.db.execute(select(Meeting).where(Meeting.id == meeting_id))).scalars().first()
+
+    async def _generate_shared(self, key, method, *args):
+        """
+        Run a generation step once per key, however many callers ask for it concurrently.
+        Our pooled connection is released while waiting since the generation uses its own session.
+        """
+        await self.db.commit()
+        return await _generation_flights.do(key, lambda: self._run_detached(method, *args))
+
+    async def _run_detached(self, method, *args):
+        """
+        Run a generation step on its own DB session.
+        Shared generations can outlive the request that started them, so they must not use its session.
+        """
+        async with SessionLocal() as db:
+            return await method(QuizService(db, self.ai_service), *args)
+
+    async def _with_lease(self, key: str, generate, lookup):
+        """
+        Run generate() while holding the cross-worker lease for key.
+        A worker that loses the race waits for the winner and returns lookup() instead of calling the LLM again.
+        """
+        while True:
+            owner = await acquire_lease(self.db, key)
+            if owner:
+                try:
+                    async with renewing(key, owner):
+                        return await generate()
+                finally:
+                    await release_lease(self.db, key, owner)
+
+            await wait_for_release(self.db, key)
+            result = await lookup()
+            if result is not None:
+                return result
+
+    async def get_meeting_quiz(self, meeting_id: int, quiz_type: QuizType) -> Optional[Quiz]:
+        """Get a meeting's quiz of the given type if it has already been generated"""
+        return await self._find_quiz(meeting_id, quiz_type)
+
+    async def _find_quiz_id(self, meeting_id: int, quiz_type: QuizType) -> Optional[int]:
+        return (await self.db.execute(
+            select(Quiz.id).where(Quiz.meeting_id == meeting_id, Quiz.quiz_type == quiz_type).order_by(Quiz.id)
+        )).scalar()
+
+    async def _store_quiz(
+            self,
+            meeting_id: int,
+            quiz_type: QuizType,
+            quiz_data: Dict,
+            summary_points: Optional[str]
+    ) -> int:
+        """Store a generated quiz, returning its id (or the id of the one another worker stored first)"""
+        try:
+            quiz_id = (await self._create_quiz_from_data(
+                meeting_id=meeting_id,
+                quiz_type=quiz_type,
+                quiz_data=quiz_data,
+                summary_points=summary_points
+            )).id
+        except IntegrityError:
+            # Unique (meeting_id, quiz_type), created on existing databases by migration 3: the other worker's quiz wins
+            await self.db.rollback()
+            existing_id = await self._find_quiz_id(meeting_id, quiz_type)
+            if existing_id is None:
+                raise
+            return existing_id
+
+        await publish_event(meeting_id, f"{quiz_type.value}_quiz_ready", {"meeting_id": meeting_id, "quiz_id": quiz_id})
+        return quiz_id
 
     async def get_or_create_intro_quiz(self, meeting_id: int) -> Quiz:
         """Get existing intro quiz or create new one"""
         # Check if intro quiz already exists
-        existing_quiz = self.db.query(Quiz).filter(
-            Quiz.meeting_id == meeting_id,
-            Quiz.quiz_type == QuizType.intro
-        ).first()
-
+        existing_quiz = await self._find_quiz(meeting_id, QuizType.intro)
         if existing_quiz:
             return existing_quiz
 
+        # Concurrent callers wait for a single generation
+        quiz_id = await self._generate_shared(
+            ("quiz", meeting_id, QuizType.intro),
+            QuizService._create_intro_quiz,
+            meeting_id
+        )
+        return await self.get_quiz_by_id(quiz_id)
+
+    async def _create_intro_quiz(self, meeting_id: int) -> int:
+        """Generate and store the intro quiz under the cross-worker lease, returning its id"""
+        return await self._with_lease(
+            f"quiz:{meeting_id}:{QuizType.intro.value}",
+            lambda: self._generate_intro_quiz(meeting_id),
+            lambda: self._find_quiz_id(meeting_id, QuizType.intro)
+        )
+
+    async def _generate_intro_quiz(self, meeting_id: int) -> int:
+        existing_quiz = await self._find_quiz(meeting_id, QuizType.intro)
+        if existing_quiz:
+            return existing_quiz.id
+
         # Get meeting info
-        meeting = self.db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        meeting = await self._get_meeting(meeting_id)
         if not meeting:
             raise ValueError(f"Meeting {meeting_id} not found")
 
@@ -34,14 +176,14 @@ class QuizService:
         )
 
         # Create quiz in database
-        return self._create_quiz_from_data(
+        return await self._store_quiz(
             meeting_id=meeting_id,
             quiz_type=QuizType.intro,
             quiz_data=quiz_data,
             summary_points=None
         )
 
-    def _create_quiz_from_data(
+    async def _create_quiz_from_data(
             self,
             meeting_id: int,
             quiz_type: QuizType,
@@ -49,6 +191,18 @@ class QuizService:
             summary_points: Optional[str]
     ) -> Quiz:
         """Create quiz and questions from AI-generated data"""
+        new_quiz = await self._add_quiz_from_data(meeting_id, quiz_type, quiz_data, summary_points)
+        await self.db.commit()
+        return new_quiz
+
+    async def _add_quiz_from_data(
+            self,
+            meeting_id: int,
+            quiz_type: QuizType,
+            quiz_data: Dict,
+            summary_points: Optional[str]
+    ) -> Quiz:
+        """Add quiz, questions and answers to the session and flush them, leaving the commit to the caller"""
         # Create quiz
         new_quiz = Quiz(
             meeting_id=meeting_id,
@@ -56,7 +210,7 @@ class QuizService:
             summary_points=summary_points
         )
         self.db.add(new_quiz)
-        self.db.flush()
+        await self.db.flush()
 
         # Create questions and answers
         for q_idx, question_data in enumerate(quiz_data["questions"]):
@@ -67,7 +221,7 @@ class QuizService:
                 order=q_idx
             )
             self.db.add(new_question)
-            self.db.flush()
+            await self.db.flush()
 
             # Create answers
             for a_idx, answer_text in enumerate(question_data["answers"]):
@@ -78,15 +232,14 @@ class QuizService:
                 )
                 self.db.add(new_answer)
 
-        self.db.commit()
-        self.db.refresh(new_quiz)
+        await self.db.flush()
         return new_quiz
 
-    def get_quiz_by_id(self, quiz_id: int) -> Optional[Quiz]:
-        """Get quiz by ID with all relations"""
-        return self.db.query(Quiz).filter(Quiz.id == quiz_id).first()
+    async def get_quiz_by_id(self, quiz_id: int) -> Optional[Quiz]:
+        """Get quiz by ID with all relations (no query if this session already loaded it)"""
+        return await self.db.get(Quiz, quiz_id, options=[self.QUIZ_LOADER])
 
-    def submit_quiz_attempt(
+    async def submit_quiz_attempt(
             self,
             quiz_id: int,
             user_username: str,
@@ -96,7 +249,7 @@ class QuizService:
         Submit quiz attempt and calculate score.
         Returns detailed results including correct answers.
         """
-        quiz = self.get_quiz_by_id(quiz_id)
+        quiz = await self.get_quiz_by_id(quiz_id)
         if not quiz:
             raise ValueError(f"Quiz {quiz_id} not found")
 
@@ -138,8 +291,7 @@ class QuizService:
             total_questions=total_questions
         )
         self.db.add(attempt)
-        self.db.commit()
-        self.db.refresh(attempt)
+        await self.db.commit()
 
         return {
             "score": correct_count,
@@ -151,27 +303,30 @@ class QuizService:
             "attempt_id": attempt.id
         }
 
-    def get_user_attempts(self, user_username: str, quiz_id: Optional[int] = None) -> List[UserQuizAttempt]:
+    async def get_user_attempts(self, user_username: str, quiz_id: Optional[int] = None) -> List[UserQuizAttempt]:
         """Get user's quiz attempts, optionally filtered by quiz_id"""
-        query = self.db.query(UserQuizAttempt).filter(
+        query = select(UserQuizAttempt).where(
             UserQuizAttempt.user_username == user_username
         )
 
         if quiz_id:
-            query = query.filter(UserQuizAttempt.quiz_id == quiz_id)
+            query = query.where(UserQuizAttempt.quiz_id == quiz_id)
+
+        return list((await self.db.execute(query.order_by(desc(UserQuizAttempt.completed_at)))).scalars().all())
 
-        return query.order_by(desc(UserQuizAttempt.completed_at)).all()
+    async def _count_transcripts(self, meeting_id: int) -> int:
+        return (await self.db.execute(
+            select(func.count(Transcribe.id)).where(Transcribe.meeting_id == meeting_id)
+        )).scalar()
 
-    def get_meeting_summary(self, meeting_id: int) -> Optional[Dict]:
+    async def get_meeting_summary(self, meeting_id: int) -> Optional[Dict]:
         """Get existing meeting summary without regenerating"""
-        meeting = self.db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        meeting = await self._get_meeting(meeting_id)
         if not meeting:
             return None
         
         # Get transcript count
-        transcript_count = self.db.query(Transcribe).filter(
-            Transcribe.meeting_id == meeting_id
-        ).count()
+        transcript_count = await self._count_transcripts(meeting_id)
         
         return {
             "meeting_id": meeting_id,
@@ -183,16 +338,62 @@ class QuizService:
             "transcript_count": transcript_count
         }
 
+    async def get_meeting_status(self, meeting_id: int) -> Optional[Dict]:
+        """Which of a meeting's artifacts are ready, sent to push subscribers when they connect"""
+        meeting = await self._get_meeting(meeting_id)
+        if not meeting:
+            return None
+
+        intro_quiz_id = await self._find_quiz_id(meeting_id, QuizType.intro)
+        outro_quiz_id = await self._find_quiz_id(meeting_id, QuizType.outro)
+        transcript_count = await self._count_transcripts(meeting_id)
+        evaluated_users = list((await self.db.execute(
+            select(UserMeetingEvaluation.user_username).where(UserMeetingEvaluation.meeting_id == meeting_id)
+        )).scalars().all())
+
+        return {
+            "meeting_id": meeting_id,
+            "transcript_count": transcript_count,
+            "has_summary": meeting.summary is not None,
+            "intro_quiz_id": intro_quiz_id,
+            "outro_quiz_id": outro_quiz_id,
+            "evaluated_users": evaluated_users,
+            "has_team_evaluation": meeting.team_evaluated_at is not None
+        }
+
     async def generate_meeting_summary(self, meeting_id: int) -> Dict:
         """Generate summary from transcripts and save to meeting"""
-        meeting = self.db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        # Concurrent callers wait for a single generation
+        return await self._generate_shared(
+            ("summary", meeting_id),
+            QuizService._create_meeting_summary,
+            meeting_id
+        )
+
+    async def _create_meeting_summary(self, meeting_id: int) -> Dict:
+        """Generate the summary under the cross-worker lease; losers return the winner's summary"""
+        return await self._with_lease(
+            f"summary:{meeting_id}",
+            lambda: self._generate_meeting_summary(meeting_id),
+            lambda: self._existing_summary(meeting_id)
+        )
+
+    async def _existing_summary(self, meeting_id: int) -> Optional[Dict]:
+        summary = await self.get_meeting_summary(meeting_id)
+        return summary if summary and summary["has_summary"] else None
+
+    async def _load_summary_inputs(self, meeting_id: int):
+        """Load the meeting and its ordered transcripts in the shape the AI service expects"""
+        meeting = await self._get_meeting(meeting_id)
         if not meeting:
             raise ValueError(f"Meeting {meeting_id} not found")
 
         # Get transcripts
-        transcripts = self.db.query(Transcribe).filter(
-            Transcribe.meeting_id == meeting_id
-        ).order_by(Transcribe.timestamp.asc()).all()
+        transcripts = (await self.db.execute(
+            select(Transcribe).where(
+                Transcribe.meeting_id == meeting_id
+            ).order_by(Transcribe.timestamp.asc())
+        )).scalars().all()
 
         if not transcripts:
             raise ValueError(f"No transcripts found for meeting {meeting_id}")
@@ -207,6 +408,11 @@ class QuizService:
             for t in transcripts
         ]
 
+        return meeting, transcript_dicts
+
+    async def _generate_meeting_summary(self, meeting_id: int) -> Dict:
+        meeting, transcript_dicts = await self._load_summary_inputs(meeting_id)
+
         # Generate summary using AI
         summary_points = await self.ai_service.generate_summary_from_transcripts(
             meeting.name,
@@ -216,8 +422,8 @@ class QuizService:
 
         # Save summary to meeting
         meeting.summary = summary_points
-        self.db.commit()
-        self.db.refresh(meeting)
+        await self.db.commit()
+        await publish_event(meeting_id, "summary_ready", {"meeting_id": meeting_id})
 
         return {
             "meeting_id": meeting_id,
@@ -226,30 +432,121 @@ class QuizService:
             "summary_points": summary_points,
             "generated_at": datetime.now(),
             "has_summary": True,
-            "transcript_count": len(transcripts)
+            "transcript_count": len(transcript_dicts)
+        }
+
+    async def stream_meeting_summary(self, meeting_id: int) -> AsyncIterator[Dict]:
+        """
+        Generate a new summary and stream it bullet point by bullet point.
+        The meeting is validated up front (raises ValueError), then an async iterator of
+        {"event", "data"} dicts is returned. The full text is saved to Meeting.summary when the stream ends.
+        """
+        meeting, transcript_dicts = await self._load_summary_inputs(meeting_id)
+        return self._stream_summary_events(
+            meeting_id,
+            meeting.name,
+            meeting.description,
+            transcript_dicts
+        )
+
+    async def _stream_summary_events(
+            self,
+            meeting_id: int,
+            meeting_name: str,
+            meeting_description: str,
+            transcript_dicts: List[Dict]
+    ) -> AsyncIterator[Dict]:
+        yield {
+            "event": "start",
+            "data": {"meeting_id": meeting_id, "transcript_count": len(transcript_dicts)}
+        }
+
+        bullets = []
+        buffer = ""
+        async for delta in self.ai_service.stream_summary_from_transcripts(
+                meeting_name,
+                meeting_description,
+                transcript_dicts
+        ):
+            buffer += delta
+            # Forward every completed line as soon as its newline arrives
+            while "\n" in buffer:
+                line, buffer = buffer.split("\n", 1)
+                if line.strip():
+                    bullets.append(line.strip())
+                    yield {"event": "bullet", "data": {"index": len(bullets) - 1, "text": line.strip()}}
+
+        if buffer.strip():
+            bullets.append(buffer.strip())
+            yield {"event": "bullet", "data": {"index": len(bullets) - 1, "text": buffer.strip()}}
+
+        summary_points = "\n".join(bullets)
+
+        # The request session may already be closed once the response is streaming
+        async with SessionLocal() as db:
+            meeting = await db.get(Meeting, meeting_id)
+            meeting.summary = summary_points
+            await db.commit()
+        await publish_event(meeting_id, "summary_ready", {"meeting_id": meeting_id})
+
+        yield {
+            "event": "done",
+            "data": {
+                "meeting_id": meeting_id,
+                "meeting_name": meeting_name,
+                "meeting_description": meeting_description,
+                "summary_points": summary_points,
+                "generated_at": datetime.now(),
+                "has_summary": True,
+                "transcript_count": len(transcript_dicts)
+            }
         }
 
     async def get_or_create_outro_quiz(self, meeting_id: int) -> Quiz:
         """Get existing outro quiz or create new one based on summary"""
         # Check if outro quiz already exists
-        existing_quiz = self.db.query(Quiz).filter(
-            Quiz.meeting_id == meeting_id,
-            Quiz.quiz_type == QuizType.outro
-        ).first()
-
+        existing_quiz = await self._find_quiz(meeting_id, QuizType.outro)
         if existing_quiz:
             return existing_quiz
 
+        # Concurrent callers wait for a single generation
+        quiz_id = await self._generate_shared(
+            ("quiz", meeting_id, QuizType.outro),
+            QuizService._create_outro_quiz,
+            meeting_id
+        )
+        return await self.get_quiz_by_id(quiz_id)
+
+    async def _create_outro_quiz(self, meeting_id: int) -> int:
+        """Generate and store the outro quiz (and summary if missing) under the cross-worker lease"""
+        return await self._with_lease(
+            f"quiz:{meeting_id}:{QuizType.outro.value}",
+            lambda: self._generate_outro_quiz(meeting_id),
+            lambda: self._find_quiz_id(meeting_id, QuizType.outro)
+        )
+
+    async def _generate_outro_quiz(self, meeting_id: int) -> int:
+        existing_quiz = await self._find_quiz(meeting_id, QuizType.outro)
+        if existing_quiz:
+            return existing_quiz.id
+
         # Get meeting info
-        meeting = self.db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        meeting = await self._get_meeting(meeting_id)
         if not meeting:
             raise ValueError(f"Meeting {meeting_id} not found")
 
+        # No summary yet: try to get the summary and the quiz from a single LLM call
+        if not meeting.summary and COMBINED_OUTRO_GENERATION:
+            quiz_id = await self._generate_summary_and_outro_quiz(meeting_id)
+            if quiz_id is not None:
+                return quiz_id
+            await self.db.refresh(meeting)
+
         # Check if summary exists, if not generate it
         if not meeting.summary:
             # Generate summary first
             await self.generate_meeting_summary(meeting_id)
-            self.db.refresh(meeting)
+            await self.db.refresh(meeting)
 
         # Generate quiz based on summary
         quiz_data = await self.ai_service.generate_outro_quiz_from_summary(
@@ -259,13 +556,82 @@ class QuizService:
         )
 
         # Create quiz in database
-        return self._create_quiz_from_data(
+        return await self._store_quiz(
             meeting_id=meeting_id,
             quiz_type=QuizType.outro,
             quiz_data=quiz_data,
             summary_points=meeting.summary
         )
 
+    async def _generate_summary_and_outro_quiz(self, meeting_id: int) -> Optional[int]:
+        """
+        Generate the summary and the outro quiz in one LLM round-trip and save both in one transaction.
+        Returns the quiz id, or None when the caller should fall back to summary-then-quiz: the reply
+        could not be parsed, or a summary generation is already running elsewhere.
+        """
+        if _generation_flights.in_flight(("summary", meeting_id)):
+            return None
+
+        summary_key = f"summary:{meeting_id}"
+        owner = await acquire_lease(self.db, summary_key)
+        if not owner:
+            return None
+
+        try:
+            async with renewing(summary_key, owner):
+                return await self._store_summary_and_outro_quiz(meeting_id)
+        finally:
+            await release_lease(self.db, summary_key, owner)
+
+    async def _store_summary_and_outro_quiz(self, meeting_id: int) -> Optional[int]:
+        """The combined generation itself, run while holding the summary lease"""
+        meeting, transcript_dicts = await self._load_summary_inputs(meeting_id)
+        try:
+            result = await self.ai_service.generate_summary_and_outro_quiz(
+                meeting.name,
+                meeting.description,
+                transcript_dicts
+            )
+        except ValueError as e:
+            print(f"Combined summary + outro quiz generation failed for meeting {meeting_id}, "
+                  f"falling back to two calls: {e}")
+            return None
+
+        meeting.summary = result["summary_points"]
+        try:
+            # Savepoint: if another worker's quiz wins, only the quiz insert is undone, not the summary
+            async with self.db.begin_nested():
+                quiz_id = (await self._add_quiz_from_data(
+                    meeting_id=meeting_id,
+                    quiz_type=QuizType.outro,
+                    quiz_data=result,
+                    summary_points=result["summary_points"]
+                )).id
+            created = True
+        except IntegrityError:
+            quiz_id = await self._find_quiz_id(meeting_id, QuizType.outro)
+            if quiz_id is None:
+                raise
+            created = False
+        await self.db.commit()
+
+        await publish_event(meeting_id, "summary_ready", {"meeting_id": meeting_id})
+        if created:
+            await publish_event(meeting_id, "outro_quiz_ready", {"meeting_id": meeting_id, "quiz_id": quiz_id})
+        return quiz_id
+
+    async def _get_user(self, username: str) -> Optional[User]:
+        return (await self.db.execute(select(User).where(User.username == username))).scalars().first()
+
+    async def _count_outro_attempts(self, username: str) -> int:
+        """Meetings attended, counted as the user's outro quiz attempts"""
+        return (await self.db.execute(
+            select(func.count(UserQuizAttempt.id)).join(Quiz, UserQuizAttempt.quiz_id == Quiz.id).where(
+                UserQuizAttempt.user_username == username,
+                Quiz.quiz_type == QuizType.outro
+            )
+        )).scalar()
+
     async def evaluate_user_performance(self, meeting_id: int, username: str) -> Dict:
         """
         Generate performance evaluation for a user in a specific meeting.
@@ -273,21 +639,20 @@ class QuizService:
         Calculates score (0-100), updates user credits and rolling average score.
         """
         # Check if evaluation already exists
-        existing_eval = self.db.query(UserMeetingEvaluation).filter(
-            UserMeetingEvaluation.meeting_id == meeting_id,
-            UserMeetingEvaluation.user_username == username
-        ).first()
+        existing_eval = (await self.db.execute(
+            select(UserMeetingEvaluation).where(
+                UserMeetingEvaluation.meeting_id == meeting_id,
+                UserMeetingEvaluation.user_username == username
+            )
+        )).scalars().first()
 
         if existing_eval:
             # Return existing evaluation
-            meeting = self.db.query(Meeting).filter(Meeting.id == meeting_id).first()
-            user = self.db.query(User).filter(User.username == username).first()
+            meeting = await self._get_meeting(meeting_id)
+            user = await self._get_user(username)
             
             # Count meetings attended
-            meetings_attended = self.db.query(UserQuizAttempt).join(Quiz).filter(
-                UserQuizAttempt.user_username == username,
-                Quiz.quiz_type == QuizType.outro
-            ).count()
+            meetings_attended = await self._count_outro_attempts(username)
             
             return {
                 "meeting_id": meeting_id,
@@ -309,20 +674,22 @@ class QuizService:
             }
 
         # Verify meeting exists
-        meeting = self.db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        meeting = await self._get_meeting(meeting_id)
         if not meeting:
             raise ValueError(f"Meeting {meeting_id} not found")
 
         # Verify user exists
-        user = self.db.query(User).filter(User.username == username).first()
+        user = await self._get_user(username)
         if not user:
             raise ValueError(f"User {username} not found")
 
         # Get user's transcripts for this meeting
-        user_transcripts = self.db.query(Transcribe).filter(
-            Transcribe.meeting_id == meeting_id,
-            Transcribe.user_username == username
-        ).order_by(Transcribe.timestamp.asc()).all()
+        user_transcripts = (await self.db.execute(
+            select(Transcribe).where(
+                Transcribe.meeting_id == meeting_id,
+                Transcribe.user_username == username
+            ).order_by(Transcribe.timestamp.asc())
+        )).scalars().all()
 
         if not user_transcripts:
             raise ValueError(f"User {username} has no transcripts for meeting {meeting_id}")
@@ -332,19 +699,18 @@ class QuizService:
         total_transcripts = len(user_transcripts)
 
         # Get outro quiz score for this meeting
-        outro_quiz = self.db.query(Quiz).filter(
-            Quiz.meeting_id == meeting_id,
-            Quiz.quiz_type == QuizType.outro
-        ).first()
+        outro_quiz_id = await self._find_quiz_id(meeting_id, QuizType.outro)
 
-        if not outro_quiz:
+        if not outro_quiz_id:
             raise ValueError(f"No outro quiz found for meeting {meeting_id}")
 
         # Get user's quiz attempt
-        quiz_attempt = self.db.query(UserQuizAttempt).filter(
-            UserQuizAttempt.user_username == username,
-            UserQuizAttempt.quiz_id == outro_quiz.id
-        ).first()
+        quiz_attempt = (await self.db.execute(
+            select(UserQuizAttempt).where(
+                UserQuizAttempt.user_username == username,
+                UserQuizAttempt.quiz_id == outro_quiz_id
+            )
+        )).scalars().first()
 
         if not quiz_attempt:
             raise ValueError(f"User {username} has not completed the outro quiz for meeting {meeting_id}")
@@ -385,10 +751,7 @@ class QuizService:
         total_score = quiz_score + participation_score + quality_score
 
         # Count meetings attended (based on outro quiz attempts)
-        meetings_attended = self.db.query(UserQuizAttempt).join(Quiz).filter(
-            UserQuizAttempt.user_username == username,
-            Quiz.quiz_type == QuizType.outro
-        ).count() + 1  # +1 for current meeting
+        meetings_attended = await self._count_outro_attempts(username) + 1  # +1 for current meeting
 
         # Calculate new rolling average score
         if meetings_attended == 1:
@@ -414,9 +777,15 @@ class QuizService:
         )
 
         self.db.add(evaluation)
-        self.db.commit()
-        self.db.refresh(evaluation)
-        self.db.refresh(user)
+        await self.db.commit()
+        invalidate_user(username)
+        # evaluated_at is set by the database
+        await self.db.refresh(evaluation)
+        await publish_event(meeting_id, "user_evaluation_ready", {
+            "meeting_id": meeting_id,
+            "username": username,
+            "evaluation_score": total_score
+        })
 
         return {
             "meeting_id": meeting_id,
@@ -444,14 +813,16 @@ class QuizService:
         Regenerates on each call to include latest data.
         """
         # Verify meeting exists
-        meeting = self.db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        meeting = await self._get_meeting(meeting_id)
         if not meeting:
             raise ValueError(f"Meeting {meeting_id} not found")
 
         # Get all individual evaluations for this meeting
-        evaluations = self.db.query(UserMeetingEvaluation).filter(
-            UserMeetingEvaluation.meeting_id == meeting_id
-        ).all()
+        evaluations = (await self.db.execute(
+            select(UserMeetingEvaluation).where(
+                UserMeetingEvaluation.meeting_id == meeting_id
+            )
+        )).scalars().all()
 
         if not evaluations:
             raise ValueError(f"No individual evaluations found for meeting {meeting_id}")
@@ -498,8 +869,11 @@ class QuizService:
         meeting.team_tips = ai_evaluation["team_tips"]
         meeting.team_evaluated_at = datetime.now()
 
-        self.db.commit()
-        self.db.refresh(meeting)
+        await self.db.commit()
+        await publish_event(meeting_id, "team_evaluation_ready", {
+            "meeting_id": meeting_id,
+            "team_evaluation_score": avg_evaluation_score
+        })
 
         return {
             "meeting_id": meeting_id,
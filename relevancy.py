@@ -0,0 +1,199 @@
+import asyncio
+import os
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set
+from sqlalchemy import select
+from database import SessionLocal
+from models import Meeting, Transcribe
+from openrouter_service import OpenRouterService
+from relevancy_filter import RelevancyFilter
+
+
+class _Window:
+    """Utterances waiting to be judged together for one meeting, with their callers' futures"""
+
+    def __init__(self, meeting: Meeting, ai_service: OpenRouterService):
+        self.meeting_name = meeting.name
+        self.meeting_description = meeting.description
+        self.ai_service = ai_service
+        self.utterances: List[Dict] = []
+        self.futures: List[asyncio.Future] = []
+        self.full = asyncio.Event()
+
+
+class RelevancyBatcher:
+    """
+    Micro-batches live relevancy checks: utterances from every speaker in a meeting that arrive
+    within `window` seconds of the first are judged in a single LLM call (a full batch of
+    `batch_size` goes out at once), instead of one call per utterance.
+    The meeting's latest `context_lines` utterances judged relevant are sent along as context;
+    transcripts are usually stored only after the meeting, so stored ones just fill the rest.
+    With a prefilter, utterances it can decide locally never reach the LLM.
+    """
+    # Meetings whose recent utterances are kept; the least recently checked are forgotten first
+    MAX_MEETINGS = 1000
+
+    def __init__(
+            self,
+            window: float,
+            batch_size: int,
+            context_lines: int,
+            prefilter: Optional[RelevancyFilter] = None
+    ):
+        self.window = window
+        self.batch_size = batch_size
+        self.context_lines = context_lines
+        self.prefilter = prefilter
+        self._windows: Dict[int, _Window] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._recent: "OrderedDict[int, Deque[Dict]]" = OrderedDict()
+
+        self.requests = 0
+        self.llm_calls = 0
+        self.failed = 0
+        self.prefiltered_relevant = 0
+        self.prefiltered_off_topic = 0
+
+    @classmethod
+    def from_env(cls) -> "RelevancyBatcher":
+        prefilter_enabled = os.getenv("RELEVANCY_FILTER_ENABLED", "true").lower() in ("1", "true", "yes")
+        return cls(
+            window=float(os.getenv("RELEVANCY_WINDOW", "0.5")),
+            batch_size=int(os.getenv("RELEVANCY_BATCH_SIZE", "20")),
+            context_lines=int(os.getenv("RELEVANCY_CONTEXT_LINES", "10")),
+            prefilter=RelevancyFilter.from_env() if prefilter_enabled else None
+        )
+
+    async def check(self, meeting: Meeting, username: str, transcription: str, ai_service: OpenRouterService) -> Dict:
+        """Queue an utterance for the meeting's current window and wait for its verdict"""
+        window = self._windows.get(meeting.id)
+        if window is None:
+            window = self._windows[meeting.id] = _Window(meeting, ai_service)
+            task = asyncio.ensure_future(self._run(meeting.id, window))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        future = asyncio.get_running_loop().create_future()
+        window.utterances.append({"username": username, "transcription": transcription})
+        window.futures.append(future)
+        self.requests += 1
+        if len(window.utterances) >= self.batch_size:
+            # Later utterances start a new window
+            del self._windows[meeting.id]
+            window.full.set()
+
+        return await future
+
+    async def _run(self, meeting_id: int, window: _Window) -> None:
+        try:
+            try:
+                await asyncio.wait_for(window.full.wait(), timeout=self.window)
+            except asyncio.TimeoutError:
+                pass
+            if self._windows.get(meeting_id) is window:
+                del self._windows[meeting_id]
+
+            try:
+                context = await self._context(meeting_id)
+                decisions = self._prefilter(window, context)
+                for future, decision in zip(window.futures, decisions):
+                    if decision is not None and not future.done():
+                        future.set_result({"relevant": decision, "chatWarning": None, "warning": None})
+
+                ambiguous = [index for index, decision in enumerate(decisions) if decision is None]
+                if not ambiguous:
+                    self._remember(meeting_id, window, decisions)
+                    return
+                self.llm_calls += 1
+                verdicts = await window.ai_service.check_relevancy(
+                    window.meeting_name,
+                    window.meeting_description,
+                    context,
+                    [window.utterances[index] for index in ambiguous]
+                )
+            except Exception as e:
+                self.failed += 1
+                for future in window.futures:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for index, verdict in zip(ambiguous, verdicts):
+                decisions[index] = verdict["relevant"]
+                # A caller that disconnected has cancelled its future
+                if not window.futures[index].done():
+                    window.futures[index].set_result(verdict)
+            self._remember(meeting_id, window, decisions)
+        finally:
+            # Only left unresolved when shutting down
+            for future in window.futures:
+                if not future.done():
+                    future.cancel()
+
+    def _prefilter(self, window: _Window, context: List[Dict]) -> List[Optional[bool]]:
+        """Local verdicts for the window's utterances: True / False when clear, None for the LLM"""
+        if self.prefilter is None:
+            return [None] * len(window.utterances)
+        decisions = self.prefilter.classify(
+            f"{window.meeting_name}\n{window.meeting_description}",
+            [utterance["transcription"] for utterance in window.utterances],
+            [line["transcription"] for line in context]
+        )
+        self.prefiltered_relevant += decisions.count(True)
+        self.prefiltered_off_topic += decisions.count(False)
+        return decisions
+
+    def _remember(self, meeting_id: int, window: _Window, decisions: List[Optional[bool]]) -> None:
+        """Add the window's relevant utterances to the meeting's rolling context"""
+        if self.context_lines <= 0:
+            return
+        recent = self._recent.get(meeting_id)
+        if recent is None:
+            recent = self._recent[meeting_id] = deque(maxlen=self.context_lines)
+            if len(self._recent) > self.MAX_MEETINGS:
+                self._recent.popitem(last=False)
+        self._recent.move_to_end(meeting_id)
+        # Off-topic chatter stays out, or it would make more of the same look relevant
+        recent.extend(utterance for utterance, relevant in zip(window.utterances, decisions) if relevant)
+
+    async def _context(self, meeting_id: int) -> List[Dict]:
+        """The meeting's latest context_lines utterances: live ones first, topped up from stored transcripts"""
+        if self.context_lines <= 0:
+            return []
+        recent = list(self._recent.get(meeting_id, ()))
+        missing = self.context_lines - len(recent)
+        if missing <= 0:
+            return recent
+
+        async with SessionLocal() as db:
+            rows = (await db.execute(
+                select(Transcribe.user_username, Transcribe.transcription_text)
+                .where(Transcribe.meeting_id == meeting_id)
+                .order_by(Transcribe.timestamp.desc())
+                .limit(missing)
+            )).all()
+        stored = [{"username": username, "transcription": text} for username, text in reversed(rows)]
+        return [line for line in stored if line not in recent] + recent
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._windows.clear()
+        self._recent.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "window_seconds": self.window,
+            "batch_size": self.batch_size,
+            "requests": self.requests,
+            "llm_calls": self.llm_calls,
+            "prefiltered_relevant": self.prefiltered_relevant,
+            "prefiltered_off_topic": self.prefiltered_off_topic,
+            "utterances_per_call": round(
+                (self.requests - self.prefiltered_relevant - self.prefiltered_off_topic) / self.llm_calls, 2
+            ) if self.llm_calls else 0.0,
+            "failed_calls": self.failed,
+            "open_windows": len(self._windows),
+            "meetings_with_context": len(self._recent)
+        }
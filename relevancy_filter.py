@@ -0,0 +1,149 @@
+"""
+Local relevancy pre-filter for live utterances.
+Scores utterances by TF-IDF cosine similarity (hashed bag of words, NumPy) against the meeting's
+name and description and against the recent conversation. Clear cases are decided locally; only
+the ambiguous band is left for the LLM.
+"""
+import os
+import re
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from models import Meeting, Transcribe
+
+
+_TOKEN = re.compile(r"\w{2,}")
+
+
+def _hashed_tokens(texts: Sequence[str], features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(document index, hashed feature) for every token of every text"""
+    docs: List[int] = []
+    cols: List[int] = []
+    for index, text in enumerate(texts):
+        # hash() is salted per process; vectors are never stored, so it only has to be stable within one
+        hashes = [hash(token) % features for token in _TOKEN.findall(text.lower())]
+        cols.extend(hashes)
+        docs.extend([index] * len(hashes))
+    return np.asarray(docs, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+
+
+class RelevancyFilter:
+    """
+    Vectorized TF-IDF relevancy scorer. A batch is tokenized once and every similarity is computed
+    in sparse (document, feature) form with bincount, so no document-by-feature matrix is built.
+    Scores are in [0, 1]; at or above `high` an utterance is relevant, below `low` it is off-topic,
+    in between it is ambiguous. Utterances with fewer than `min_tokens` words ("yes", "agreed")
+    carry too little signal to score either way and are always ambiguous. Nothing is called
+    off-topic without a conversation to compare with: the description alone misses too much of the
+    vocabulary.
+    """
+
+    def __init__(self, high: float, low: float, min_tokens: int, features: int = 2 ** 18):
+        self.high = high
+        self.low = low
+        self.min_tokens = min_tokens
+        self.features = features
+
+    @classmethod
+    def from_env(cls) -> "RelevancyFilter":
+        return cls(
+            high=float(os.getenv("RELEVANCY_FILTER_HIGH", "0.35")),
+            low=float(os.getenv("RELEVANCY_FILTER_LOW", "0.05")),
+            min_tokens=int(os.getenv("RELEVANCY_FILTER_MIN_TOKENS", "4"))
+        )
+
+    def score(self, topic: str, texts: Sequence[str], context: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Similarity of each text to the topic or to the conversation, whichever is higher.
+        context is the recent conversation; when None, each text is compared with the rest of the batch.
+        """
+        scores, _, _ = self._score(topic, texts, context)
+        return scores
+
+    def classify(
+            self,
+            topic: str,
+            texts: Sequence[str],
+            context: Optional[Sequence[str]] = None
+    ) -> List[Optional[bool]]:
+        """True (relevant), False (off-topic) or None (ambiguous, ask the LLM) for each text"""
+        scores, token_counts, has_conversation = self._score(topic, texts, context)
+        decisions: List[Optional[bool]] = []
+        for score, token_count, conversation in zip(scores, token_counts, has_conversation):
+            if token_count < self.min_tokens:
+                decisions.append(None)
+            elif score >= self.high:
+                decisions.append(True)
+            elif score < self.low and conversation:
+                decisions.append(False)
+            else:
+                decisions.append(None)
+        return decisions
+
+    def score_transcripts(
+            self,
+            meeting: Meeting,
+            transcripts: Sequence[Transcribe],
+            context: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """Score stored transcripts of a meeting in one pass; see score()"""
+        return self.score(
+            f"{meeting.name}\n{meeting.description}",
+            [transcript.transcription_text for transcript in transcripts],
+            context
+        )
+
+    def _score(
+            self,
+            topic: str,
+            texts: Sequence[str],
+            context: Optional[Sequence[str]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(scores, token count per text, whether each text had a conversation to compare with)"""
+        n = len(texts)
+        if n == 0:
+            return np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+        leave_one_out = context is None
+        # Documents: the texts, then the topic, then the context lines (which also sharpen the IDF)
+        documents = list(texts) + [topic] + ([] if leave_one_out else list(context))
+        topic_doc = n
+
+        docs, cols = _hashed_tokens(documents, self.features)
+        token_counts = np.bincount(docs, minlength=len(documents))[:n]
+
+        # Sublinear term frequency per (document, feature); features are renumbered to the ones in use
+        pairs, counts = np.unique(docs * self.features + cols, return_counts=True)
+        docs = pairs // self.features
+        used, cols = np.unique(pairs % self.features, return_inverse=True)
+        features = len(used)
+        # Unlike the usual +1 smoothing, words in (nearly) every line, such as "the", weigh (close to) nothing
+        df = np.bincount(cols, minlength=features)
+        idf = np.log((1 + len(documents)) / (1 + df))
+        weights = (1 + np.log(counts)) * idf[cols]
+
+        norms = np.sqrt(np.bincount(docs, weights=weights ** 2, minlength=len(documents)))
+        weights = weights / np.where(norms > 0, norms, 1)[docs]
+
+        is_text = docs < n
+        text_docs, text_cols, text_weights = docs[is_text], cols[is_text], weights[is_text]
+
+        topic_vector = np.zeros(features)
+        is_topic = docs == topic_doc
+        topic_vector[cols[is_topic]] = weights[is_topic]
+        topic_scores = np.bincount(text_docs, weights=text_weights * topic_vector[text_cols], minlength=n)
+
+        # The conversation is the sum of its (normalized) lines
+        in_context = is_text if leave_one_out else docs > topic_doc
+        conversation = np.bincount(cols[in_context], weights=weights[in_context], minlength=features)
+        dots = np.bincount(text_docs, weights=text_weights * conversation[text_cols], minlength=n)
+        if leave_one_out:
+            # Cosine with (conversation - own vector): unit vectors make it a closed form per text
+            own = (norms[:n] > 0).astype(float)
+            dots = dots - own
+            squared = conversation @ conversation - 2 * (dots + own) + own
+        else:
+            squared = np.full(n, conversation @ conversation)
+        has_conversation = squared > 1e-12
+        context_scores = dots / np.sqrt(np.where(has_conversation, squared, np.inf))
+
+        return np.clip(np.maximum(topic_scores, context_scores), 0.0, 1.0), token_counts, has_conversation
+
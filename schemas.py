@@ -17,6 +17,16 @@ class TranscriptItem(BaseModel):
     timestamp: str  # ISO format datetime string
     guildId: str
     channelId: str
+    foul: Optional[bool] = False  # the bot's relevancy verdict; null or missing means not a foul
+
+class RelevancyCheck(BaseModel):
+    username: str
+    transcription: str
+
+class RelevancyResponse(BaseModel):
+    relevant: bool
+    chatWarning: Optional[str] = None
+    warning: Optional[str] = None
 
 # Response schemas
 class UserResponse(BaseSchema):
@@ -50,6 +60,28 @@ class MeetingResponse(BaseSchema):
     created_at: datetime
     owner_username: Optional[str] = None
 
+class QuizOverviewResponse(BaseModel):
+    id: Optional[int] = None
+    status: str  # "missing", "generating", "available" or "completed" (attempted by the user)
+    attempts: int = 0
+    best_score: Optional[int] = None
+    total_questions: Optional[int] = None
+    last_attempt_at: Optional[datetime] = None
+
+class MeetingOverviewResponse(BaseModel):
+    id: int
+    name: str
+    description: str
+    begins_at: Optional[datetime] = None
+    duration: Optional[timedelta] = None
+    created_at: datetime
+    owner_username: Optional[str] = None
+    has_summary: bool
+    summary_generating: bool
+    intro_quiz: QuizOverviewResponse
+    outro_quiz: QuizOverviewResponse
+    next_step: str  # "intro", "outro", "sum" or "waiting"
+
 class MeetingCreateResponse(BaseSchema):
     id: int
     name: str
@@ -211,4 +243,24 @@ class TeamMeetingEvaluationResponse(BaseModel):
     team_tips: str
     average_breakdown: ScoreBreakdown
     participant_count: int
-    evaluated_at: datetime
\ No newline at end of file
+    evaluated_at: datetime
+
+# Background job schemas
+class JobCreate(BaseModel):
+    kind: str  # intro_quiz, outro_quiz, summary, user_evaluation, team_evaluation
+    payload: dict  # e.g. {"meeting_id": 1} or {"meeting_id": 1, "username": "alice"}
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    payload: dict
+    status: str  # queued, running, succeeded, dead
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    result: Optional[dict] = None
+    run_after: datetime
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -4,7 +4,7 @@ Creates 2 meetings with users, transcripts, quizzes, and evaluations.
 """
 import asyncio
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from database import SessionLocal, engine, Base
 from models import (
     User, Meeting, Transcribe, Quiz, Question, Answer, 
@@ -18,8 +18,9 @@ async def seed_database():
     """Seed the database with test data"""
     # Recreate tables to ensure schema is up to date
     print("🔄 Recreating database tables...")
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
     print("✓ Database tables recreated\n")
     
     db = SessionLocal()
@@ -37,14 +38,14 @@ async def seed_database():
         ]
         
         for user in users:
-            existing = db.query(User).filter(User.username == user.username).first()
+            existing = (await db.execute(select(User).where(User.username == user.username))).scalars().first()
             if not existing:
                 db.add(user)
                 print(f"  ✓ Created user: {user.username}")
             else:
                 print(f"  ⊙ User already exists: {user.username}")
         
-        db.commit()
+        await db.commit()
         
         # Create Meeting 1: Product Planning
         print("\n📅 Creating Meeting 1: Product Planning...")
@@ -54,8 +55,8 @@ async def seed_database():
             summary=None
         )
         db.add(meeting1)
-        db.commit()
-        db.refresh(meeting1)
+        await db.commit()
+        await db.refresh(meeting1)
         print(f"  ✓ Created meeting: {meeting1.name} (ID: {meeting1.id})")
         
         # Create transcripts for Meeting 1
@@ -138,7 +139,7 @@ async def seed_database():
         
         for transcript in transcripts1:
             db.add(transcript)
-        db.commit()
+        await db.commit()
         print(f"  ✓ Created {len(transcripts1)} transcripts")
         
         # Generate intro quiz for Meeting 1
@@ -176,7 +177,7 @@ async def seed_database():
             db.add(attempt)
             print(f"  ✓ Created quiz attempt for {attempt_data['username']}: {attempt_data['score']}/5")
         
-        db.commit()
+        await db.commit()
         
         # Generate user evaluations for Meeting 1
         print("\n⭐ Generating user evaluations for Meeting 1...")
@@ -206,8 +207,8 @@ async def seed_database():
             summary=None
         )
         db.add(meeting2)
-        db.commit()
-        db.refresh(meeting2)
+        await db.commit()
+        await db.refresh(meeting2)
         print(f"  ✓ Created meeting: {meeting2.name} (ID: {meeting2.id})")
         
         # Create transcripts for Meeting 2
@@ -299,7 +300,7 @@ async def seed_database():
         
         for transcript in transcripts2:
             db.add(transcript)
-        db.commit()
+        await db.commit()
         print(f"  ✓ Created {len(transcripts2)} transcripts")
         
         # Generate intro quiz for Meeting 2
@@ -335,7 +336,7 @@ async def seed_database():
             db.add(attempt)
             print(f"  ✓ Created quiz attempt for {attempt_data['username']}: {attempt_data['score']}/5")
         
-        db.commit()
+        await db.commit()
         
         # Generate user evaluations for Meeting 2
         print("\n⭐ Generating user evaluations for Meeting 2...")
@@ -369,10 +370,11 @@ async def seed_database():
         
     except Exception as e:
         print(f"\n❌ Error during seeding: {e}")
-        db.rollback()
+        await db.rollback()
         raise
     finally:
-        db.close()
+        await db.close()
+        await engine.dispose()
 
 
 if __name__ == "__main__":
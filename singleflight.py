@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into a single in-flight execution.
+    The work runs in its own task and every caller awaits that task; it is only
+    cancelled once all callers waiting on it have been cancelled themselves.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() for key, or join the execution already running for it"""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    async def wait(self, key: Hashable) -> None:
+        """
+        Wait for the execution in flight for key, if any, without joining it: its result or error is
+        ignored, and cancelling this wait doesn't count towards cancelling it
+        """
+        call = self._calls.get(key)
+        if call is not None:
+            await asyncio.wait([call.task])
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
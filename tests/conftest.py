@@ -0,0 +1,105 @@
+"""
+Shared test setup: a throwaway SQLite database and the offline fake LLM backend.
+The environment is set before any app module is imported, since database.py reads DATABASE_URL at import.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event, select
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["LLM_CACHE_BACKEND"] = "none"
+os.environ["OPENROUTER_REQUESTS_PER_MINUTE"] = "0"
+# Tests that need them turn these back on with monkeypatch before starting the API
+os.environ["LLM_FAKE_LATENCY"] = "0"
+os.environ["PREGENERATION_ENABLED"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal, engine  # noqa: E402
+from migrations import run_migrations  # noqa: E402
+from models import Meeting, Transcribe, User  # noqa: E402
+
+
+@pytest.fixture
+def run():
+    """
+    Run a coroutine on a fresh event loop against the migrated test database.
+    Pooled connections belong to the loop that opened them, so the pool is emptied afterwards.
+    """
+    async def with_database(coro):
+        try:
+            await run_migrations()
+            return await coro
+        finally:
+            await engine.dispose()
+    return lambda coro: asyncio.run(with_database(coro))
+
+
+@pytest.fixture
+def create_meeting():
+    """Coroutine function creating a meeting with `transcripts` transcripts by `username`; returns its id"""
+    async def create(transcripts: int = 5, username: str = "tester") -> int:
+        async with SessionLocal() as db:
+            if not (await db.execute(select(User).where(User.username == username))).first():
+                db.add(User(username=username))
+            meeting = Meeting(name="Sprint planning", description="Plan the next release")
+            db.add(meeting)
+            await db.flush()
+            started = datetime(2026, 1, 1, 10, 0)
+            db.add_all([
+                Transcribe(
+                    user_username=username,
+                    meeting_id=meeting.id,
+                    transcription_text=f"We should ship the release candidate, point {i}",
+                    timestamp=started + timedelta(seconds=i)
+                )
+                for i in range(transcripts)
+            ])
+            await db.commit()
+            return meeting.id
+    return create
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Context manager counting the SQL statements sent to the database inside it:
+    with count_queries() as queries: ...; then len(queries) (the statements themselves, for failure output)
+    """
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return counting
+
+
+@pytest.fixture
+def api():
+    """
+    Async context manager running the API (lifespan included) behind an in-process HTTP client:
+    async with api() as client: ...; the app itself is client.app
+    """
+    @asynccontextmanager
+    async def client():
+        import httpx
+        from main import app
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                http.app = app
+                yield http
+    return client
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from jobs import JOB_HANDLERS
+
+HEADERS = {"X-User-Username": "tester"}
+
+
+async def _poll(client, location: str, until: str, timeout: float = 5):
+    """GET the job at location until it reaches status `until`; returns that response"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        response = await client.get(location)
+        if response.json()["status"] == until or asyncio.get_running_loop().time() > deadline:
+            return response
+        await asyncio.sleep(0.02)
+
+
+def test_async_request_is_accepted_and_the_job_runs_to_completion(run, api, create_meeting, monkeypatch):
+    monkeypatch.setenv("JOB_WORKERS", "1")
+    run_intro_quiz = JOB_HANDLERS["intro_quiz"]
+
+    async def scenario():
+        # The job holds at "running" until the test has seen it there
+        release = asyncio.Event()
+
+        async def held(service, payload):
+            await release.wait()
+            return await run_intro_quiz(service, payload)
+
+        monkeypatch.setitem(JOB_HANDLERS, "intro_quiz", held)
+        meeting_id = await create_meeting()
+        async with api() as client:
+            accepted = await client.get(f"/meeting/{meeting_id}/intro-quiz?async=true", headers=HEADERS)
+            running = await _poll(client, accepted.headers["Location"], "running")
+            release.set()
+            succeeded = await _poll(client, accepted.headers["Location"], "succeeded")
+            # The quiz exists now, so the same request answers with it directly
+            direct = await client.get(f"/meeting/{meeting_id}/intro-quiz", headers={**HEADERS, "Prefer": "respond-async"})
+        return accepted, running, succeeded, direct
+
+    accepted, running, succeeded, direct = run(scenario())
+
+    assert accepted.status_code == 202
+    assert accepted.headers["Location"] == f"/jobs/{accepted.json()['id']}"
+    assert int(accepted.headers["Retry-After"]) > 0
+    assert accepted.json()["status"] == "queued"
+
+    assert running.json()["status"] == "running"
+    assert "Retry-After" in running.headers
+
+    assert succeeded.json()["status"] == "succeeded"
+    assert succeeded.json()["finished_at"] is not None
+    assert "Retry-After" not in succeeded.headers
+
+    assert direct.status_code == 200
+    assert len(direct.json()["questions"]) == 5
+
+
+@pytest.mark.parametrize("method, path", [
+    ("GET", "/meeting/{}/intro-quiz"),
+    ("GET", "/meeting/{}/outro-quiz"),
+    ("POST", "/meeting/{}/summary/generate"),
+])
+def test_async_request_for_an_unknown_meeting_is_not_found(run, api, create_meeting, method, path):
+    async def scenario():
+        await create_meeting(transcripts=0)  # creates the requesting user
+        async with api() as client:
+            return await client.request(method, path.format(999999) + "?async=true", headers=HEADERS)
+
+    response = run(scenario())
+
+    assert response.status_code == 404
+    assert "Location" not in response.headers
@@ -0,0 +1,28 @@
+from sqlalchemy import select, update
+from auth import get_current_user, user_cache
+from database import SessionLocal
+from models import User
+
+
+def test_cached_user_does_not_shadow_a_fresh_load(run, create_meeting):
+    async def scenario():
+        await create_meeting(transcripts=0, username="cached")
+        user_cache.invalidate("cached")
+        async with SessionLocal() as db:
+            await get_current_user("cached", db)
+        # Changed behind the cache's back, as another worker would
+        async with SessionLocal() as db:
+            await db.execute(update(User).where(User.username == "cached").values(score=42))
+            await db.commit()
+
+        async with SessionLocal() as db:
+            current_user = await get_current_user("cached", db)
+            fresh = (await db.execute(select(User).where(User.username == "cached"))).scalars().one()
+            return current_user, fresh, current_user in db
+
+    current_user, fresh, in_session = run(scenario())
+
+    assert current_user.username == "cached"
+    assert not in_session
+    assert fresh is not current_user
+    assert fresh.score == 42
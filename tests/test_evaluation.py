@@ -0,0 +1,53 @@
+from sqlalchemy import select
+from benchmarks import transcript_items
+from database import SessionLocal
+from llm_backends import FakeBackend
+from llm_resilience import UpstreamGuard
+from models import Quiz, QuizType, Transcribe, UserQuizAttempt
+from openrouter_service import OpenRouterService
+from quiz_service import QuizService
+
+
+class _RecordingService(OpenRouterService):
+    """Keeps the arguments of each performance evaluation it is asked for"""
+
+    def __init__(self):
+        super().__init__(backend=FakeBackend(), guard=UpstreamGuard.from_env())
+        self.evaluations = []
+
+    async def generate_user_performance_evaluation(self, **kwargs):
+        self.evaluations.append(kwargs)
+        return await super().generate_user_performance_evaluation(**kwargs)
+
+
+def test_fouls_are_stored_and_counted_in_the_evaluation(run, api, create_meeting):
+    ai_service = _RecordingService()
+    # The last item has no verdict at all
+    items = transcript_items(4, users=1)
+    items[0]["foul"] = True
+    items[1]["foul"] = None
+    items[2]["foul"] = True
+
+    async def scenario():
+        meeting_id = await create_meeting(transcripts=0)
+        async with api() as client:
+            response = await client.post(f"/meeting/{meeting_id}/transcripts", json=items)
+            assert response.status_code == 201
+        async with SessionLocal() as db:
+            fouls = (await db.execute(
+                select(Transcribe.foul).where(Transcribe.meeting_id == meeting_id).order_by(Transcribe.timestamp)
+            )).scalars().all()
+            quiz = Quiz(meeting_id=meeting_id, quiz_type=QuizType.outro)
+            db.add(quiz)
+            await db.flush()
+            db.add(UserQuizAttempt(user_username="speaker0", quiz_id=quiz.id, score=4, total_questions=5))
+            await db.commit()
+        async with SessionLocal() as db:
+            await QuizService(db, ai_service).evaluate_user_performance(meeting_id, "speaker0")
+        return fouls
+
+    fouls = run(scenario())
+
+    # Null and missing verdicts are stored as not a foul
+    assert fouls == [True, False, True, False]
+    assert [(e["foul_count"], e["total_transcripts"]) for e in ai_service.evaluations] == [(2, 4)]
@@ -0,0 +1,44 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from database import SessionLocal
+from events import DatabaseEventBroker
+from models import MeetingEvent
+
+
+async def _insert_event(meeting_id: int, event_id: int, event: str) -> None:
+    """An event written by another worker, with an explicit id to simulate commit order"""
+    async with SessionLocal() as db:
+        db.add(MeetingEvent(
+            id=event_id,
+            meeting_id=meeting_id,
+            event=event,
+            data=json.dumps({"event_id": event_id}),
+            origin="other-worker",
+            created_at=datetime.now(timezone.utc).replace(tzinfo=None)
+        ))
+        await db.commit()
+
+
+def test_database_broker_delivers_events_committed_out_of_id_order(run, create_meeting):
+    async def scenario():
+        meeting_id = await create_meeting(transcripts=0)
+        broker = DatabaseEventBroker(poll_interval=0.05)
+        await broker.start()
+        subscription = broker.subscribe(meeting_id)
+        try:
+            # id 1002 commits first and is polled; id 1001 was assigned earlier but commits later
+            await _insert_event(meeting_id, 1002, "summary_ready")
+            await asyncio.sleep(0.2)
+            await _insert_event(meeting_id, 1001, "transcripts_ingested")
+            await asyncio.sleep(0.2)
+
+            received = []
+            while (item := await subscription.get(timeout=0.1)) is not None:
+                received.append(item["data"]["event_id"])
+            return received
+        finally:
+            subscription.close()
+            await broker.close()
+
+    assert run(scenario()) == [1002, 1001]
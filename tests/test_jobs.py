@@ -0,0 +1,70 @@
+import asyncio
+from sqlalchemy import update
+from database import SessionLocal
+from jobs import JOB_HANDLERS, JobWorker, claim_job, enqueue_job, get_job
+from models import Job, JobStatus
+
+
+async def _run_one(worker: JobWorker, kind: str) -> Job:
+    """Enqueue a job of kind, let worker claim and run it, and return its stored state"""
+    async with SessionLocal() as db:
+        job_id = (await enqueue_job(db, kind, {"meeting_id": 1})).id
+    async with SessionLocal() as db:
+        await worker._execute(db, await claim_job(db, worker.worker_id, worker.lease_seconds))
+    async with SessionLocal() as db:
+        return await get_job(db, job_id)
+
+
+def test_lease_is_extended_while_a_slow_job_runs(run, monkeypatch):
+    worker = JobWorker(lambda: None, concurrency=1, lease_seconds=0.3)
+    other = JobWorker(lambda: None, concurrency=1, lease_seconds=0.3)
+    claimed_by_other = []
+
+    async def slow(service, payload):
+        # Well past the original lease: without a heartbeat the other worker would take the job
+        for _ in range(4):
+            await asyncio.sleep(0.25)
+            async with SessionLocal() as db:
+                claimed_by_other.append(await claim_job(db, other.worker_id, other.lease_seconds))
+        return {"done": True}
+
+    monkeypatch.setitem(JOB_HANDLERS, "slow", slow)
+    job = run(_run_one(worker, "slow"))
+
+    assert claimed_by_other == [None] * 4
+    assert job.status == JobStatus.succeeded
+    assert job.attempts == 1
+    assert worker.succeeded == 1
+
+
+def test_outcome_is_discarded_after_another_worker_took_the_job(run, monkeypatch):
+    worker = JobWorker(lambda: None, concurrency=1)
+
+    async def taken_over(service, payload):
+        async with SessionLocal() as db:
+            await db.execute(update(Job).where(Job.kind == "taken_over").values(locked_by="other-worker"))
+            await db.commit()
+        return {"done": True}
+
+    monkeypatch.setitem(JOB_HANDLERS, "taken_over", taken_over)
+    job = run(_run_one(worker, "taken_over"))
+
+    assert job.status == JobStatus.running
+    assert job.locked_by == "other-worker"
+    assert job.result is None
+    assert (worker.succeeded, worker.lost) == (0, 1)
+
+
+def test_failed_job_is_queued_for_a_retry(run, monkeypatch):
+    worker = JobWorker(lambda: None, concurrency=1)
+
+    async def failing(service, payload):
+        raise RuntimeError("upstream hiccup")
+
+    monkeypatch.setitem(JOB_HANDLERS, "failing", failing)
+    job = run(_run_one(worker, "failing"))
+
+    assert job.status == JobStatus.queued
+    assert job.last_error == "RuntimeError: upstream hiccup"
+    assert job.locked_by is None
+    assert worker.retried == 1
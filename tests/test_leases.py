@@ -0,0 +1,41 @@
+import asyncio
+from database import SessionLocal
+from leases import acquire_lease, release_lease, renew_lease, renewing
+
+
+def test_lease_is_renewed_while_a_slow_generation_runs(run):
+    taken_by_other = []
+
+    async def scenario():
+        async with SessionLocal() as db:
+            owner = await acquire_lease(db, "summary:slow", ttl=0.3)
+            try:
+                async with renewing("summary:slow", owner, ttl=0.3):
+                    # Well past the TTL: without renewal another worker would take the lease over
+                    for _ in range(4):
+                        await asyncio.sleep(0.25)
+                        async with SessionLocal() as other:
+                            taken_by_other.append(await acquire_lease(other, "summary:slow", ttl=0.3))
+            finally:
+                await release_lease(db, "summary:slow", owner)
+        async with SessionLocal() as other:
+            return await acquire_lease(other, "summary:slow", ttl=0.3)
+
+    after_release = run(scenario())
+
+    assert taken_by_other == [None] * 4
+    assert after_release is not None
+
+
+def test_lapsed_lease_taken_over_is_not_renewed(run):
+    async def scenario():
+        async with SessionLocal() as db:
+            owner = await acquire_lease(db, "summary:lapsed", ttl=0.01)
+            await asyncio.sleep(0.05)
+            new_owner = await acquire_lease(db, "summary:lapsed", ttl=60)
+            return new_owner, await renew_lease(db, "summary:lapsed", owner), await renew_lease(db, "summary:lapsed", new_owner)
+
+    new_owner, renewed_by_old, renewed_by_new = run(scenario())
+
+    assert new_owner is not None
+    assert (renewed_by_old, renewed_by_new) == (False, True)
@@ -0,0 +1,42 @@
+import asyncio
+import sqlite3
+import pytest
+from llm_cache import LLMCache, SQLiteCache
+
+
+def _last_access(path: str, key: str) -> float:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT last_access FROM llm_cache WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_base_cache_is_abstract():
+    with pytest.raises(TypeError):
+        LLMCache(ttl=0, max_entries=10)
+
+
+def test_sqlite_cache_batches_hits_and_evicts_least_recently_used(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, ttl=0, max_entries=10, touch_interval=3600, evict_fraction=0.2)
+
+    async def scenario():
+        for i in range(10):
+            await cache.set(f"key{i}", f"value{i}")
+        stored_access = _last_access(path, "key0")
+
+        # A hit is answered without writing last_access back yet
+        assert await cache.get("key0") == "value0"
+        assert _last_access(path, "key0") == stored_access
+        assert cache.evictions == 0
+
+        # The 11th entry goes over the limit: pending hits are written, then the table is
+        # trimmed to 8 rows by dropping the least recently used (key1..key3, not key0)
+        await cache.set("key10", "value10")
+        return [await cache.get(f"key{i}") for i in range(11)]
+
+    values = asyncio.run(scenario())
+    cache.close()
+
+    assert values[0] == "value0"
+    assert values[1:4] == [None, None, None]
+    assert cache.evictions == 3
+    assert cache.stats()["size"] == 8
@@ -0,0 +1,22 @@
+import asyncio
+import pytest
+from llm_backends import FakeBackend, LLMBackend
+from llm_resilience import UpstreamGuard
+from openrouter_service import OpenRouterService
+
+
+def test_base_backend_is_abstract():
+    with pytest.raises(TypeError):
+        LLMBackend()
+
+
+def test_unparseable_reply_is_repaired_with_one_follow_up_call():
+    backend = FakeBackend(malformed_rate=1.0)
+    ai_service = OpenRouterService(backend=backend, guard=UpstreamGuard.from_env())
+
+    quiz = asyncio.run(ai_service.generate_intro_quiz("Sprint planning", "Plan the next release"))
+
+    assert len(quiz["questions"]) == 5
+    assert backend.calls == 2
+    assert ai_service.parse_stats.first_try_failures == 1
+    assert ai_service.parse_stats.repaired == 1
@@ -0,0 +1,89 @@
+import asyncio
+import time
+import pytest
+from llm_backends import FakeBackend
+from llm_resilience import UpstreamGuard, UpstreamUnavailableError
+
+
+def _guard(**overrides) -> UpstreamGuard:
+    settings = dict(
+        rate=20.0,
+        burst=2,
+        max_concurrency=3,
+        max_retries=4,
+        backoff_base=0.01,
+        backoff_max=0.05,
+        breaker_threshold=3,
+        breaker_reset=0.2
+    )
+    settings.update(overrides)
+    return UpstreamGuard(**settings)
+
+
+def test_429_burst_is_absorbed_by_the_limiter_without_tripping_the_breaker():
+    # Every third call is throttled with a Retry-After hint
+    backend = FakeBackend(latency=0.01, rate_limit_every=3, retry_after=0.1)
+    guard = _guard(max_retries=8)
+    peak_in_flight = 0
+
+    async def send():
+        nonlocal peak_in_flight
+        peak_in_flight = max(peak_in_flight, guard.in_flight)
+        return await backend.complete("model", [{"role": "user", "content": "Summarize"}])
+
+    async def scenario():
+        started = time.monotonic()
+        await asyncio.gather(*(guard.call(send) for _ in range(20)))
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(scenario())
+
+    assert guard.successes == 20
+    assert guard.rate_limited == backend.calls - 20
+    assert guard.exhausted == 0
+    # Throttling is not an outage
+    assert guard.breaker.state == "closed"
+    assert guard.breaker.times_opened == 0
+    # Attempts never outran the token bucket (beyond its burst) or the concurrency cap
+    assert guard.attempts - guard.limiter.capacity <= elapsed * guard.limiter.rate
+    assert peak_in_flight <= guard.max_concurrency
+    assert guard.limiter.waits > 0
+
+
+def test_server_errors_open_the_breaker_and_later_calls_fail_fast():
+    backend = FakeBackend(error_rate=1.0)
+    guard = _guard(max_retries=0, breaker_reset=60)
+
+    async def scenario():
+        for _ in range(10):
+            with pytest.raises(UpstreamUnavailableError):
+                await guard.call(lambda: backend.complete("model", [{"role": "user", "content": "Summarize"}]))
+
+    asyncio.run(scenario())
+
+    assert backend.calls == guard.breaker.failure_threshold
+    assert guard.breaker.state == "open"
+    assert guard.breaker.rejected == 10 - guard.breaker.failure_threshold
+
+
+def test_half_open_breaker_lets_a_single_trial_call_through():
+    backend = FakeBackend(latency=0.1)
+    guard = _guard(max_retries=0, breaker_threshold=1, breaker_reset=0.05)
+    guard.breaker.record_failure()
+    assert guard.breaker.state == "open"
+
+    async def call():
+        try:
+            return await guard.call(lambda: backend.complete("model", [{"role": "user", "content": "Summarize"}]))
+        except UpstreamUnavailableError:
+            return None
+
+    async def scenario():
+        await asyncio.sleep(0.1)
+        return await asyncio.gather(*(call() for _ in range(10)))
+
+    results = asyncio.run(scenario())
+
+    assert backend.calls == 1
+    assert sum(result is not None for result in results) == 1
+    assert guard.breaker.state == "closed"
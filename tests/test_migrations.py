@@ -0,0 +1,147 @@
+import asyncio
+import sqlite3
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+import migrations
+
+# The tables as the baseline code's create_all made them: no indexes beyond primary keys and
+# unique constraints, no unique natural keys on transcripts or quizzes
+BASELINE_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER NOT NULL, username VARCHAR NOT NULL, discord_user_id VARCHAR, strengths VARCHAR,
+    weaknesses VARCHAR, score INTEGER, credits INTEGER,
+    PRIMARY KEY (id), UNIQUE (username)
+);
+CREATE TABLE meetings (
+    id INTEGER NOT NULL, name VARCHAR NOT NULL, description VARCHAR NOT NULL, summary VARCHAR,
+    begins_at DATETIME, duration DATETIME, created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    owner_username VARCHAR, team_evaluation_score INTEGER, team_strengths TEXT, team_weaknesses TEXT,
+    team_tips TEXT, team_evaluated_at DATETIME,
+    PRIMARY KEY (id), FOREIGN KEY(owner_username) REFERENCES users (username)
+);
+CREATE TABLE meeting_participants (
+    id INTEGER NOT NULL, meeting_id INTEGER NOT NULL, user_username VARCHAR NOT NULL,
+    PRIMARY KEY (id), CONSTRAINT _meeting_user_uc UNIQUE (meeting_id, user_username),
+    FOREIGN KEY(meeting_id) REFERENCES meetings (id), FOREIGN KEY(user_username) REFERENCES users (username)
+);
+CREATE TABLE quizzes (
+    id INTEGER NOT NULL, meeting_id INTEGER NOT NULL, quiz_type VARCHAR(5) NOT NULL, summary_points TEXT,
+    generated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id), FOREIGN KEY(meeting_id) REFERENCES meetings (id)
+);
+CREATE TABLE transcribes (
+    id INTEGER NOT NULL, user_username VARCHAR NOT NULL, meeting_id INTEGER NOT NULL, foul BOOLEAN,
+    transcription_text VARCHAR NOT NULL, timestamp DATETIME NOT NULL, guild_id VARCHAR, channel_id VARCHAR,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id), FOREIGN KEY(user_username) REFERENCES users (username),
+    FOREIGN KEY(meeting_id) REFERENCES meetings (id)
+);
+CREATE TABLE user_meeting_evaluations (
+    id INTEGER NOT NULL, user_username VARCHAR NOT NULL, meeting_id INTEGER NOT NULL,
+    evaluation_score INTEGER NOT NULL, strengths TEXT NOT NULL, weaknesses TEXT NOT NULL, tips TEXT NOT NULL,
+    quiz_score INTEGER NOT NULL, participation_score INTEGER NOT NULL, quality_score INTEGER NOT NULL,
+    evaluated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id), CONSTRAINT _user_meeting_eval_uc UNIQUE (user_username, meeting_id),
+    FOREIGN KEY(user_username) REFERENCES users (username), FOREIGN KEY(meeting_id) REFERENCES meetings (id)
+);
+CREATE TABLE questions (
+    id INTEGER NOT NULL, quiz_id INTEGER NOT NULL, question_text TEXT NOT NULL,
+    correct_answer_index INTEGER NOT NULL, "order" INTEGER NOT NULL,
+    PRIMARY KEY (id), FOREIGN KEY(quiz_id) REFERENCES quizzes (id)
+);
+CREATE TABLE user_quiz_attempts (
+    id INTEGER NOT NULL, user_username VARCHAR NOT NULL, quiz_id INTEGER NOT NULL, score INTEGER NOT NULL,
+    total_questions INTEGER NOT NULL, completed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id), FOREIGN KEY(user_username) REFERENCES users (username),
+    FOREIGN KEY(quiz_id) REFERENCES quizzes (id)
+);
+CREATE TABLE answers (
+    id INTEGER NOT NULL, question_id INTEGER NOT NULL, answer_text TEXT NOT NULL, "order" INTEGER NOT NULL,
+    PRIMARY KEY (id), FOREIGN KEY(question_id) REFERENCES questions (id)
+);
+"""
+
+# Data written before the unique keys existed: a re-sent transcript, and two intro quizzes for
+# meeting 1 (the second one with a question, an answer and an attempt)
+BASELINE_DATA = """
+INSERT INTO users (id, username) VALUES (1, 'alice'), (2, 'bob');
+INSERT INTO meetings (id, name, description) VALUES (1, 'Sprint planning', 'Plan the next release');
+INSERT INTO transcribes (id, user_username, meeting_id, transcription_text, timestamp) VALUES
+    (1, 'alice', 1, 'Ship on Friday', '2026-01-01 10:00:00'),
+    (2, 'alice', 1, 'Ship on Friday', '2026-01-01 10:00:00'),
+    (3, 'bob', 1, 'Agreed', '2026-01-01 10:00:05');
+INSERT INTO quizzes (id, meeting_id, quiz_type) VALUES (1, 1, 'intro'), (2, 1, 'intro'), (3, 1, 'outro');
+INSERT INTO questions (id, quiz_id, question_text, correct_answer_index, "order") VALUES (1, 2, 'When?', 0, 0);
+INSERT INTO answers (id, question_id, answer_text, "order") VALUES (1, 1, 'Friday', 0);
+INSERT INTO user_quiz_attempts (id, user_username, quiz_id, score, total_questions) VALUES (1, 'bob', 2, 1, 1);
+INSERT INTO user_meeting_evaluations (user_username, meeting_id, evaluation_score, strengths, weaknesses, tips,
+    quiz_score, participation_score, quality_score) VALUES ('bob', 1, 50, 's', 'w', 't', 10, 10, 30);
+"""
+
+# Lookups the app makes, and the index each must use
+PLANNED_QUERIES = [
+    ("SELECT * FROM transcribes WHERE meeting_id = 1 ORDER BY timestamp", "ix_transcribes_meeting_timestamp"),
+    ("SELECT * FROM transcribes WHERE meeting_id = 1 AND user_username = 'bob'",
+     "uq_transcribes_meeting_user_timestamp"),
+    ("SELECT * FROM quizzes WHERE meeting_id = 1 AND quiz_type = 'intro'", "_meeting_quiz_type_uc"),
+    ("SELECT * FROM user_quiz_attempts WHERE user_username = 'bob' AND quiz_id = 1",
+     "ix_user_quiz_attempts_user_quiz"),
+    ("SELECT * FROM user_meeting_evaluations WHERE meeting_id = 1", "ix_user_meeting_evaluations_meeting"),
+    ("SELECT * FROM questions WHERE quiz_id IN (1, 3)", "ix_questions_quiz_id"),
+    ("SELECT * FROM answers WHERE question_id IN (1, 2)", "ix_answers_question_id"),
+]
+
+
+@pytest.fixture
+def baseline_database(tmp_path, monkeypatch):
+    """Path of a database created and filled by the baseline schema; migrations run against it"""
+    path = str(tmp_path / "baseline.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(BASELINE_SCHEMA + BASELINE_DATA)
+
+    async def migrate():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        monkeypatch.setattr(migrations, "engine", engine)
+        try:
+            return await migrations.run_migrations()
+        finally:
+            await engine.dispose()
+
+    return path, migrate
+
+
+def test_migrations_dedupe_baseline_data_and_add_unique_keys(baseline_database):
+    path, migrate = baseline_database
+
+    assert asyncio.run(migrate()) == [1, 2, 3]
+
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("SELECT id FROM transcribes ORDER BY id").fetchall() == [(1,), (3,)]
+        assert conn.execute("SELECT id, quiz_type FROM quizzes ORDER BY id").fetchall() == [(1, "intro"), (3, "outro")]
+        # The duplicate's attempt moved to the kept quiz; its questions and answers are gone
+        assert conn.execute("SELECT quiz_id FROM user_quiz_attempts").fetchall() == [(1,)]
+        assert conn.execute("SELECT COUNT(*) FROM questions").fetchone() == (0,)
+        assert conn.execute("SELECT COUNT(*) FROM answers").fetchone() == (0,)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("INSERT INTO transcribes (user_username, meeting_id, transcription_text, timestamp) "
+                         "VALUES ('alice', 1, 'Again', '2026-01-01 10:00:00')")
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("INSERT INTO quizzes (meeting_id, quiz_type) VALUES (1, 'outro')")
+    finally:
+        conn.close()
+
+    # Already applied: a second start is a no-op
+    assert asyncio.run(migrate()) == []
+
+
+@pytest.mark.parametrize("query, index", PLANNED_QUERIES)
+def test_migrated_baseline_database_plans_lookups_on_indexes(baseline_database, query, index):
+    path, migrate = baseline_database
+    asyncio.run(migrate())
+
+    with sqlite3.connect(path) as conn:
+        plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+
+    assert f"INDEX {index}" in plan, plan
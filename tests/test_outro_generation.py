@@ -0,0 +1,70 @@
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from database import SessionLocal, engine
+from llm_backends import FakeBackend
+from llm_resilience import UpstreamGuard
+from models import Meeting, Quiz, QuizType
+from openrouter_service import OpenRouterService
+from quiz_service import QuizService
+
+
+class _RacingBackend(FakeBackend):
+    """Another worker stores the meeting's outro quiz while this one waits for the LLM"""
+
+    def __init__(self, meeting_id: int):
+        super().__init__()
+        self.meeting_id = meeting_id
+        self.other_quiz_id: Optional[int] = None
+
+    async def complete(self, model: str, messages: List[Dict], response_format: Optional[Dict] = None) -> str:
+        async with SessionLocal() as db:
+            quiz = Quiz(meeting_id=self.meeting_id, quiz_type=QuizType.outro)
+            db.add(quiz)
+            await db.commit()
+            self.other_quiz_id = quiz.id
+        return await super().complete(model, messages, response_format)
+
+
+def test_combined_generation_keeps_the_summary_when_another_quiz_wins(run, create_meeting):
+    async def scenario():
+        meeting_id = await create_meeting()
+        backend = _RacingBackend(meeting_id)
+        ai_service = OpenRouterService(backend=backend, guard=UpstreamGuard.from_env())
+        async with SessionLocal() as db:
+            quiz_id = await QuizService(db, ai_service)._generate_summary_and_outro_quiz(meeting_id)
+        async with SessionLocal() as db:
+            summary = (await db.get(Meeting, meeting_id)).summary
+        return quiz_id, backend.other_quiz_id, summary
+
+    quiz_id, other_quiz_id, summary = run(scenario())
+
+    assert quiz_id == other_quiz_id
+    assert summary and "Summary point 1" in summary
+
+
+def test_combined_generation_commits_summary_and_quiz_together(run, create_meeting):
+    ai_service = OpenRouterService(backend=FakeBackend(), guard=UpstreamGuard.from_env())
+    log = []
+
+    def statement(conn, cursor, sql, parameters, context, executemany):
+        if sql.startswith(("UPDATE meetings", "INSERT INTO quizzes")):
+            log.append(sql.split(" (")[0].split(" SET")[0])
+
+    def commit(conn):
+        log.append("COMMIT")
+
+    async def scenario():
+        meeting_id = await create_meeting()
+        event.listen(engine.sync_engine, "before_cursor_execute", statement)
+        event.listen(engine.sync_engine, "commit", commit)
+        try:
+            async with SessionLocal() as db:
+                return await QuizService(db, ai_service)._generate_summary_and_outro_quiz(meeting_id)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", statement)
+            event.remove(engine.sync_engine, "commit", commit)
+
+    assert run(scenario()) is not None
+    # The lease bookkeeping commits too; summary and quiz must not be split by a commit
+    start = log.index("UPDATE meetings")
+    assert log[start:start + 3] == ["UPDATE meetings", "INSERT INTO quizzes", "COMMIT"], log
@@ -0,0 +1,48 @@
+from database import SessionLocal
+from jobs import enqueue_job
+from main import _ensure_ai_service
+from models import Quiz, QuizType, UserQuizAttempt
+
+
+def test_overview_reads_a_fixed_number_of_statements_and_never_generates(run, api, create_meeting, count_queries,
+                                                                        monkeypatch):
+    # No worker, so the queued job stays queued
+    monkeypatch.setenv("JOB_WORKERS", "0")
+    headers = {"X-User-Username": "tester"}
+
+    async def overview(client):
+        with count_queries() as statements:
+            response = await client.get("/user/tester/meetings-overview", headers=headers)
+        assert response.status_code == 200
+        return {meeting["id"]: meeting for meeting in response.json()}, len(statements)
+
+    async def scenario():
+        attempted = await create_meeting()
+        queued = await create_meeting()
+        async with SessionLocal() as db:
+            quiz = Quiz(meeting_id=attempted, quiz_type=QuizType.intro)
+            db.add(quiz)
+            await db.flush()
+            db.add(UserQuizAttempt(user_username="tester", quiz_id=quiz.id, score=3, total_questions=5))
+            await db.commit()
+            await enqueue_job(db, "outro_quiz", {"meeting_id": queued})
+
+        async with api() as client:
+            backend = _ensure_ai_service(client.app).backend
+            # Resolves the user once, so later requests authenticate from the cache
+            await client.get("/user/tester/meetings-overview", headers=headers)
+            _, few = await overview(client)
+            for _ in range(10):
+                await create_meeting(transcripts=0)
+            meetings, many = await overview(client)
+            return meetings[attempted], meetings[queued], few, many, backend.calls
+
+    attempted, queued, few, many, calls = run(scenario())
+
+    assert few == many
+    assert calls == 0
+    assert attempted["intro_quiz"]["status"] == "completed"
+    assert (attempted["intro_quiz"]["attempts"], attempted["intro_quiz"]["best_score"]) == (1, 3)
+    assert queued["outro_quiz"] == {**queued["outro_quiz"], "id": None, "status": "generating"}
+    assert queued["intro_quiz"]["status"] == "missing"
+    assert (queued["has_summary"], queued["next_step"]) == (False, "waiting")
@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+from benchmarks import transcript_items
+from database import SessionLocal
+from main import _ensure_ai_service
+from models import Meeting, QuizType, UserQuizAttempt
+from quiz_service import QuizService
+
+
+@pytest.fixture
+def pregenerating(monkeypatch):
+    monkeypatch.setenv("PREGENERATION_ENABLED", "true")
+    monkeypatch.setenv("PREGENERATION_DELAY", "0.05")
+    monkeypatch.setenv("JOB_WORKERS", "0")
+
+
+async def _upload(client, meeting_id: int, start: int) -> int:
+    """
+    Post a batch of transcripts and wait for the speculative generation it starts to finish;
+    returns the number of LLM calls it made
+    """
+    backend = _ensure_ai_service(client.app).backend
+    calls = backend.calls
+    pregenerator = client.app.state.pregenerator
+    completed = pregenerator.completed
+    response = await client.post(f"/meeting/{meeting_id}/transcripts", json=transcript_items(5, users=2, start=start))
+    assert response.status_code == 201
+    for _ in range(250):
+        if pregenerator.completed > completed:
+            return backend.calls - calls
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"Pre-generation did not finish: {pregenerator.stats()}")
+
+
+async def _artifacts(meeting_id: int):
+    """(outro quiz id, summary) currently stored for a meeting"""
+    async with SessionLocal() as db:
+        quiz = await QuizService(db).get_meeting_quiz(meeting_id, QuizType.outro)
+        return quiz.id if quiz else None, (await db.get(Meeting, meeting_id)).summary
+
+
+def test_next_batch_discards_and_regenerates_speculative_artifacts(run, api, create_meeting, pregenerating):
+    async def scenario():
+        meeting_id = await create_meeting(transcripts=0)
+        async with api() as client:
+            first_calls = await _upload(client, meeting_id, start=0)
+            first = await _artifacts(meeting_id)
+            second_calls = await _upload(client, meeting_id, start=5)
+            return first_calls, first, second_calls, await _artifacts(meeting_id), client.app.state.pregenerator.stats()
+
+    first_calls, (first_quiz, first_summary), second_calls, (second_quiz, second_summary), stats = run(scenario())
+
+    assert first_quiz is not None and first_summary
+    # Built from the first five transcripts only: both were thrown away and made again from all ten
+    assert (stats["completed"], stats["discarded"]) == (2, 2)
+    assert second_calls == first_calls > 0
+    assert second_quiz is not None and second_summary
+
+
+def test_speculative_quiz_that_was_answered_is_kept(run, api, create_meeting, pregenerating):
+    async def scenario():
+        meeting_id = await create_meeting(transcripts=0)
+        async with api() as client:
+            await _upload(client, meeting_id, start=0)
+            first = await _artifacts(meeting_id)
+            async with SessionLocal() as db:
+                db.add(UserQuizAttempt(user_username="speaker0", quiz_id=first[0], score=4, total_questions=5))
+                await db.commit()
+            second_calls = await _upload(client, meeting_id, start=5)
+            return first, second_calls, await _artifacts(meeting_id), client.app.state.pregenerator.stats()
+
+    first, second_calls, second, stats = run(scenario())
+
+    assert first[0] is not None
+    assert second == first
+    assert (stats["completed"], stats["discarded"], second_calls) == (2, 0, 0)
@@ -0,0 +1,33 @@
+from database import SessionLocal
+from llm_backends import FakeBackend
+from llm_resilience import UpstreamGuard
+from models import QuizType
+from openrouter_service import OpenRouterService
+from quiz_service import QuizService
+
+
+def test_quiz_loads_with_questions_and_answers_in_one_query(run, create_meeting, count_queries):
+    ai_service = OpenRouterService(backend=FakeBackend(), guard=UpstreamGuard.from_env())
+
+    async def scenario():
+        meeting_id = await create_meeting()
+        async with SessionLocal() as db:
+            quiz_id = (await QuizService(db, ai_service).get_or_create_intro_quiz(meeting_id)).id
+
+        # A fresh session, so nothing is served from the identity map
+        async with SessionLocal() as db:
+            with count_queries() as queries:
+                quiz = await QuizService(db, ai_service).get_meeting_quiz(meeting_id, QuizType.intro)
+            loaded = {question.question_text: [answer.answer_text for answer in question.answers]
+                      for question in quiz.questions}
+        async with SessionLocal() as db:
+            with count_queries() as queries_by_id:
+                await QuizService(db, ai_service).get_quiz_by_id(quiz_id)
+        return queries, queries_by_id, loaded
+
+    queries, queries_by_id, loaded = run(scenario())
+
+    assert len(queries) == 1, queries
+    assert len(queries_by_id) == 1, queries_by_id
+    assert len(loaded) == 5
+    assert all(len(answers) == 4 for answers in loaded.values())
@@ -0,0 +1,70 @@
+import asyncio
+from database import SessionLocal
+from llm_backends import FakeBackend
+from llm_resilience import UpstreamGuard
+from main import _ensure_ai_service
+from models import Meeting
+from openrouter_service import OpenRouterService
+from relevancy import RelevancyBatcher
+from relevancy_filter import RelevancyFilter
+
+
+def test_short_utterances_are_left_for_the_llm():
+    relevancy_filter = RelevancyFilter(high=0.35, low=0.05, min_tokens=4)
+
+    decisions = relevancy_filter.classify(
+        "Sprint planning\nPlan the next release",
+        ["yes, agreed", "sprint planning for the next release"],
+        ["we plan the next release in this sprint"]
+    )
+
+    assert decisions == [None, True]
+
+
+def test_live_utterances_become_context_before_transcripts_are_stored(run, create_meeting):
+    ai_service = OpenRouterService(backend=FakeBackend(), guard=UpstreamGuard.from_env())
+    batcher = RelevancyBatcher(window=0.01, batch_size=20, context_lines=3)
+
+    async def scenario():
+        meeting_id = await create_meeting(transcripts=0)
+        async with SessionLocal() as db:
+            meeting = await db.get(Meeting, meeting_id)
+        try:
+            assert await batcher._context(meeting_id) == []
+            for i in range(4):
+                verdict = await batcher.check(meeting, "tester", f"Release item {i} needs an owner", ai_service)
+                assert verdict["relevant"]
+            return await batcher._context(meeting_id)
+        finally:
+            await batcher.close()
+
+    context = run(scenario())
+
+    assert [line["transcription"] for line in context] == [
+        f"Release item {i} needs an owner" for i in (1, 2, 3)
+    ]
+
+
+def test_concurrent_checks_in_one_window_share_one_llm_call(run, api, create_meeting, monkeypatch):
+    # Without the prefilter every utterance goes to the LLM
+    monkeypatch.setenv("RELEVANCY_FILTER_ENABLED", "false")
+    monkeypatch.setenv("RELEVANCY_WINDOW", "0.2")
+
+    async def scenario():
+        meeting_id = await create_meeting(transcripts=0)
+        async with api() as client:
+            backend = _ensure_ai_service(client.app).backend
+            responses = await asyncio.gather(*[
+                client.post(f"/meeting/{meeting_id}/relevancy", json={
+                    "username": f"speaker{i}", "transcription": f"Release item {i} needs an owner"
+                })
+                for i in range(5)
+            ])
+            return responses, backend.calls, client.app.state.relevancy_batcher.stats()
+
+    responses, calls, stats = run(scenario())
+
+    assert [r.status_code for r in responses] == [200] * 5
+    assert all(r.json()["relevant"] for r in responses)
+    assert calls == 1
+    assert (stats["requests"], stats["llm_calls"]) == (5, 1)
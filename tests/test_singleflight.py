@@ -0,0 +1,25 @@
+import asyncio
+from database import SessionLocal
+from llm_backends import FakeBackend
+from llm_resilience import UpstreamGuard
+from openrouter_service import OpenRouterService
+from quiz_service import QuizService
+
+
+def test_concurrent_outro_quiz_requests_share_one_generation(run, create_meeting):
+    backend = FakeBackend(latency=0.2)
+    ai_service = OpenRouterService(backend=backend, guard=UpstreamGuard.from_env())
+
+    async def request_outro_quiz(meeting_id: int) -> int:
+        async with SessionLocal() as db:
+            return (await QuizService(db, ai_service).get_or_create_outro_quiz(meeting_id)).id
+
+    async def scenario():
+        meeting_id = await create_meeting()
+        return await asyncio.gather(*(request_outro_quiz(meeting_id) for _ in range(50)))
+
+    quiz_ids = run(scenario())
+
+    # Summary and quiz come from one combined call, made once for all 50 requests
+    assert backend.calls == 1
+    assert len(set(quiz_ids)) == 1
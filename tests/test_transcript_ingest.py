@@ -0,0 +1,180 @@
+import asyncio
+import json
+from functools import partial
+import pytest
+from sqlalchemy import func, select
+import main
+from benchmarks import transcript_items
+from database import SessionLocal
+from ingest import ingest_transcripts, read_ndjson_batches
+from models import Transcribe, User
+from schemas import TranscriptItem
+
+
+async def _stored(meeting_id: int) -> int:
+    async with SessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(Transcribe).where(Transcribe.meeting_id == meeting_id))
+
+
+def test_replay_with_the_same_idempotency_key_returns_the_original_result(run, api, create_meeting):
+    async def scenario():
+        meeting_id = await create_meeting(transcripts=0)
+        url = f"/meeting/{meeting_id}/transcripts"
+        async with api() as client:
+            first = await client.post(url, json=transcript_items(6, users=2), headers={"Idempotency-Key": "k1"})
+            stored = await _stored(meeting_id)
+            # Different body, same key: still the original result, and nothing is ingested
+            replay = await client.post(url, json=transcript_items(3, users=2, start=6), headers={"Idempotency-Key": "k1"})
+        return first, replay, stored, await _stored(meeting_id)
+
+    first, replay, stored, stored_after_replay = run(scenario())
+
+    assert first.status_code == replay.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json()
+    assert (first.json()["transcript_count"], first.json()["duplicate_count"]) == (6, 0)
+    assert stored == stored_after_replay == 6
+
+
+def test_keyless_retry_is_counted_as_duplicates(run, api, create_meeting):
+    async def scenario():
+        meeting_id = await create_meeting(transcripts=0)
+        url = f"/meeting/{meeting_id}/transcripts"
+        async with api() as client:
+            await client.post(url, json=transcript_items(6, users=2))
+            # The retry overlaps the first upload by four transcripts and adds two new ones
+            retry = await client.post(url, json=transcript_items(6, users=2, start=2))
+        return retry, await _stored(meeting_id)
+
+    retry, stored = run(scenario())
+
+    assert retry.status_code == 201
+    assert "Idempotent-Replayed" not in retry.headers
+    assert (retry.json()["transcript_count"], retry.json()["duplicate_count"]) == (2, 4)
+    assert stored == 8
+
+
+def test_concurrent_requests_with_the_same_key_have_one_winner(run, api, create_meeting, monkeypatch):
+    requests = 4
+    ingest_transcripts = main.ingest_transcripts
+
+    async def scenario():
+        # Every request has looked the key up and found nothing before any of them ingests
+        arrived, all_arrived = [], asyncio.Event()
+
+        async def ingest_together(db, meeting_id, transcripts):
+            arrived.append(meeting_id)
+            if len(arrived) == requests:
+                all_arrived.set()
+            await all_arrived.wait()
+            return await ingest_transcripts(db, meeting_id, transcripts)
+
+        monkeypatch.setattr(main, "ingest_transcripts", ingest_together)
+        meeting_id = await create_meeting(transcripts=0)
+        url = f"/meeting/{meeting_id}/transcripts"
+        async with api() as client:
+            responses = await asyncio.gather(*[
+                client.post(url, json=transcript_items(6, users=2), headers={"Idempotency-Key": "k1"})
+                for _ in range(requests)
+            ])
+        return responses, await _stored(meeting_id)
+
+    responses, stored = run(scenario())
+
+    assert [r.status_code for r in responses] == [201] * requests
+    assert [r.headers.get("Idempotent-Replayed") for r in responses].count(None) == 1
+    # Every caller sees the winner's counts, not a losing request's all-duplicates result
+    assert all((r.json()["transcript_count"], r.json()["duplicate_count"]) == (6, 0) for r in responses)
+    assert stored == 6
+
+
+async def _chunks(*parts, pause: float = 0):
+    """Request body chunks; with pause, waits that long before the last one"""
+    for i, part in enumerate(parts):
+        if pause and i == len(parts) - 1:
+            await asyncio.sleep(pause)
+        yield part
+
+
+def _ndjson(items) -> bytes:
+    return b"".join(json.dumps(item).encode() + b"\n" for item in items)
+
+
+def test_stream_is_split_into_batches_of_batch_size():
+    body = _ndjson(transcript_items(7, users=2))
+
+    async def batch_sizes():
+        # Chunk boundaries fall mid-line
+        chunks = _chunks(body[:100], body[100:900], body[900:])
+        return [len(batch) async for batch in read_ndjson_batches(chunks, batch_size=3, flush_interval=60)]
+
+    assert asyncio.run(batch_sizes()) == [3, 3, 1]
+
+
+def test_partial_batch_is_flushed_after_the_flush_interval():
+    items = transcript_items(3, users=2)
+
+    async def batches():
+        started = asyncio.get_running_loop().time()
+        chunks = _chunks(_ndjson(items[:2]), _ndjson(items[2:]), pause=0.5)
+        return [
+            (len(batch), asyncio.get_running_loop().time() - started)
+            async for batch in read_ndjson_batches(chunks, batch_size=100, flush_interval=0.05)
+        ]
+
+    (first, first_at), (second, _) = asyncio.run(batches())
+
+    # The first two lines didn't wait for the slow third one
+    assert (first, second) == (2, 1)
+    assert first_at < 0.4
+
+
+@pytest.mark.parametrize("bad_line, error", [
+    (b'{"userId": "1", "username": "speaker1"', "line 6: "),
+    (json.dumps({**transcript_items(1, users=1)[0], "transcription": "x" * 1000}).encode(), "line 6: longer than"),
+])
+def test_bad_stream_line_fails_with_its_line_number_and_keeps_earlier_batches(
+        run, api, create_meeting, monkeypatch, bad_line, error):
+    monkeypatch.setattr(main, "read_ndjson_batches", partial(read_ndjson_batches, batch_size=2, max_line_bytes=500))
+    body = _ndjson(transcript_items(5, users=2)) + bad_line + b"\n" + _ndjson(transcript_items(2, users=2, start=5))
+
+    async def scenario():
+        meeting_id = await create_meeting(transcripts=0)
+        async with api() as client:
+            response = await client.post(f"/meeting/{meeting_id}/transcripts/stream", content=body)
+        return response, await _stored(meeting_id)
+
+    response, stored = run(scenario())
+
+    assert response.status_code == 400
+    assert error in response.json()["detail"]
+    # Two full batches were committed before the bad line; the partial one holding line 5 was not
+    assert "4 transcripts before it were stored" in response.json()["detail"]
+    assert stored == 4
+
+
+def test_unset_discord_ids_are_filled_in_with_one_update(run, create_meeting, count_queries):
+    async def scenario():
+        meeting_id = await create_meeting(transcripts=0)
+        async with SessionLocal() as db:
+            db.add_all([User(username=f"member{i}", discord_user_id=None if i < 5 else "") for i in range(10)])
+            db.add(User(username="member10", discord_user_id="kept"))
+            await db.commit()
+        items = [
+            TranscriptItem(**{**item, "username": f"member{i}", "userId": f"id{i}"})
+            for i, item in enumerate(transcript_items(11, users=1))
+        ]
+        async with SessionLocal() as db:
+            with count_queries() as statements:
+                result = await ingest_transcripts(db, meeting_id, items)
+            await db.commit()
+        async with SessionLocal() as db:
+            users = await db.execute(select(User.username, User.discord_user_id).where(User.username.like("member%")))
+            return result["updated_users"], dict(users.all()), statements
+
+    updated, discord_ids, statements = run(scenario())
+
+    assert updated == {f"member{i}" for i in range(10)}
+    assert discord_ids == {**{f"member{i}": f"id{i}" for i in range(10)}, "member10": "kept"}
+    assert [statement.split()[0] for statement in statements] == ["SELECT", "UPDATE", "INSERT"], statements